@@ -1,14 +1,184 @@
 # audio_generator.py
-from gtts import gTTS
 import os
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import itertools
+from config import INTRO_CACHE_DIR, INTRO_TTS_BACKENDS
 
-def generate_intro_audio(text, path):
+
+def intro_text(name1, name2):
+    """Текст интро - один и тот же для main.py и прогрева кэша"""
+    return f"Fight {name1} versus {name2} "
+
+
+class GTTSBackend:
+    """Google TTS через сеть (gTTS)"""
+    name = "gtts"
+    extension = "mp3"
+
+    def __init__(self, tld="com", slow=False):
+        self.tld = tld
+        self.slow = slow
+
+    @property
+    def voice(self):
+        return f"{self.name}:{self.tld}:{'slow' if self.slow else 'normal'}"
+
+    def synthesize(self, text, lang, path):
+        from gtts import gTTS
+        gTTS(text=text, lang=lang, tld=self.tld, slow=self.slow).save(path)
+
+
+class Pyttsx3Backend:
+    """Локальный движок (pyttsx3: espeak/SAPI5/NSSpeech) - работает без сети"""
+    name = "pyttsx3"
+    extension = "wav"
+
+    def __init__(self, voice_id=None, rate=None):
+        self.voice_id = voice_id
+        self.rate = rate
+
+    @property
+    def voice(self):
+        return f"{self.name}:{self.voice_id or 'default'}:{self.rate or 'default'}"
+
+    def synthesize(self, text, lang, path):
+        import pyttsx3
+        engine = pyttsx3.init()
+        if self.voice_id:
+            engine.setProperty('voice', self.voice_id)
+        if self.rate:
+            engine.setProperty('rate', self.rate)
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+
+
+TTS_BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    Pyttsx3Backend.name: Pyttsx3Backend,
+}
+
+
+class IntroVoiceCache:
+    """
+    Кэш интро-озвучек по содержимому: ключ - хеш (текст, язык, голос).
+    Промах заполняется первым сработавшим движком из списка, поэтому
+    без сети интро может сгенерировать локальный движок.
+    """
+
+    def __init__(self, cache_dir=INTRO_CACHE_DIR, backends=None, lang='en'):
+        self.cache_dir = cache_dir
+        self.lang = lang
+        if backends is None:
+            backends = [TTS_BACKENDS[name]() for name in INTRO_TTS_BACKENDS]
+        self.backends = backends
+
+    def cache_path(self, text, backend):
+        key = json.dumps({'text': text, 'lang': self.lang, 'voice': backend.voice}, sort_keys=True)
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{digest}.{backend.extension}")
+
+    def lookup(self, text):
+        """Путь к уже готовому клипу или None"""
+        for backend in self.backends:
+            path = self.cache_path(text, backend)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get(self, text):
+        """Путь к клипу с текстом: из кэша или свежесинтезированный; None, если все движки отказали"""
+        path = self.lookup(text)
+        if path:
+            return path
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for backend in self.backends:
+            path = self.cache_path(text, backend)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=f".{backend.extension}")
+            os.close(fd)
+            try:
+                backend.synthesize(text, self.lang, tmp_path)
+                if os.path.getsize(tmp_path) == 0:
+                    raise RuntimeError("движок вернул пустой файл")
+                # Атомарно: недописанный клип никогда не попадет в кэш
+                os.replace(tmp_path, path)
+                return path
+            except Exception as e:
+                print(f"Движок {backend.name} не смог озвучить интро: {e}")
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return None
+
+
+def generate_intro_audio(text, path, cache=None):
+    """
+    Кладет интро с текстом по пути path, но с расширением клипа (mp3 от gTTS, wav от
+    pyttsx3) - формат не меняется, поэтому возвращается итоговый путь; None, если
+    ни один движок не сработал.
+    """
     print("Генерация аудио...")
-    try:
-        tts = gTTS(text=text, lang='en', slow=False)
-        tts.save(path)
-        print(f"Аудио сохранено в {path}")
-        return True
-    except Exception as e:
-        print(f"Ошибка при генерации аудио: {e}")
-        return False
\ No newline at end of file
+    cache = cache or IntroVoiceCache()
+    base = os.path.splitext(path)[0]
+    # Старое интро от другой дуэли (в любом из форматов) не должно попасть в видео
+    for stale_path in {path} | {f"{base}.{backend.extension}" for backend in cache.backends}:
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    clip_path = cache.get(text)
+    if clip_path is None:
+        print("Ошибка при генерации аудио: ни один движок не сработал")
+        return None
+
+    path = base + os.path.splitext(clip_path)[1]
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    shutil.copyfile(clip_path, tmp_path)
+    os.replace(tmp_path, path)
+    print(f"Аудио сохранено в {path}")
+    return path
+
+
+def prewarm_intros(names, cache=None):
+    """Заранее озвучивает все пары стран (порядок важен: 'A versus B' != 'B versus A')"""
+    cache = cache or IntroVoiceCache()
+    generated = cached = failed = 0
+    for name1, name2 in itertools.permutations(names, 2):
+        text = intro_text(name1, name2)
+        if cache.lookup(text):
+            cached += 1
+        elif cache.get(text):
+            generated += 1
+        else:
+            failed += 1
+    return generated, cached, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Кэш интро-озвучек")
+    parser.add_argument("--prewarm", action="store_true", help="Озвучить все пары стран заранее")
+    parser.add_argument("--backends", nargs="+", choices=sorted(TTS_BACKENDS), default=None,
+                        help=f"Движки по порядку (по умолчанию {' '.join(INTRO_TTS_BACKENDS)})")
+    parser.add_argument("--lang", default="en")
+    args = parser.parse_args()
+
+    if not args.prewarm:
+        parser.print_help()
+        return
+
+    from fighter_selector import FIGHTERS
+    backends = [TTS_BACKENDS[name]() for name in args.backends] if args.backends else None
+    cache = IntroVoiceCache(backends=backends, lang=args.lang)
+    names = [fighter['name'] for fighter in FIGHTERS.values()]
+    generated, cached, failed = prewarm_intros(names, cache)
+    print(f"🔊 Интро: {generated} новых, {cached} уже в кэше, {failed} не удалось ({cache.cache_dir})")
+
+
+if __name__ == "__main__":
+    main()
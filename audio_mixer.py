@@ -0,0 +1,139 @@
+# audio_mixer.py
+import os
+import re
+import wave
+import hashlib
+import tempfile
+import subprocess
+import numpy as np
+from config import SOUND_CACHE_DIR
+from video_encoder import get_ffmpeg_binary
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+
+
+def decode_sound(path, sample_rate=SAMPLE_RATE, channels=CHANNELS):
+    """Декодирует звуковой файл через ffmpeg в массив float32 формы (samples, channels)"""
+    command = [
+        get_ffmpeg_binary(), "-loglevel", "error",
+        "-i", path,
+        "-f", "f32le", "-acodec", "pcm_f32le",
+        "-ac", str(channels), "-ar", str(sample_rate),
+        "-",
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"Не удалось декодировать {path}: {result.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, channels)
+
+
+DIGEST_SIZE = 16  # Байт хеша в имени записи кэша (в имени - вдвое больше hex-символов)
+
+# Уже загруженные звуки текущего процесса: (путь, mtime, размер, частота, каналы) -> массив
+_pcm_memo = {}
+
+
+def file_digest(path):
+    """Хеш содержимого файла - ключ кэша, поэтому измененный mp3 декодируется заново"""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(path, 'rb') as sound_file:
+        for block in iter(lambda: sound_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def remove_stale_pcm(cache_dir, stem, suffix, keep_path):
+    """
+    Удаляет старые версии звука: ровно <stem>-<хеш>-<частота>-<каналы>.npy с другим
+    хешем. Хеш - фиксированной длины hex, поэтому звуки, чье имя лишь начинается
+    с stem ('hit' и 'hit-2'), не задеваются. Уже открытый через mmap массив
+    остается читаемым (POSIX); если файл занят или уже удален - пропускаем.
+    """
+    pattern = re.compile(re.escape(stem) + r"-[0-9a-f]{%d}" % (DIGEST_SIZE * 2) + re.escape(suffix))
+    for name in os.listdir(cache_dir):
+        stale_path = os.path.join(cache_dir, name)
+        if pattern.fullmatch(name) and stale_path != keep_path:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
+
+def load_pcm(path, sample_rate=SAMPLE_RATE, channels=CHANNELS, cache_dir=SOUND_CACHE_DIR):
+    """
+    Как decode_sound, но через кэш на диске: <имя>-<хеш>-<частота>-<каналы>.npy.
+    Массив из кэша открывается через mmap (только чтение). Новая запись вытесняет
+    записи того же имени, частоты и каналов с другим хешем (см. remove_stale_pcm).
+    Для разовых звуков (интро дуэли) кэш не нужен - им хватит decode_sound.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size, sample_rate, channels)
+    if memo_key in _pcm_memo:
+        return _pcm_memo[memo_key]
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    suffix = f"-{sample_rate}-{channels}.npy"
+    cache_path = os.path.join(cache_dir, f"{stem}-{file_digest(path)}{suffix}")
+
+    if not os.path.exists(cache_path):
+        samples = decode_sound(path, sample_rate, channels)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Пишем во временный файл и переименовываем, чтобы параллельные запуски не прочитали половину
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                np.save(tmp_file, samples)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        remove_stale_pcm(cache_dir, stem, suffix, cache_path)
+
+    samples = np.load(cache_path, mmap_mode='r')
+    _pcm_memo[memo_key] = samples
+    return samples
+
+
+class AudioMixer:
+    """
+    Сводит дорожку в один заранее выделенный буфер: каждый звук декодируется
+    один раз и прибавляется по точному смещению в сэмплах. Клиппинг - один раз в конце.
+    """
+
+    def __init__(self, duration, sample_rate=SAMPLE_RATE, channels=CHANNELS):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.buffer = np.zeros((int(round(duration * sample_rate)), channels), dtype=np.float32)
+        self.event_count = 0
+
+    def add(self, samples, start_time, gain=1.0):
+        """Прибавляет звук, начиная с момента start_time (секунды); хвост за концом дорожки обрезается"""
+        offset = int(round(start_time * self.sample_rate))
+        if offset < 0 or offset >= len(self.buffer):
+            return
+        length = min(len(samples), len(self.buffer) - offset)
+        if gain == 1.0:
+            self.buffer[offset:offset + length] += samples[:length]
+        else:
+            self.buffer[offset:offset + length] += samples[:length] * np.float32(gain)
+        self.event_count += 1
+
+    def add_events(self, samples, frames, fps, gain=1.0):
+        """Прибавляет один и тот же звук на каждом кадре из frames"""
+        for frame_num in frames:
+            self.add(samples, frame_num / fps, gain)
+
+    def mix(self):
+        """Итоговая дорожка, обрезанная в [-1, 1]"""
+        return np.clip(self.buffer, -1.0, 1.0)
+
+    def write_wav(self, path):
+        """Сохраняет дорожку в 16-битный WAV"""
+        pcm = (self.mix() * 32767).astype('<i2')
+        with wave.open(path, 'wb') as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(pcm.tobytes())
+        return path
@@ -0,0 +1,264 @@
+# balance.py
+import os
+import csv
+import json
+import math
+import time
+import argparse
+import itertools
+import multiprocessing
+from statistics import NormalDist
+import numpy as np
+from config import FPS, OUTPUT_DIR
+from duel_engine import DEFAULT_MAX_FRAMES, iter_duels, resolve_fighter
+
+BALANCE_PATH = f"{OUTPUT_DIR}/balance.json"
+Z_95 = 1.959964  # Квантиль нормального распределения для 95% интервала
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    """Интервал Уилсона для доли успехов: устойчив при долях около 0 и 1 и малых выборках"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def sequential_z(alpha, looks):
+    """
+    z одного промежуточного взгляда, когда ошибка alpha расходуется поровну на looks
+    проверок (Бонферрони): интервал, по которому остановились, покрывает долю с
+    вероятностью не ниже 1 - alpha, сколько бы раз на него ни смотрели.
+    """
+    return NormalDist().inv_cdf(1 - alpha / (2 * looks))
+
+
+def distribution(values):
+    """Сводка распределения: среднее, отклонение и перцентили"""
+    if not values:
+        return {'mean': 0.0, 'std': 0.0, 'p10': 0.0, 'p50': 0.0, 'p90': 0.0}
+    values = np.asarray(values, dtype=float)
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {'mean': float(values.mean()), 'std': float(values.std()),
+            'p10': float(p10), 'p50': float(p50), 'p90': float(p90)}
+
+
+class MatchupStats:
+    """Накопленные итоги одной упорядоченной пары бойцов (первый - ball1)"""
+
+    def __init__(self, fighter_a, fighter_b):
+        self.fighters = (fighter_a, fighter_b)
+        self.duels = 0
+        self.wins = [0, 0]
+        self.draws = 0  # Дуэли, упершиеся в max_frames
+        self.frames = []
+        self.damage = ([], [])  # Урон, нанесенный каждым бойцом за дуэль
+        self.z = Z_95  # Последовательный прогон расширяет интервал (см. sequential_z)
+
+    def add(self, result):
+        self.duels += 1
+        if result.winner_index is None:
+            self.draws += 1
+        else:
+            self.wins[result.winner_index] += 1
+        self.frames.append(result.frames)
+        for index, target in ((0, result.final_stats[1]), (1, result.final_stats[0])):
+            self.damage[index].append(target['max_health'] - target['health'])
+
+    @property
+    def win_rate(self):
+        """Доля побед первого бойца (ничьи - не победы)"""
+        return self.wins[0] / self.duels if self.duels else 0.0
+
+    def interval(self, z=None):
+        return wilson_interval(self.wins[0], self.duels, self.z if z is None else z)
+
+    def settled(self, ci_width, max_duels):
+        """Пару можно не досчитывать: интервал стал уже ci_width или выбран весь лимит"""
+        low, high = self.interval()
+        return self.duels >= max_duels or high - low <= ci_width
+
+    def to_dict(self):
+        low, high = self.interval()
+        return {
+            'fighter_a': self.fighters[0],
+            'fighter_b': self.fighters[1],
+            'duels': self.duels,
+            'wins_a': self.wins[0],
+            'wins_b': self.wins[1],
+            'draws': self.draws,
+            'win_rate_a': self.win_rate,
+            'ci_low': low,
+            'ci_high': high,
+            'ci_z': self.z,
+            'mean_frames': float(np.mean(self.frames)) if self.frames else 0.0,
+            'mean_seconds': float(np.mean(self.frames)) / FPS if self.frames else 0.0,
+            'damage_a': distribution(self.damage[0]),
+            'damage_b': distribution(self.damage[1]),
+        }
+
+
+def fighter_names(fighters):
+    """Имена классов бойцов: результаты дуэлей приходят с ними, а не с 'Russia' или номером"""
+    return [resolve_fighter(fighter).__name__ for fighter in fighters]
+
+
+def matchup_jobs(fighters, duels, seed=0, max_frames=DEFAULT_MAX_FRAMES):
+    """Все упорядоченные пары (включая зеркальные) по duels дуэлей с сидами seed, seed+1, ..."""
+    return [(fighter_a, fighter_b, seed + index, max_frames)
+            for fighter_a, fighter_b in itertools.product(fighters, repeat=2)
+            for index in range(duels)]
+
+
+def run_matrix(fighters, duels, seed=0, max_frames=DEFAULT_MAX_FRAMES, workers=None, on_result=None):
+    """
+    Прогоняет каждую упорядоченную пару duels раз пулом процессов.
+    Возвращает {(fighter_a, fighter_b): MatchupStats} с именами классов в ключах;
+    on_result(done, total) - для прогресса.
+    """
+    fighters = fighter_names(fighters)
+    stats = {(a, b): MatchupStats(a, b) for a, b in itertools.product(fighters, repeat=2)}
+    jobs = matchup_jobs(fighters, duels, seed, max_frames)
+    for done, result in enumerate(iter_duels(jobs, workers), 1):
+        stats[result.fighters].add(result)
+        if on_result:
+            on_result(done, len(jobs))
+    return stats
+
+
+def run_sequential(fighters, max_duels, ci_width, batch=50, alpha=0.05, seed=0,
+                   max_frames=DEFAULT_MAX_FRAMES, workers=None, on_round=None):
+    """
+    Последовательный прогон: пары считаются пачками по batch дуэлей, и пара выбывает,
+    как только ее интервал уже ci_width (или выбран лимит max_duels). Явно неравные
+    пары останавливаются после пары пачек, а процессор уходит на близкие.
+    on_round(round_index, active_pairs, duels_done) - для прогресса.
+    """
+    fighters = fighter_names(fighters)
+    z = sequential_z(alpha, math.ceil(max_duels / batch))
+    stats = {(a, b): MatchupStats(a, b) for a, b in itertools.product(fighters, repeat=2)}
+    for matchup in stats.values():
+        matchup.z = z
+    active = list(stats)
+    workers = workers or os.cpu_count() or 1
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        round_index = 0
+        while active:
+            # Сиды пары продолжаются с того места, где остановилась прошлая пачка
+            jobs = [(a, b, seed + stats[a, b].duels + index, max_frames)
+                    for a, b in active for index in range(min(batch, max_duels - stats[a, b].duels))]
+            for result in iter_duels(jobs, workers, pool=pool):
+                stats[result.fighters].add(result)
+            active = [key for key in active if not stats[key].settled(ci_width, max_duels)]
+            round_index += 1
+            if on_round:
+                on_round(round_index, len(active), sum(matchup.duels for matchup in stats.values()))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return stats
+
+
+def matrix_to_dict(fighters, stats, **settings):
+    """JSON-отчет: настройки, матрица долей побед (строка бьет столбец) и подробности по парам"""
+    return {
+        'settings': settings,
+        'fighters': list(fighters),
+        'win_rate_matrix': [[stats[a, b].win_rate for b in fighters] for a in fighters],
+        'matchups': [stats[a, b].to_dict() for a in fighters for b in fighters],
+    }
+
+
+CSV_FIELDS = ('fighter_a', 'fighter_b', 'duels', 'wins_a', 'wins_b', 'draws', 'win_rate_a',
+              'ci_low', 'ci_high', 'ci_z', 'mean_frames', 'mean_seconds')
+
+
+def write_csv(path, fighters, stats):
+    """Одна строка на пару; распределения урона - колонками damage_a_mean, damage_b_p90 и т.д."""
+    rows = []
+    for a in fighters:
+        for b in fighters:
+            matchup = stats[a, b].to_dict()
+            row = {field: matchup[field] for field in CSV_FIELDS}
+            for side in ('damage_a', 'damage_b'):
+                for name, value in matchup[side].items():
+                    row[f"{side}_{name}"] = value
+            rows.append(row)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_matrix(fighters, stats):
+    short = [name.replace('Ball', '')[:8] for name in fighters]
+    print(" " * 10 + "".join(f"{name:>10}" for name in short))
+    for a, name in zip(fighters, short):
+        print(f"{name:>10}" + "".join(f"{stats[a, b].win_rate:>10.1%}" for b in fighters))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Баланс: матрица побед бойцов по пачке безголовых дуэлей")
+    parser.add_argument("--duels", type=int, default=200,
+                        help="Дуэлей на каждую упорядоченную пару (с --ci-width - предел на пару)")
+    parser.add_argument("--fighters", nargs="+", default=None,
+                        help="Бойцы: классы, страны или номера (по умолчанию все из get_fighter_classes)")
+    parser.add_argument("--seed", type=int, default=0, help="Сид первой дуэли пары, дальше seed+1, ...")
+    parser.add_argument("--max-frames", type=int, default=DEFAULT_MAX_FRAMES,
+                        help="Предел длины дуэли в кадрах (дольше - ничья)")
+    parser.add_argument("--workers", type=int, default=0, help="Процессов (0 - все ядра)")
+    parser.add_argument("--out", default=BALANCE_PATH, help="Отчет: .json или .csv")
+    parser.add_argument("--ci-width", type=float, default=None,
+                        help="Последовательный режим: останавливать пару, когда интервал уже этого")
+    parser.add_argument("--batch", type=int, default=50,
+                        help="Последовательный режим: дуэлей на пару между проверками")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="Последовательный режим: ошибка на пару с учетом всех проверок")
+    return parser.parse_args()
+
+
+def main():
+    from fighter_selector import get_fighter_classes
+    args = parse_args()
+    fighters = fighter_names(args.fighters) if args.fighters else list(get_fighter_classes())
+    total = len(fighters) ** 2 * args.duels
+    print(f"⚖️ {len(fighters)} бойцов, {args.duels} дуэлей на пару - всего {total}")
+
+    started = time.time()
+
+    def report_progress(done, total):
+        if done % max(1, total // 20) == 0 or done == total:
+            print(f"  ⏳ {done}/{total} дуэлей ({time.time() - started:.0f} с)")
+
+    settings = {'duels': args.duels, 'seed': args.seed, 'max_frames': args.max_frames}
+    if args.ci_width is None:
+        stats = run_matrix(fighters, args.duels, args.seed, args.max_frames, args.workers or None, report_progress)
+    else:
+        def report_round(round_index, active, done):
+            print(f"  ⏳ Проверка {round_index}: осталось пар {active}, дуэлей {done} "
+                  f"({time.time() - started:.0f} с)")
+
+        settings.update(ci_width=args.ci_width, batch=args.batch, alpha=args.alpha)
+        stats = run_sequential(fighters, args.duels, args.ci_width, args.batch, args.alpha, args.seed,
+                               args.max_frames, args.workers or None, report_round)
+        done = sum(matchup.duels for matchup in stats.values())
+        print(f"✂️ Последовательная остановка: {done} дуэлей из {total} ({done / total:.0%})")
+    print_matrix(fighters, stats)
+
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    if args.out.endswith('.csv'):
+        write_csv(args.out, fighters, stats)
+    else:
+        report = matrix_to_dict(fighters, stats, **settings)
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"📊 Отчет -> {args.out} ({time.time() - started:.0f} с)")
+
+
+if __name__ == "__main__":
+    main()
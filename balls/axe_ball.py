@@ -1,11 +1,17 @@
 # balls/axe_ball.py
 from .base_fighter import FightingBall
+from surface_pool import circle_stamp
+from particles import draw_circles
+import numpy as np
 import math
 import random
 
 class AxeBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=45, color=(150, 75, 0), 
+    RENDER_FIELDS = FightingBall.RENDER_FIELDS + ('is_dashing', 'dash_timer', 'dash_cooldown')
+    RENDER_LISTS = {'dash_trail': ('x', 'y')}
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=45, color=(150, 75, 0), 
                          name="Axe Berserker", weapon_type="axe")
         
         self.stats = {'damage': 8, 'range': 90, 'speed': 2, 'radius': self.radius}
@@ -28,6 +34,12 @@ class AxeBall(FightingBall):
         self.weapon_rotation_speed = 7
         self.base_rotation_speed = 12  # Быстрее вращается
 
+    def unpack_render_item(self, list_name, values):
+        # След хранится как точки (x, y), а не словари
+        if list_name == 'dash_trail':
+            return tuple(values)
+        return super().unpack_render_item(list_name, values)
+
     def start_dash(self, target):
         """Начинает рывок к противнику"""
         if self.dash_cooldown <= 0 and not self.is_dashing:
@@ -38,8 +50,8 @@ class AxeBall(FightingBall):
             self.dash_trail = []  # Очищаем след
             
             # Сильный импульс к цели
-            dx = target.rect.centerx - self.rect.centerx
-            dy = target.rect.centery - self.rect.centery
+            dx = target.x - self.x
+            dy = target.y - self.y
             distance = math.sqrt(dx*dx + dy*dy)
             if distance > 0:
                 dash_force = 15
@@ -78,8 +90,8 @@ class AxeBall(FightingBall):
         # Автоматический рывок когда кулдаун готов
         if other_ball and self.dash_cooldown <= 0 and not self.is_dashing:
             # Проверяем расстояние до противника
-            dx = other_ball.rect.centerx - self.rect.centerx
-            dy = other_ball.rect.centery - self.rect.centery
+            dx = other_ball.x - self.x
+            dy = other_ball.y - self.y
             distance = math.sqrt(dx*dx + dy*dy)
             
             # Рывок если противник не слишком близко и не слишком далеко
@@ -89,6 +101,10 @@ class AxeBall(FightingBall):
         # Базовое обновление
         super().update(other_ball)
 
+    def unpack_render_item(self, list_name, values):
+        # След рывка хранится кортежами позиций
+        return tuple(values)
+
     def take_damage(self, amount):
         # Во время рывка неуязвим!
         if self.is_dashing:
@@ -105,9 +121,10 @@ class AxeBall(FightingBall):
         # Восстанавливает немного здоровья после удара (берсерк)
         self.health = min(self.max_health, self.health + 1)
 
-    def draw_pixel_axe(self, screen, start_pos, end_pos):
+    def draw_pixel_axe(self, screen, center, angle, length, width):
         """Рисует красивый пиксельный двуручный топор с контрастными цветами"""
         import pygame
+        start_pos, end_pos = self.get_weapon_line_at(center, angle, length)
         
         # Вычисляем угол для правильного позиционирования лезвий
         dx = end_pos[0] - start_pos[0]
@@ -115,7 +132,7 @@ class AxeBall(FightingBall):
         handle_angle = math.atan2(dy, dx)
         
         # Рукоять топора (деревянная с обмоткой)
-        handle_width = max(8, int(self.weapon_width * 0.4))
+        handle_width = max(8, int(width * 0.4))
         
         # Основа рукояти (темный контур)
         pygame.draw.line(screen, (20, 10, 5), start_pos, end_pos, handle_width + 4)
@@ -142,7 +159,7 @@ class AxeBall(FightingBall):
             pygame.draw.line(screen, (90, 60, 30), wrap_start_pos, wrap_end_pos, handle_width)
         
         # Головка топора
-        head_size = max(30, int(self.weapon_width * 1.8))
+        head_size = max(30, int(width * 1.8))
         head_x = end_pos[0]
         head_y = end_pos[1]
         
@@ -235,45 +252,47 @@ class AxeBall(FightingBall):
                 pygame.draw.line(screen, (220, 220, 230), mid_point, inner_point, 2)
 
     def draw_weapon(self, screen):
-        start_pos, end_pos = self.get_weapon_line()
-        self.draw_pixel_axe(screen, start_pos, end_pos)
+        length, width = self.get_weapon_sprite_params()
+        head_size = max(30, int(width * 1.8))
+        extent = self.radius + length + head_size * 2 + 20
+        atlas = self.get_sprite_atlas('axe', self.draw_pixel_axe, extent, length, width)
+        atlas.blit(screen, self.rect.center, self.weapon_angle)
 
     def draw(self, screen):
         import pygame
         
         # Эффект следа от рывка
         if self.dash_trail:
-            for i, pos in enumerate(self.dash_trail):
-                alpha = int(255 * (i + 1) / len(self.dash_trail) * 0.6)
-                radius = int(self.radius * (0.3 + 0.7 * (i + 1) / len(self.dash_trail)))
-                
-                # Создаем поверхность для полупрозрачного эффекта
-                trail_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                trail_color = (255, 150, 50, alpha)
-                pygame.draw.circle(trail_surface, trail_color, (radius, radius), radius)
-                screen.blit(trail_surface, (pos[0] - radius, pos[1] - radius))
+            # Старые точки следа меньше и прозрачнее - все круги одним пакетом
+            count = len(self.dash_trail)
+            index = np.arange(1, count + 1)
+            positions = np.array(self.dash_trail, dtype=float).reshape(-1, 2)
+            alphas = (255 * index / count * 0.6).astype(int)
+            radii = (self.radius * (0.3 + 0.7 * index / count)).astype(int)
+            colors = np.column_stack([np.full_like(alphas, 255), np.full_like(alphas, 150),
+                                      np.full_like(alphas, 50), alphas])
+            draw_circles(screen, positions[:, 0], positions[:, 1], radii, colors)
         
         # Эффект рывка
         if self.is_dashing:
             # Яркое свечение во время рывка
             glow_radius = self.radius + 15
-            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
             
             # Пульсирующее свечение
             pulse = 0.7 + 0.3 * math.sin(self.dash_timer * 0.3)
             glow_alpha = int(120 * pulse)
             glow_color = (255, 100, 0, glow_alpha)
             
-            pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), glow_radius)
+            glow_surface = circle_stamp(glow_radius, glow_color)
             screen.blit(glow_surface, (self.rect.centerx - glow_radius, self.rect.centery - glow_radius))
         
         # Индикатор готовности рывка
         if self.dash_cooldown <= 60 and not self.is_dashing:  # Мигает последнюю секунду
             if (self.dash_cooldown // 10) % 2:
                 ready_color = (255, 255, 0, 150)
-                ready_surface = pygame.Surface((self.radius * 3, self.radius * 3), pygame.SRCALPHA)
-                pygame.draw.circle(ready_surface, ready_color, 
-                                 (self.radius * 1.5, self.radius * 1.5), self.radius + 5, 4)
+                ready_surface = circle_stamp(self.radius + 5, ready_color, 4,
+                                             size=(self.radius * 3, self.radius * 3),
+                                             center=(self.radius * 1.5, self.radius * 1.5))
                 screen.blit(ready_surface, 
                           (self.rect.centerx - self.radius * 1.5, self.rect.centery - self.radius * 1.5))
         
@@ -4,18 +4,41 @@ import os
 import math
 import random
 from config import ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT
+from fonts import get_font
+from sprite_atlas import get_atlas, quantize, LENGTH_BUCKET
+from collision import Capsule
+
+# Готовые спрайты флагов с круглой маской: (класс, радиус, прозрачность) -> поверхность.
+# Флаг зависит только от страны и радиуса, поэтому рисуется один раз на процесс.
+_flag_sprites = {}
 
 class FightingBall:
-    def __init__(self, x, y, radius, color, name, weapon_type="sword"):
-        self.rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
+    # Скалярные поля, нужные для отрисовки кадра (снимок для трассы дуэли)
+    RENDER_FIELDS = ('centerx', 'centery', 'angle', 'weapon_angle', 'weapon_length', 'weapon_width',
+                     'health', 'max_health', 'is_invulnerable', 'invulnerable_timer', 'attack_cooldown',
+                     'damage', 'range')
+    # Списки снарядов/эффектов для отрисовки: имя атрибута -> поля одного элемента
+    RENDER_LISTS = {}
+
+    def __init__(self, x, y, radius, color, name, weapon_type="sword", rng=None):
+        # Физика ведет дробный центр (x, y); целый rect только следует за ним (см. set_position)
+        self.rect = pygame.Rect(0, 0, radius * 2, radius * 2)
         self.radius = radius
+        self.set_position(float(x), float(y))
+        # Подшагов движения за кадр (GameState выдает общее число на дуэль)
+        self.substeps = 1
         self.color = color
         self.name = name
         self.weapon_type = weapon_type
 
+        # Случайность симуляции идет только через self.rng (GameState подменяет его своим),
+        # случайность отрисовки - через self.fx_rng (Renderer выдает его на каждый кадр)
+        self.rng = rng if rng is not None else random.Random()
+        self.fx_rng = random.Random()
+
         # УЛУЧШЕННАЯ ФИЗИКА для TikTok/YouTube Shorts
-        self.vx = random.uniform(-8, 8)
-        self.vy = random.uniform(-6, 6)
+        self.vx = self.rng.uniform(-8, 8)
+        self.vy = self.rng.uniform(-6, 6)
         self.gravity = 0.2
         self.bounce_energy = 1.2  # Уменьшили энергию отскока
         self.friction = 0.998  # Больше трения для более спокойного движения
@@ -31,6 +54,8 @@ class FightingBall:
         self.weapon_angle = 0
         self.weapon_rotation_speed = 4
         self.weapon_rotation_direction = 1
+        # (угол, sin, cos) по имени атрибута угла - см. get_direction()
+        self.directions = {}
 
         # Параметры оружия - УВЕЛИЧЕННЫЕ в 2 раза для лучшей видимости
         self.weapon_length = 100 if weapon_type == "sword" else 120
@@ -52,7 +77,62 @@ class FightingBall:
         self.stats = {'damage': 10, 'range': 1, 'speed': 1, 'radius': self.radius}
 
         # Для предотвращения прохождения сквозь друг друга
-        self.last_pos = (self.rect.centerx, self.rect.centery)
+        self.last_pos = (self.x, self.y)
+
+    def get_render_field(self, name):
+        if name in ('centerx', 'centery'):
+            return self.x if name == 'centerx' else self.y
+        if name in ('damage', 'range'):
+            return self.stats.get(name, 0)
+        return getattr(self, name)
+
+    def set_render_field(self, name, value):
+        if name == 'centerx':
+            self.set_position(value, self.y)
+        elif name == 'centery':
+            self.set_position(self.x, value)
+        elif name in ('damage', 'range'):
+            self.stats[name] = value
+        else:
+            setattr(self, name, value)
+
+    def pack_render_item(self, list_name, item):
+        fields = self.RENDER_LISTS[list_name]
+        if isinstance(item, dict):
+            return tuple(item[field] for field in fields)
+        return tuple(item)
+
+    def unpack_render_item(self, list_name, values):
+        return dict(zip(self.RENDER_LISTS[list_name], values))
+
+    def get_render_list(self, name):
+        """Элементы списка name в снимке - кортежи полей RENDER_LISTS[name]"""
+        items = getattr(self, name)
+        if hasattr(items, 'rows'):
+            # Пулы снарядов и системы частиц отдают колонки сами
+            return items.rows(*self.RENDER_LISTS[name])
+        return [self.pack_render_item(name, item) for item in items]
+
+    def set_render_list(self, name, items):
+        container = getattr(self, name, None)
+        if hasattr(container, 'load_rows'):
+            container.load_rows(self.RENDER_LISTS[name], items)
+        else:
+            setattr(self, name, [self.unpack_render_item(name, values) for values in items])
+
+    def get_render_state(self):
+        """Компактный снимок состояния для отрисовки: (кортеж скаляров, {список: [кортежи]})"""
+        scalars = tuple(self.get_render_field(name) for name in self.RENDER_FIELDS)
+        lists = {name: self.get_render_list(name) for name in self.RENDER_LISTS}
+        return scalars, lists
+
+    def apply_render_state(self, state, opponent=None):
+        """Восстанавливает снимок из get_render_state() для отрисовки (без симуляции)"""
+        scalars, lists = state
+        for name, value in zip(self.RENDER_FIELDS, scalars):
+            self.set_render_field(name, value)
+        for name in self.RENDER_LISTS:
+            self.set_render_list(name, lists.get(name, ()))
 
     def take_damage(self, amount):
         if self.is_invulnerable:
@@ -69,8 +149,8 @@ class FightingBall:
         # БОЛЕЕ ЭФФЕКТНЫЙ отброс
         knockback_force = 6
         if hasattr(self, 'last_attacker_pos'):
-            dx = self.rect.centerx - self.last_attacker_pos[0]
-            dy = self.rect.centery - self.last_attacker_pos[1]
+            dx = self.x - self.last_attacker_pos[0]
+            dy = self.y - self.last_attacker_pos[1]
             distance = math.sqrt(dx*dx + dy*dy)
             if distance > 0:
                 self.vx += (dx / distance) * knockback_force
@@ -85,7 +165,7 @@ class FightingBall:
         if not self.can_attack():
             return False
 
-        target.last_attacker_pos = self.rect.center
+        target.last_attacker_pos = (self.x, self.y)
         success = target.take_damage(self.stats['damage'])
         if success:
             self.attack_cooldown = self.attack_cooldown_duration
@@ -99,8 +179,8 @@ class FightingBall:
         # УЛУЧШЕННОЕ парирование - более естественный отброс
         center_x = ARENA_X + ARENA_WIDTH / 2
         center_y = ARENA_Y + ARENA_HEIGHT / 2
-        dx = self.rect.centerx - center_x
-        dy = self.rect.centery - center_y
+        dx = self.x - center_x
+        dy = self.y - center_y
         distance = math.sqrt(dx*dx + dy*dy)
         if distance > 0:
             bounce_force = 8  # Увеличили силу отброса для парирования
@@ -108,13 +188,22 @@ class FightingBall:
             self.vy += (dy / distance) * bounce_force - 3
         
         # Добавляем больше случайности для парирования
-        self.vx += random.uniform(-2, 2)
-        self.vy += random.uniform(-2, 2)
+        self.vx += self.rng.uniform(-2, 2)
+        self.vy += self.rng.uniform(-2, 2)
+
+    def set_position(self, x, y):
+        """
+        Сдвигает центр шарика. Дробные x, y - состояние физики: движение по долям
+        пикселя не теряется; rect округляется из них и нужен только для отрисовки.
+        """
+        self.x = x
+        self.y = y
+        self.rect.center = (x, y)
 
     def check_collision_with_other(self, other):
         """Проверка и разрешение столкновений между шариками"""
-        dx = other.rect.centerx - self.rect.centerx
-        dy = other.rect.centery - self.rect.centery
+        dx = other.x - self.x
+        dy = other.y - self.y
         distance = math.sqrt(dx*dx + dy*dy)
         min_distance = self.radius + other.radius
 
@@ -128,10 +217,8 @@ class FightingBall:
             ny = dy / distance
 
             # Раздвигаем шарики
-            self.rect.centerx -= nx * move_distance
-            self.rect.centery -= ny * move_distance
-            other.rect.centerx += nx * move_distance
-            other.rect.centery += ny * move_distance
+            self.set_position(self.x - nx * move_distance, self.y - ny * move_distance)
+            other.set_position(other.x + nx * move_distance, other.y + ny * move_distance)
 
             # Обмен скоростями с коэффициентом отскока
             bounce_factor = 0.7
@@ -166,14 +253,14 @@ class FightingBall:
         self.vy *= self.friction
 
         # Ограничение максимальной скорости
-        speed = math.sqrt(self.vx**2 + self.vy**2)
+        speed = math.sqrt(self.vx * self.vx + self.vy * self.vy)
         if speed > self.max_speed:
             factor = self.max_speed / speed
             self.vx *= factor
             self.vy *= factor
 
         # Вращение шарика на основе скорости
-        total_speed = math.sqrt(self.vx**2 + self.vy**2)
+        total_speed = math.sqrt(self.vx * self.vx + self.vy * self.vy)
         self.angular_velocity = (total_speed * 2 + self.base_rotation_speed) 
         if self.vx < 0:
             self.angular_velocity = -self.angular_velocity
@@ -185,69 +272,92 @@ class FightingBall:
             self.angle += 360
 
         # Сохраняем предыдущую позицию
-        self.last_pos = (self.rect.centerx, self.rect.centery)
+        self.last_pos = (self.x, self.y)
+
+        # Движение равными подшагами: столкновения с соперником и стенами - на каждом
+        for _ in range(self.substeps):
+            self.set_position(self.x + self.vx / self.substeps, self.y + self.vy / self.substeps)
 
-        # Движение
-        self.rect.x += self.vx
-        self.rect.y += self.vy
+            # Проверка столкновений с другим шариком
+            if other_ball:
+                self.check_collision_with_other(other_ball)
 
-        # Проверка столкновений с другим шариком
-        if other_ball:
-            self.check_collision_with_other(other_ball)
+            self.bounce_off_walls()
 
-        # ИСПРАВЛЕННЫЕ отскоки от стен - предотвращаем вертикальное зацикливание
-        if self.rect.left <= ARENA_X:
-            self.rect.left = ARENA_X
+        # Поддержание минимальной скорости
+        total_speed = math.sqrt(self.vx * self.vx + self.vy * self.vy)
+        if total_speed < self.min_speed:
+            factor = self.min_speed / max(total_speed, 0.1)
+            self.vx *= factor * 1.1
+            self.vy *= factor * 1.1
+
+    def bounce_off_walls(self):
+        """ИСПРАВЛЕННЫЕ отскоки от стен - предотвращаем вертикальное зацикливание"""
+        if self.x - self.radius <= ARENA_X:
+            self.set_position(ARENA_X + self.radius, self.y)
             self.vx = -self.vx * self.bounce_energy
             self.vx += 2  # Небольшой импульс чтобы не застревать
 
-        if self.rect.right >= ARENA_X + ARENA_WIDTH:
-            self.rect.right = ARENA_X + ARENA_WIDTH
+        if self.x + self.radius >= ARENA_X + ARENA_WIDTH:
+            self.set_position(ARENA_X + ARENA_WIDTH - self.radius, self.y)
             self.vx = -self.vx * self.bounce_energy
             self.vx -= 2  # Небольшой импульс чтобы не застревать
 
-        if self.rect.top <= ARENA_Y:
-            self.rect.top = ARENA_Y
+        if self.y - self.radius <= ARENA_Y:
+            self.set_position(self.x, ARENA_Y + self.radius)
             self.vy = -self.vy * self.bounce_energy
             # Предотвращаем вертикальное зацикливание
             if abs(self.vx) < 3:
-                self.vx += random.uniform(-4, 4)
+                self.vx += self.rng.uniform(-4, 4)
 
-        if self.rect.bottom >= ARENA_Y + ARENA_HEIGHT:
-            self.rect.bottom = ARENA_Y + ARENA_HEIGHT
+        if self.y + self.radius >= ARENA_Y + ARENA_HEIGHT:
+            self.set_position(self.x, ARENA_Y + ARENA_HEIGHT - self.radius)
             self.vy = -self.vy * self.bounce_energy
             # Предотвращаем вертикальное зацикливание
             if abs(self.vx) < 3:
-                self.vx += random.uniform(-4, 4)
-
-        # Поддержание минимальной скорости
-        total_speed = math.sqrt(self.vx**2 + self.vy**2)
-        if total_speed < self.min_speed:
-            factor = self.min_speed / max(total_speed, 0.1)
-            self.vx *= factor * 1.1
-            self.vy *= factor * 1.1
+                self.vx += self.rng.uniform(-4, 4)
+
+    def get_direction(self, attribute='weapon_angle'):
+        """
+        (sin, cos) угла из атрибута в градусах. Пересчитываются, только когда угол
+        изменился - то есть раз за шаг, - и общие для столкновений, стрельбы и отрисовки.
+        """
+        angle = getattr(self, attribute)
+        cached = self.directions.get(attribute)
+        if cached is None or cached[0] != angle:
+            radians = math.radians(angle)
+            cached = (angle, math.sin(radians), math.cos(radians))
+            self.directions[attribute] = cached
+        return cached[1], cached[2]
 
     def get_weapon_line(self):
-        center_x = self.rect.centerx
-        center_y = self.rect.centery
-        start_x = center_x + self.radius * math.sin(math.radians(self.weapon_angle))
-        start_y = center_y - self.radius * math.cos(math.radians(self.weapon_angle))
-        end_x = center_x + (self.radius + self.weapon_length) * math.sin(math.radians(self.weapon_angle))
-        end_y = center_y - (self.radius + self.weapon_length) * math.cos(math.radians(self.weapon_angle))
+        sin_a, cos_a = self.get_direction()
+        return self.weapon_line_points((self.x, self.y), sin_a, cos_a, self.weapon_length)
+
+    def get_weapon_line_at(self, center, angle, length):
+        """Отрезок оружия от края шарика для произвольного центра, угла и длины"""
+        radians = math.radians(angle)
+        return self.weapon_line_points(center, math.sin(radians), math.cos(radians), length)
+
+    def weapon_line_points(self, center, sin_a, cos_a, length):
+        center_x, center_y = center
+        start_x = center_x + self.radius * sin_a
+        start_y = center_y - self.radius * cos_a
+        end_x = center_x + (self.radius + length) * sin_a
+        end_y = center_y - (self.radius + length) * cos_a
         return (start_x, start_y), (end_x, end_y)
 
-    def get_weapon_rect(self):
+    def get_weapon_shape(self):
+        """Форма оружия для столкновений: капсула вдоль клинка толщиной weapon_width"""
         start_pos, end_pos = self.get_weapon_line()
-        min_x = min(start_pos[0], end_pos[0]) - self.weapon_width // 2
-        max_x = max(start_pos[0], end_pos[0]) + self.weapon_width // 2
-        min_y = min(start_pos[1], end_pos[1]) - self.weapon_width // 2
-        max_y = max(start_pos[1], end_pos[1]) + self.weapon_width // 2
-        return pygame.Rect(min_x, min_y, max_x - min_x, max_y - min_y)
+        return Capsule(start_pos[0], start_pos[1], end_pos[0], end_pos[1], self.weapon_width / 2)
 
-    def draw_pixel_sword(self, screen, start_pos, end_pos):
+    def draw_pixel_sword(self, screen, center, angle, length, width):
         """Рисует красивый пиксельный меч с отличной контрастностью"""
+        start_pos, end_pos = self.get_weapon_line_at(center, angle, length)
+
         # Основное лезвие с темным контуром
-        blade_width = max(4, int(self.weapon_width * 0.8))
+        blade_width = max(4, int(width * 0.8))
         pygame.draw.line(screen, (40, 40, 40), start_pos, end_pos, blade_width + 4)  # Темный контур
         pygame.draw.line(screen, (160, 160, 160), start_pos, end_pos, blade_width)   # Основное лезвие
         
@@ -258,8 +368,8 @@ class FightingBall:
         
         # Рукоять
         handle_length = 20
-        handle_start_x = self.rect.centerx + (self.radius - handle_length) * math.sin(math.radians(self.weapon_angle))
-        handle_start_y = self.rect.centery - (self.radius - handle_length) * math.cos(math.radians(self.weapon_angle))
+        handle_start_x = center[0] + (self.radius - handle_length) * math.sin(math.radians(angle))
+        handle_start_y = center[1] - (self.radius - handle_length) * math.cos(math.radians(angle))
         handle_end = start_pos
         
         pygame.draw.line(screen, (20, 10, 0), (handle_start_x, handle_start_y), handle_end, blade_width + 6)  # Темный контур
@@ -267,31 +377,33 @@ class FightingBall:
         
         # Гарда (перекрестие)
         guard_length = 18
-        guard_start_x = start_pos[0] - guard_length * math.cos(math.radians(self.weapon_angle))
-        guard_start_y = start_pos[1] - guard_length * math.sin(math.radians(self.weapon_angle))
-        guard_end_x = start_pos[0] + guard_length * math.cos(math.radians(self.weapon_angle))
-        guard_end_y = start_pos[1] + guard_length * math.sin(math.radians(self.weapon_angle))
+        guard_start_x = start_pos[0] - guard_length * math.cos(math.radians(angle))
+        guard_start_y = start_pos[1] - guard_length * math.sin(math.radians(angle))
+        guard_end_x = start_pos[0] + guard_length * math.cos(math.radians(angle))
+        guard_end_y = start_pos[1] + guard_length * math.sin(math.radians(angle))
         
         pygame.draw.line(screen, (30, 30, 30), (guard_start_x, guard_start_y), (guard_end_x, guard_end_y), blade_width + 2)
         pygame.draw.line(screen, (150, 150, 150), (guard_start_x, guard_start_y), (guard_end_x, guard_end_y), blade_width)
         
         # Острие меча
         tip_length = 15
-        tip_x = end_pos[0] + tip_length * math.sin(math.radians(self.weapon_angle))
-        tip_y = end_pos[1] - tip_length * math.cos(math.radians(self.weapon_angle))
+        tip_x = end_pos[0] + tip_length * math.sin(math.radians(angle))
+        tip_y = end_pos[1] - tip_length * math.cos(math.radians(angle))
         
-        tip_left_x = end_pos[0] + (blade_width//2) * math.cos(math.radians(self.weapon_angle))
-        tip_left_y = end_pos[1] + (blade_width//2) * math.sin(math.radians(self.weapon_angle))
-        tip_right_x = end_pos[0] - (blade_width//2) * math.cos(math.radians(self.weapon_angle))
-        tip_right_y = end_pos[1] - (blade_width//2) * math.sin(math.radians(self.weapon_angle))
+        tip_left_x = end_pos[0] + (blade_width//2) * math.cos(math.radians(angle))
+        tip_left_y = end_pos[1] + (blade_width//2) * math.sin(math.radians(angle))
+        tip_right_x = end_pos[0] - (blade_width//2) * math.cos(math.radians(angle))
+        tip_right_y = end_pos[1] - (blade_width//2) * math.sin(math.radians(angle))
         
         pygame.draw.polygon(screen, (40, 40, 40), [(tip_x, tip_y), (tip_left_x, tip_left_y), (tip_right_x, tip_right_y)])
         pygame.draw.polygon(screen, (240, 240, 240), [(tip_x, tip_y), (tip_left_x, tip_left_y), (tip_right_x, tip_right_y)])
 
-    def draw_pixel_spear(self, screen, start_pos, end_pos):
+    def draw_pixel_spear(self, screen, center, angle, length, width):
         """Рисует красивое пиксельное копье с отличной контрастностью"""
+        start_pos, end_pos = self.get_weapon_line_at(center, angle, length)
+
         # Древко с темным контуром
-        shaft_width = max(4, int(self.weapon_width * 0.7))
+        shaft_width = max(4, int(width * 0.7))
         pygame.draw.line(screen, (30, 15, 5), start_pos, end_pos, shaft_width + 4)  # Темный контур
         pygame.draw.line(screen, (139, 69, 19), start_pos, end_pos, shaft_width)    # Основное древко
         
@@ -302,8 +414,8 @@ class FightingBall:
         
         # Наконечник копья
         tip_length = 25
-        tip_x = end_pos[0] + tip_length * math.sin(math.radians(self.weapon_angle))
-        tip_y = end_pos[1] - tip_length * math.cos(math.radians(self.weapon_angle))
+        tip_x = end_pos[0] + tip_length * math.sin(math.radians(angle))
+        tip_y = end_pos[1] - tip_length * math.cos(math.radians(angle))
         
         # Основной наконечник с контуром
         pygame.draw.line(screen, (40, 40, 40), end_pos, (tip_x, tip_y), shaft_width + 6)  # Темный контур
@@ -311,10 +423,10 @@ class FightingBall:
         
         # Зазубрины наконечника
         barb_length = 12
-        barb_left_x = end_pos[0] + barb_length * math.sin(math.radians(self.weapon_angle + 135))
-        barb_left_y = end_pos[1] - barb_length * math.cos(math.radians(self.weapon_angle + 135))
-        barb_right_x = end_pos[0] + barb_length * math.sin(math.radians(self.weapon_angle - 135))
-        barb_right_y = end_pos[1] - barb_length * math.cos(math.radians(self.weapon_angle - 135))
+        barb_left_x = end_pos[0] + barb_length * math.sin(math.radians(angle + 135))
+        barb_left_y = end_pos[1] - barb_length * math.cos(math.radians(angle + 135))
+        barb_right_x = end_pos[0] + barb_length * math.sin(math.radians(angle - 135))
+        barb_right_y = end_pos[1] - barb_length * math.cos(math.radians(angle - 135))
         
         pygame.draw.line(screen, (40, 40, 40), end_pos, (barb_left_x, barb_left_y), shaft_width + 2)
         pygame.draw.line(screen, (160, 160, 160), end_pos, (barb_left_x, barb_left_y), shaft_width)
@@ -322,29 +434,75 @@ class FightingBall:
         pygame.draw.line(screen, (160, 160, 160), end_pos, (barb_right_x, barb_right_y), shaft_width)
         
         # Острие наконечника
-        point_tip_x = tip_x + 10 * math.sin(math.radians(self.weapon_angle))
-        point_tip_y = tip_y - 10 * math.cos(math.radians(self.weapon_angle))
+        point_tip_x = tip_x + 10 * math.sin(math.radians(angle))
+        point_tip_y = tip_y - 10 * math.cos(math.radians(angle))
         
         pygame.draw.polygon(screen, (40, 40, 40), 
                           [(point_tip_x, point_tip_y), 
-                           (tip_x + 4 * math.cos(math.radians(self.weapon_angle)), tip_y + 4 * math.sin(math.radians(self.weapon_angle))),
-                           (tip_x - 4 * math.cos(math.radians(self.weapon_angle)), tip_y - 4 * math.sin(math.radians(self.weapon_angle)))])
+                           (tip_x + 4 * math.cos(math.radians(angle)), tip_y + 4 * math.sin(math.radians(angle))),
+                           (tip_x - 4 * math.cos(math.radians(angle)), tip_y - 4 * math.sin(math.radians(angle)))])
         pygame.draw.polygon(screen, (240, 240, 240), 
                           [(point_tip_x, point_tip_y), 
-                           (tip_x + 3 * math.cos(math.radians(self.weapon_angle)), tip_y + 3 * math.sin(math.radians(self.weapon_angle))),
-                           (tip_x - 3 * math.cos(math.radians(self.weapon_angle)), tip_y - 3 * math.sin(math.radians(self.weapon_angle)))])
+                           (tip_x + 3 * math.cos(math.radians(angle)), tip_y + 3 * math.sin(math.radians(angle))),
+                           (tip_x - 3 * math.cos(math.radians(angle)), tip_y - 3 * math.sin(math.radians(angle)))])
         
         # Яркий блик на наконечнике
         pygame.draw.line(screen, (255, 255, 255), end_pos, (tip_x, tip_y), 3)
 
+    def get_sprite_atlas(self, name, paint, extent, *params):
+        """
+        Атлас поворотов рисунка paint(surface, pivot, angle, *params).
+        Ключ - класс, радиус, имя рисунка и параметры, поэтому атлас общий
+        для всех шариков одного вида и пересоздается, только когда параметры меняются.
+        """
+        key = (type(self), self.radius, name) + params
+        return get_atlas(key, lambda surface, pivot, angle: paint(surface, pivot, angle, *params), extent)
+
+    def get_weapon_sprite_params(self):
+        """Длина оружия по корзинам и ширина до пикселя: атлас растущего оружия пересоздается редко"""
+        return quantize(self.weapon_length, LENGTH_BUCKET), int(round(self.weapon_width))
+
     def draw_weapon(self, screen):
-        start_pos, end_pos = self.get_weapon_line()
-        
         if self.weapon_type == "sword":
-            self.draw_pixel_sword(screen, start_pos, end_pos)
+            painter = self.draw_pixel_sword
         elif self.weapon_type == "spear":
-            self.draw_pixel_spear(screen, start_pos, end_pos)
-        # Новые типы оружия будут добавлены в дочерних классах
+            painter = self.draw_pixel_spear
+        else:
+            # Новые типы оружия будут добавлены в дочерних классах
+            return
+
+        length, width = self.get_weapon_sprite_params()
+        extent = self.radius + length + width * 2 + 50
+        atlas = self.get_sprite_atlas(self.weapon_type, painter, extent, length, width)
+        atlas.blit(screen, self.rect.center, self.weapon_angle)
+
+    def paint_flag(self, surface, radius):
+        """Рисует флаг на квадрате 2r x 2r; страны переопределяют, круглую маску накладывает get_flag_sprite"""
+        pygame.draw.circle(surface, self.color, (radius, radius), radius)
+
+    def get_flag_sprite(self, radius=None, alpha=None):
+        """Флаг, вырезанный кругом, из кэша спрайтов (alpha - вариант с общей прозрачностью)"""
+        radius = self.radius if radius is None else radius
+        key = (type(self), radius, alpha)
+        sprite = _flag_sprites.get(key)
+        if sprite is None:
+            if alpha is not None:
+                sprite = self.get_flag_sprite(radius).copy()
+                sprite.set_alpha(alpha)
+            else:
+                sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                self.paint_flag(sprite, radius)
+
+                # Вырезаем круг из прямоугольного флага
+                mask_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(mask_surface, (255, 255, 255, 255), (radius, radius), radius)
+                sprite.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            _flag_sprites[key] = sprite
+        return sprite
+
+    def draw_flag_pattern(self, screen, alpha=None):
+        """Флаг на шарике - один блит готового спрайта"""
+        screen.blit(self.get_flag_sprite(alpha=alpha), (self.rect.centerx - self.radius, self.rect.centery - self.radius))
 
     def draw(self, screen):
         # Цвет шарика с эффектом неуязвимости
@@ -367,7 +525,7 @@ class FightingBall:
         # Здоровье на шарике
         if self.health > 0:
             health_text = f"{int(self.health)}"
-            font = pygame.font.Font(None, 28)
+            font = get_font(28)
             text_surface = font.render(health_text, True, (255, 255, 255))
             text_rect = text_surface.get_rect(center=self.rect.center)
             
@@ -1,93 +1,83 @@
 # balls/bow_ball.py
 from .base_fighter import FightingBall
+from fonts import get_font
+from sprite_atlas import get_atlas
+from surface_pool import circle_stamp
+from projectiles import ProjectilePool
+from collision import swept_box_hits_rect, swept_point_hits_capsule
+from broadphase import path_extent
+import numpy as np
 import math
 import random
 
 class Arrow:
-    def __init__(self, start_x, start_y, target_x, target_y, speed=8):
-        self.x = start_x
-        self.y = start_y
-        self.start_x = start_x
-        self.start_y = start_y
-        
-        # Направление к цели
+    """Стрела: параметры и рисунок. Летящие стрелы хранятся в пуле снарядов лучника."""
+    LENGTH = 25
+    SPEED = 8
+    DAMAGE = 5
+    MAX_DISTANCE = 600  # Дальше стрела исчезает
+
+    @staticmethod
+    def aim(start_x, start_y, target_x, target_y, speed=SPEED):
+        """Скорость и угол (градусы) стрел из точки старта в цели (target_x, target_y - массивы)"""
         dx = target_x - start_x
         dy = target_y - start_y
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        if distance > 0:
-            self.vx = (dx / distance) * speed
-            self.vy = (dy / distance) * speed
-        else:
-            self.vx = speed
-            self.vy = 0
-            
-        self.angle = math.degrees(math.atan2(dy, dx))
-        self.length = 25
-        self.active = True
-        self.damage = 5
-        
-        # Для отслеживания столкновений
-        self.hit_targets = set()
-
-    def update(self):
-        if not self.active:
-            return
-            
-        self.x += self.vx
-        self.y += self.vy
-        
-        # Стрела исчезает если улетела слишком далеко
-        distance_traveled = math.sqrt((self.x - self.start_x)**2 + (self.y - self.start_y)**2)
-        if distance_traveled > 600:
-            self.active = False
+        distance = np.sqrt(dx*dx + dy*dy)
+        safe_distance = np.where(distance > 0, distance, 1)
+        vx = np.where(distance > 0, dx / safe_distance * speed, speed)
+        vy = np.where(distance > 0, dy / safe_distance * speed, 0)
+        return vx, vy, np.degrees(np.arctan2(dy, dx))
 
-    def get_rect(self):
-        """Возвращает прямоугольник для проверки столкновений"""
-        import pygame
-        return pygame.Rect(self.x - 5, self.y - 5, 10, 10)
+    @staticmethod
+    def get_atlas():
+        # Стрела одной длины у всех - атлас общий
+        return get_atlas((Arrow, 'arrow', Arrow.LENGTH), Arrow.paint, Arrow.LENGTH + 20)
 
-    def draw(self, screen):
-        if not self.active:
-            return
-            
+    @staticmethod
+    def paint(screen, pivot, angle):
+        """Рисует стрелу с хвостом в точке pivot"""
         import pygame
+        x, y = pivot
         
         # Рисуем стрелу
-        end_x = self.x + self.length * math.cos(math.radians(self.angle))
-        end_y = self.y + self.length * math.sin(math.radians(self.angle))
+        end_x = x + Arrow.LENGTH * math.cos(math.radians(angle))
+        end_y = y + Arrow.LENGTH * math.sin(math.radians(angle))
         
         # Древко стрелы
-        pygame.draw.line(screen, (101, 67, 33), (self.x, self.y), (end_x, end_y), 4)
-        pygame.draw.line(screen, (139, 90, 43), (self.x, self.y), (end_x, end_y), 2)
+        pygame.draw.line(screen, (101, 67, 33), (x, y), (end_x, end_y), 4)
+        pygame.draw.line(screen, (139, 90, 43), (x, y), (end_x, end_y), 2)
         
         # Наконечник
         tip_length = 8
-        tip_x = end_x + tip_length * math.cos(math.radians(self.angle))
-        tip_y = end_y + tip_length * math.sin(math.radians(self.angle))
+        tip_x = end_x + tip_length * math.cos(math.radians(angle))
+        tip_y = end_y + tip_length * math.sin(math.radians(angle))
         
         pygame.draw.line(screen, (40, 40, 40), (end_x, end_y), (tip_x, tip_y), 6)
         pygame.draw.line(screen, (180, 180, 180), (end_x, end_y), (tip_x, tip_y), 4)
         
         # Оперение
         feather_length = 6
-        feather_x = self.x - feather_length * math.cos(math.radians(self.angle))
-        feather_y = self.y - feather_length * math.sin(math.radians(self.angle))
+        feather_x = x - feather_length * math.cos(math.radians(angle))
+        feather_y = y - feather_length * math.sin(math.radians(angle))
         
         # Два пера
         feather_offset = 15
-        feather1_x = feather_x + feather_length * math.cos(math.radians(self.angle + feather_offset))
-        feather1_y = feather_y + feather_length * math.sin(math.radians(self.angle + feather_offset))
-        feather2_x = feather_x + feather_length * math.cos(math.radians(self.angle - feather_offset))
-        feather2_y = feather_y + feather_length * math.sin(math.radians(self.angle - feather_offset))
+        feather1_x = feather_x + feather_length * math.cos(math.radians(angle + feather_offset))
+        feather1_y = feather_y + feather_length * math.sin(math.radians(angle + feather_offset))
+        feather2_x = feather_x + feather_length * math.cos(math.radians(angle - feather_offset))
+        feather2_y = feather_y + feather_length * math.sin(math.radians(angle - feather_offset))
         
-        pygame.draw.line(screen, (255, 100, 100), (self.x, self.y), (feather1_x, feather1_y), 3)
-        pygame.draw.line(screen, (255, 100, 100), (self.x, self.y), (feather2_x, feather2_y), 3)
+        pygame.draw.line(screen, (255, 100, 100), (x, y), (feather1_x, feather1_y), 3)
+        pygame.draw.line(screen, (255, 100, 100), (x, y), (feather2_x, feather2_y), 3)
 
 
 class BowBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=35, color=(34, 139, 34), 
+    RENDER_FIELDS = FightingBall.RENDER_FIELDS + ('shoot_cooldown', 'arrows_per_shot')
+    RENDER_LISTS = {'arrows': ('x', 'y', 'angle')}
+    ARROW_RADIUS = 5  # Стрела при парировании - круг этого радиуса
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=35, color=(34, 139, 34), 
                          name="Archer Lord", weapon_type="bow")
         
         self.stats = {'damage': 5, 'range': 200, 'speed': 7, 'radius': self.radius}
@@ -97,7 +87,8 @@ class BowBall(FightingBall):
         self.weapon_width = 8
         
         # ОСОБЕННОСТЬ: Стрелы
-        self.arrows = []
+        # spent: стрела попала или улетела - на следующем шаге ее уберут из пула
+        self.arrows = ProjectilePool(fields=('start_x', 'start_y', 'angle', 'spent'))
         self.shoot_cooldown = 0
         self.shoot_cooldown_max = 50# 1 секунда при 60 FPS
         self.arrows_per_shot = 1  # Начинаем с одной стрелы
@@ -112,6 +103,12 @@ class BowBall(FightingBall):
         self.max_health = 100
         self.health = self.max_health
 
+    def get_render_list(self, name):
+        if name == 'arrows':
+            # Отработавшие стрелы не рисуются - не храним их
+            return self.arrows.rows(*self.RENDER_LISTS[name], mask=self.arrows['spent'] == 0)
+        return super().get_render_list(name)
+
     def can_shoot(self):
         return self.shoot_cooldown <= 0
 
@@ -124,21 +121,22 @@ class BowBall(FightingBall):
         self.total_shots += 1
         
         # Позиция стрельбы (конец лука)
-        shoot_x = self.rect.centerx + (self.radius + self.weapon_length * 0.8) * math.sin(math.radians(self.weapon_angle))
-        shoot_y = self.rect.centery - (self.radius + self.weapon_length * 0.8) * math.cos(math.radians(self.weapon_angle))
-        
-        # Стреляем несколько стрел
-        for i in range(self.arrows_per_shot):
-            # Небольшой разброс для множественных стрел
-            spread_angle = 0
-            if self.arrows_per_shot > 1:
-                spread_angle = (i - (self.arrows_per_shot - 1) / 2) * 15
-            
-            target_x = target.rect.centerx + spread_angle * 2
-            target_y = target.rect.centery + spread_angle * 2
-            
-            arrow = Arrow(shoot_x, shoot_y, target_x, target_y)
-            self.arrows.append(arrow)
+        sin_a, cos_a = self.get_direction()
+        shoot_x = self.x + (self.radius + self.weapon_length * 0.8) * sin_a
+        shoot_y = self.y - (self.radius + self.weapon_length * 0.8) * cos_a
+        
+        # Стреляем несколько стрел - залп целиком
+        # Небольшой разброс для множественных стрел
+        spread_angle = np.zeros(self.arrows_per_shot)
+        if self.arrows_per_shot > 1:
+            spread_angle = (np.arange(self.arrows_per_shot) - (self.arrows_per_shot - 1) / 2) * 15
+        
+        target_x = target.x + spread_angle * 2
+        target_y = target.y + spread_angle * 2
+        
+        vx, vy, angle = Arrow.aim(shoot_x, shoot_y, target_x, target_y)
+        self.arrows.spawn(x=shoot_x, y=shoot_y, start_x=shoot_x, start_y=shoot_y,
+                          vx=vx, vy=vy, angle=angle)
         
         # После каждого выстрела количество стрел увеличивается
         self.arrows_per_shot += 1
@@ -147,22 +145,19 @@ class BowBall(FightingBall):
 
     def update_arrows(self, other_ball):
         """Обновляет все стрелы"""
-        for arrow in self.arrows[:]:  # Копия списка для безопасного удаления
-            if not arrow.active:
-                self.arrows.remove(arrow)
-                continue
-                
-            arrow.update()
-            
-            # Проверка столкновения с противником
-            if (other_ball not in arrow.hit_targets and 
-                arrow.get_rect().colliderect(other_ball.rect)):
-                
-                # Стрела попала
-                arrow.hit_targets.add(other_ball)
-                other_ball.last_attacker_pos = (arrow.x, arrow.y)
-                other_ball.take_damage(arrow.damage)
-                arrow.active = False
+        arrows = self.arrows
+        arrows.remove_where(arrows['spent'] > 0)
+        arrows.integrate()
+        
+        # Стрела исчезает если улетела слишком далеко
+        traveled = np.sqrt((arrows['x'] - arrows['start_x'])**2 + (arrows['y'] - arrows['start_y'])**2)
+        
+        # Проверка столкновения с противником (улетевшая на этом шаге стрела еще может попасть)
+        hits = swept_box_hits_rect(arrows, other_ball.rect, -5, -5, 10, 10)
+        for index in arrows.in_spawn_order(hits):
+            other_ball.last_attacker_pos = (float(arrows['x'][index]), float(arrows['y'][index]))
+            other_ball.take_damage(Arrow.DAMAGE)
+        arrows['spent'][hits | (traveled > Arrow.MAX_DISTANCE)] = 1
 
     def update(self, other_ball=None):
         # Обновляем кулдаун стрельбы
@@ -184,24 +179,33 @@ class BowBall(FightingBall):
         # Лучник не атакует оружием напрямую, только стрелами
         pass
 
-    def check_arrow_weapon_collision(self, weapon_rect):
+    def arrow_extent(self):
+        """x-интервал путей стрел для грубой фазы GameState (None - стрел нет)"""
+        return path_extent(self.arrows, self.ARROW_RADIUS)
+
+    def check_arrow_weapon_collision(self, weapon_shape):
         """Проверяет столкновение стрел с оружием противника (парирование)"""
-        for arrow in self.arrows[:]:
-            if arrow.active and arrow.get_rect().colliderect(weapon_rect):
-                arrow.active = False
-                return True
+        arrows = self.arrows
+        # Стрела 10x10 - круг радиуса ARROW_RADIUS против капсулы оружия
+        blocked = arrows.in_spawn_order((arrows['spent'] == 0) &
+                                        swept_point_hits_capsule(arrows, weapon_shape, self.ARROW_RADIUS))
+        if len(blocked):
+            # Оружие сбивает одну стрелу за шаг
+            arrows['spent'][blocked[0]] = 1
+            return True
         return False
 
-    def draw_pixel_bow(self, screen, start_pos, end_pos):
+    def draw_pixel_bow(self, screen, center, angle, length):
         """Рисует красивый пиксельный лук"""
         import pygame
+        start_pos, end_pos = self.get_weapon_line_at(center, angle, length)
         
         # Рукоять лука (центральная часть)
-        handle_length = self.weapon_length * 0.3
-        handle_start_x = self.rect.centerx + (self.radius + handle_length/2) * math.sin(math.radians(self.weapon_angle))
-        handle_start_y = self.rect.centery - (self.radius + handle_length/2) * math.cos(math.radians(self.weapon_angle))
-        handle_end_x = self.rect.centerx + (self.radius + handle_length*1.5) * math.sin(math.radians(self.weapon_angle))
-        handle_end_y = self.rect.centery - (self.radius + handle_length*1.5) * math.cos(math.radians(self.weapon_angle))
+        handle_length = length * 0.3
+        handle_start_x = center[0] + (self.radius + handle_length/2) * math.sin(math.radians(angle))
+        handle_start_y = center[1] - (self.radius + handle_length/2) * math.cos(math.radians(angle))
+        handle_end_x = center[0] + (self.radius + handle_length*1.5) * math.sin(math.radians(angle))
+        handle_end_y = center[1] - (self.radius + handle_length*1.5) * math.cos(math.radians(angle))
         
         # Рукоять
         pygame.draw.line(screen, (60, 30, 0), (handle_start_x, handle_start_y), (handle_end_x, handle_end_y), 8)
@@ -213,14 +217,14 @@ class BowBall(FightingBall):
         # Верхнее плечо
         upper_start_x = handle_end_x
         upper_start_y = handle_end_y
-        upper_end_x = end_pos[0] + bow_width * math.cos(math.radians(self.weapon_angle))
-        upper_end_y = end_pos[1] + bow_width * math.sin(math.radians(self.weapon_angle))
+        upper_end_x = end_pos[0] + bow_width * math.cos(math.radians(angle))
+        upper_end_y = end_pos[1] + bow_width * math.sin(math.radians(angle))
         
         # Нижнее плечо
         lower_start_x = handle_start_x
         lower_start_y = handle_start_y
-        lower_end_x = start_pos[0] + bow_width * math.cos(math.radians(self.weapon_angle))
-        lower_end_y = start_pos[1] + bow_width * math.sin(math.radians(self.weapon_angle))
+        lower_end_x = start_pos[0] + bow_width * math.cos(math.radians(angle))
+        lower_end_y = start_pos[1] + bow_width * math.sin(math.radians(angle))
         
         # Рисуем плечи лука
         pygame.draw.line(screen, (40, 25, 5), (upper_start_x, upper_start_y), (upper_end_x, upper_end_y), 6)
@@ -238,30 +242,32 @@ class BowBall(FightingBall):
             pygame.draw.circle(screen, (120, 120, 120), (int(end_x), int(end_y)), 3)
 
     def draw_weapon(self, screen):
-        start_pos, end_pos = self.get_weapon_line()
-        self.draw_pixel_bow(screen, start_pos, end_pos)
+        length, _ = self.get_weapon_sprite_params()
+        atlas = self.get_sprite_atlas('bow', self.draw_pixel_bow, self.radius + length + 40, length)
+        atlas.blit(screen, self.rect.center, self.weapon_angle)
 
     def draw(self, screen):
         import pygame
         
         # Рисуем все стрелы
-        for arrow in self.arrows:
-            arrow.draw(screen)
+        arrows = self.arrows
+        flying = arrows['spent'] == 0
+        Arrow.get_atlas().blit_many(screen, arrows.rows('x', 'y', mask=flying), arrows['angle'][flying].tolist())
         
         # Индикатор готовности к стрельбе
         if self.shoot_cooldown <= 15:  # Мигает перед выстрелом
             if (self.shoot_cooldown // 5) % 2:
                 ready_color = (0, 255, 0, 120)
-                ready_surface = pygame.Surface((self.radius * 2.5, self.radius * 2.5), pygame.SRCALPHA)
-                pygame.draw.circle(ready_surface, ready_color, 
-                                 (int(self.radius * 1.25), int(self.radius * 1.25)), self.radius + 8, 2)
+                ready_surface = circle_stamp(self.radius + 8, ready_color, 2,
+                                             size=(self.radius * 2.5, self.radius * 2.5),
+                                             center=(int(self.radius * 1.25), int(self.radius * 1.25)))
                 screen.blit(ready_surface, 
                           (self.rect.centerx - self.radius * 1.25, self.rect.centery - self.radius * 1.25))
         
         # Показываем количество стрел в следующем залпе
         if self.arrows_per_shot > 1:
             arrows_text = f"x{self.arrows_per_shot}"
-            font = pygame.font.Font(None, 20)
+            font = get_font(20)
             text_surface = font.render(arrows_text, True, (255, 255, 0))
             text_rect = text_surface.get_rect(center=(self.rect.centerx, self.rect.centery - self.radius - 20))
             
@@ -1,12 +1,15 @@
 # balls/canada_ball.py - ОБНОВЛЕННАЯ ВЕРСИЯ
 from .base_fighter import FightingBall
+from fonts import get_font
 import pygame
 import math
 import random
 
 class CanadaBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=45, color=(255, 255, 255),
+    RENDER_FIELDS = FightingBall.RENDER_FIELDS + ('apology_timer', 'apology_index')
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=45, color=(255, 255, 255),
                          name="Canada", weapon_type="politeness")
 
         self.stats = {'damage': 1, 'range': 30, 'speed': 2, 'radius': self.radius}
@@ -16,8 +19,23 @@ class CanadaBall(FightingBall):
         self.current_apology = ""
         self.max_speed = 4
 
+    def get_render_field(self, name):
+        if name == 'apology_index':
+            # Храним номер фразы вместо строки
+            if self.current_apology in self.apology_messages:
+                return self.apology_messages.index(self.current_apology)
+            return -1
+        return super().get_render_field(name)
+
+    def set_render_field(self, name, value):
+        if name == 'apology_index':
+            value = int(value)
+            self.current_apology = self.apology_messages[value] if value >= 0 else ""
+        else:
+            super().set_render_field(name, value)
+
     def apologize(self):
-        self.current_apology = random.choice(self.apology_messages)
+        self.current_apology = self.rng.choice(self.apology_messages)
         self.apology_timer = 120
 
     def attack(self, target):
@@ -26,8 +44,8 @@ class CanadaBall(FightingBall):
         if success:
             self.attack_cooldown = self.attack_cooldown_duration
             self.apologize()
-            dx = target.rect.centerx - self.rect.centerx
-            dy = target.rect.centery - self.rect.centery
+            dx = target.x - self.x
+            dy = target.y - self.y
             distance = math.hypot(dx, dy)
             if distance > 0:
                 target.vx += (dx / distance) * 2
@@ -47,10 +65,10 @@ class CanadaBall(FightingBall):
             self.current_apology = ""
 
         if other_ball:
-            distance = math.hypot(other_ball.rect.centerx - self.rect.centerx, other_ball.rect.centery - self.rect.centery)
+            distance = math.hypot(other_ball.x - self.x, other_ball.y - self.y)
             if distance < 100 and distance > 0:
-                self.vx -= (other_ball.rect.centerx - self.rect.centerx) / distance
-                self.vy -= (other_ball.rect.centery - self.rect.centery) / distance
+                self.vx -= (other_ball.x - self.x) / distance
+                self.vy -= (other_ball.y - self.y) / distance
 
         super().update(other_ball)
 
@@ -71,13 +89,8 @@ class CanadaBall(FightingBall):
         pygame.draw.polygon(screen, color, translated_points)
 
 
-    def draw_flag_pattern(self, screen):
-        """Рисует правильный флаг Канады с помощью маски"""
-        center_x, center_y = self.rect.center
-        radius = self.radius
-        
-        flag_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        
+    def paint_flag(self, flag_surface, radius):
+        """Рисует правильный флаг Канады"""
         # Пропорции флага: 1:2:1
         red_width = (radius * 2) / 4
         white_width = (radius * 2) / 2
@@ -91,17 +104,10 @@ class CanadaBall(FightingBall):
         # Рисуем лист на белой части
         self.draw_maple_leaf(flag_surface, radius, radius, radius * 0.6)
 
-        # Применяем маску
-        mask_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(mask_surface, (255, 255, 255, 255), (radius, radius), radius)
-        flag_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        
-        screen.blit(flag_surface, (center_x - radius, center_y - radius))
-
     def draw_apology_bubble(self, screen):
         """Рисует пузырь с извинениями"""
         if self.apology_timer > 0 and self.current_apology:
-            font = pygame.font.Font(None, 22)
+            font = get_font(22)
             text_surf = font.render(self.current_apology, True, (0,0,0))
             padding = 10
             bubble_rect = text_surf.get_rect(center=self.rect.center).inflate(padding, padding)
@@ -118,7 +124,7 @@ class CanadaBall(FightingBall):
         self.draw_apology_bubble(screen)
         
         if self.health > 0:
-            font = pygame.font.Font(None, 28)
+            font = get_font(28)
             health_text = f"{int(self.health)}"
             text_surface = font.render(health_text, True, (0, 0, 0))
             text_rect = text_surface.get_rect(center=self.rect.center)
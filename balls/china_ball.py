@@ -1,12 +1,17 @@
 # balls/china_ball.py - ОБНОВЛЕННАЯ ВЕРСИЯ (БАЛАНС)
 from .base_fighter import FightingBall
+from fonts import get_font
+from collision import Capsule, capsule_hits_circle
 import pygame
 import math
 import random
 
 class ChinaBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=45, color=(255, 255, 255),
+    RENDER_FIELDS = FightingBall.RENDER_FIELDS + ('nunchuck_angle1', 'nunchuck_angle2', 'nunchuck_length')
+    RENDER_LISTS = {'clones': ('x', 'y', 'health', 'nunchuck_angle1', 'nunchuck_angle2', 'nunchuck_length')}
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=45, color=(255, 255, 255),
                          name="China", weapon_type="nunchucks")
 
         # ИЗМЕНЕНИЕ: Урон снижен с 6 до 4 для баланса
@@ -28,18 +33,49 @@ class ChinaBall(FightingBall):
         self.clone_alpha = 255
         self.parent = None
 
+    def pack_render_item(self, list_name, clone):
+        return (clone.x, clone.y, clone.health,
+                clone.nunchuck_angle1, clone.nunchuck_angle2, clone.nunchuck_length)
+
+    def apply_render_state(self, state, opponent=None):
+        scalars, lists = state
+        for name, value in zip(self.RENDER_FIELDS, scalars):
+            self.set_render_field(name, value)
+
+        # Клоны-куклы переиспользуются между кадрами
+        if not hasattr(self, 'clone_puppets'):
+            self.clone_puppets = []
+        clone_states = lists.get('clones', ())
+        while len(self.clone_puppets) < len(clone_states):
+            puppet = ChinaBall(0, 0, rng=self.rng)
+            puppet.is_clone = True
+            puppet.clone_alpha = 180
+            puppet.parent = self
+            puppet.max_health = 20
+            self.clone_puppets.append(puppet)
+
+        self.clones = self.clone_puppets[:len(clone_states)]
+        for clone, values in zip(self.clones, clone_states):
+            x, y, health, angle1, angle2, length = values
+            clone.set_position(x, y)
+            clone.health = health
+            clone.nunchuck_angle1 = angle1
+            clone.nunchuck_angle2 = angle2
+            clone.nunchuck_length = length
+
     def create_clone(self):
         """Создает клона"""
         if len(self.clones) >= self.max_clones: return None
         
-        angle = random.uniform(0, 2 * math.pi)
-        clone_x = self.rect.centerx + 80 * math.cos(angle)
-        clone_y = self.rect.centery + 80 * math.sin(angle)
+        angle = self.rng.uniform(0, 2 * math.pi)
+        clone_x = self.x + 80 * math.cos(angle)
+        clone_y = self.y + 80 * math.sin(angle)
         
-        clone = ChinaBall(clone_x, clone_y)
+        clone = ChinaBall(clone_x, clone_y, rng=self.rng)
         clone.is_clone = True
         clone.clone_alpha = 180
         clone.parent = self
+        clone.substeps = self.substeps
         # ИЗМЕНЕНИЕ: Здоровье клонов теперь фиксировано на 20
         clone.health = 20
         clone.max_health = 20
@@ -54,12 +90,14 @@ class ChinaBall(FightingBall):
                 self.clones.remove(clone)
                 continue
             clone.update(target)
-            if target and clone.can_attack() and clone.get_weapon_rect().colliderect(target.rect):
+            if (target and clone.can_attack() and
+                    capsule_hits_circle(clone.get_weapon_shape(), target.x, target.y, target.radius)):
                 clone.attack(target)
 
-    def get_weapon_rect(self):
-        """Возвращает область нунчак"""
-        return self.rect.inflate(self.nunchuck_length * 2, self.nunchuck_length * 2)
+    def get_weapon_shape(self):
+        """Нунчаки крутятся вокруг шарика - их зона круг (капсула нулевой длины)"""
+        center_x, center_y = (self.x, self.y)
+        return Capsule(center_x, center_y, center_x, center_y, self.radius + self.nunchuck_length)
 
     def update(self, other_ball=None):
         self.nunchuck_animation_timer += 1
@@ -92,8 +130,9 @@ class ChinaBall(FightingBall):
             points.append((center_x + size/2 * math.cos(inner_angle), center_y + size/2 * math.sin(inner_angle)))
         pygame.draw.polygon(screen, color, points)
 
-    def draw_flag_pattern(self, screen, surface_to_draw, center, radius):
+    def paint_flag(self, surface_to_draw, radius):
         """Рисует правильный флаг Китая"""
+        center = (radius, radius)
         pygame.draw.circle(surface_to_draw, (222, 41, 16), center, radius)
         main_star_pos = (center[0] - radius * 0.5, center[1] - radius * 0.5)
         self.draw_star(surface_to_draw, main_star_pos[0], main_star_pos[1], radius * 0.2, -90)
@@ -128,16 +167,12 @@ class ChinaBall(FightingBall):
     def draw_clones(self, screen):
         """Рисует всех клонов"""
         for clone in self.clones:
+            clone.fx_rng = self.fx_rng
             clone.draw(screen)
 
     def draw(self, screen):
-        if self.is_clone:
-            clone_surface = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            self.draw_flag_pattern(clone_surface, clone_surface, (self.radius, self.radius), self.radius)
-            clone_surface.set_alpha(self.clone_alpha)
-            screen.blit(clone_surface, self.rect.topleft)
-        else:
-            self.draw_flag_pattern(screen, screen, self.rect.center, self.radius)
+        # Клоны - тот же флаг, но полупрозрачный
+        self.draw_flag_pattern(screen, self.clone_alpha if self.is_clone else None)
         
         pygame.draw.circle(screen, (0, 0, 0), self.rect.center, self.radius, 3)
         self.draw_nunchucks(screen)
@@ -146,7 +181,7 @@ class ChinaBall(FightingBall):
             self.draw_clones(screen)
         
         if self.health > 0:
-            font = pygame.font.Font(None, 28)
+            font = get_font(28)
             health_text = f"{int(self.health)}"
             text_surface = font.render(health_text, True, (255, 255, 255))
             text_rect = text_surface.get_rect(center=self.rect.center)
@@ -1,12 +1,22 @@
 # balls/france_ball.py - ОБНОВЛЕННАЯ ВЕРСИЯ
 from .base_fighter import FightingBall
+from fonts import get_font
+from sprite_atlas import blit_rotated
+from particles import draw_circles
+from projectiles import ProjectilePool
+from collision import Capsule, swept_box_hits_rect, swept_point_hits_capsule
+import numpy as np
 import pygame
 import math
 import random
 
 class FranceBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=45, color=(255, 255, 255),
+    RENDER_FIELDS = FightingBall.RENDER_FIELDS + ('baguette_angle', 'baguette_length', 'baguette_width',
+                                                  'block_effect_timer')
+    RENDER_LISTS = {'deflected_bullets': ('x', 'y')}
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=45, color=(255, 255, 255),
                          name="France", weapon_type="baguette")
 
         self.stats = {'damage': 10, 'range': 80, 'speed': 3, 'radius': self.radius}
@@ -19,63 +29,38 @@ class FranceBall(FightingBall):
         self.deflect_cooldown = 0
         self.deflect_cooldown_max = 30
         self.block_effect_timer = 0
-        self.deflected_bullets = []
+        self.deflected_bullets = ProjectilePool()
 
     def check_bullet_deflection(self, enemy_bullets):
         """Проверяет и отражает пули противника"""
         if self.deflect_cooldown > 0: return False
         
-        baguette_rect = self.get_weapon_rect()
-        deflected_any = False
-        
-        for bullet in enemy_bullets[:]:
-            bullet_rect = pygame.Rect(bullet['x'] - 3, bullet['y'] - 3, 6, 6)
-            if baguette_rect.colliderect(bullet_rect):
-                self.deflect_bullet(bullet)
-                enemy_bullets.remove(bullet)
-                deflected_any = True
+        # Пуля 6x6 - круг радиуса 3 против капсулы багета
+        deflected = swept_point_hits_capsule(enemy_bullets, self.get_weapon_shape(), 3)
         
-        if deflected_any:
+        if deflected.any():
+            self.deflect_bullets(enemy_bullets.take_where(deflected))
             self.deflect_cooldown = self.deflect_cooldown_max
             self.block_effect_timer = 20
             return True
         return False
 
-    def deflect_bullet(self, bullet):
-        """Отражает пулю обратно"""
-        bullet['vx'] = -bullet['vx'] * 1.2
-        bullet['vy'] = -bullet['vy'] * 1.2
-        bullet['lifetime'] = 120
-        self.deflected_bullets.append(bullet)
-
-    def get_weapon_rect(self):
-        """Возвращает прямоугольник багета для столкновений"""
-        center_x, center_y = self.rect.center
-        
-        # Позиция багета сверху шара
-        weapon_center_y = center_y - self.radius - self.baguette_length / 2
-        
-        # Создаем повернутый прямоугольник
-        angle_rad = math.radians(self.baguette_angle)
-        
-        points = []
-        half_w, half_l = self.baguette_width / 2, self.baguette_length / 2
-        
-        # 4 угла прямоугольника
-        corners = [(-half_l, -half_w), (half_l, -half_w), (half_l, half_w), (-half_l, half_w)]
-        
-        for l, w in corners:
-            # Вращаем и смещаем
-            x = (l * math.cos(angle_rad) - w * math.sin(angle_rad)) + center_x
-            y = (l * math.sin(angle_rad) + w * math.cos(angle_rad)) + (center_y - self.radius - 10) # Смещаем над шаром
-            points.append((x,y))
-
-        min_x = min(p[0] for p in points)
-        max_x = max(p[0] for p in points)
-        min_y = min(p[1] for p in points)
-        max_y = max(p[1] for p in points)
+    def deflect_bullets(self, bullets):
+        """Отражает пули обратно (bullets - колонки, забранные из пула противника)"""
+        self.deflected_bullets.spawn(x=bullets['x'], y=bullets['y'],
+                                     vx=-bullets['vx'] * 1.2, vy=-bullets['vy'] * 1.2,
+                                     lifetime=120)
 
-        return pygame.Rect(min_x, min_y, max_x - min_x, max_y - min_y)
+    def get_weapon_shape(self):
+        """Багет над шаром: капсула вдоль его оси длиной baguette_length и толщиной baguette_width"""
+        center_x, center_y = (self.x, self.y)
+        center_y -= self.radius + 10  # Смещаем над шаром
+        sin_a, cos_a = self.get_direction('baguette_angle')
+        # Скругленные концы капсулы входят в длину багета
+        half_axis = max(0.0, (self.baguette_length - self.baguette_width) / 2)
+        return Capsule(center_x - half_axis * cos_a, center_y - half_axis * sin_a,
+                       center_x + half_axis * cos_a, center_y + half_axis * sin_a,
+                       self.baguette_width / 2)
 
 
     def update(self, other_ball=None):
@@ -92,17 +77,17 @@ class FranceBall(FightingBall):
         if other_ball and hasattr(other_ball, 'flying_bullets'):
             self.check_bullet_deflection(other_ball.flying_bullets)
         
-        for bullet in self.deflected_bullets[:]:
-            bullet['x'] += bullet['vx']
-            bullet['y'] += bullet['vy']
-            bullet['lifetime'] -= 1
-            
-            if other_ball and pygame.Rect(bullet['x'] - 3, bullet['y'] - 3, 6, 6).colliderect(other_ball.rect):
+        bullets = self.deflected_bullets
+        bullets.integrate()
+        bullets['lifetime'] -= 1
+        
+        expired = bullets['lifetime'] <= 0
+        if other_ball:
+            hits = swept_box_hits_rect(bullets, other_ball.rect, -3, -3, 6, 6)
+            for _ in range(int(hits.sum())):
                 other_ball.take_damage(self.stats['damage'])
-                self.deflected_bullets.remove(bullet)
-                continue
-            
-            if bullet['lifetime'] <= 0: self.deflected_bullets.remove(bullet)
+            expired |= hits
+        bullets.remove_where(expired)
         
         super().update(other_ball)
 
@@ -110,12 +95,12 @@ class FranceBall(FightingBall):
         """Атака с сильным отбросом"""
         if not self.can_attack(): return False
 
-        target.last_attacker_pos = self.rect.center
+        target.last_attacker_pos = (self.x, self.y)
         success = target.take_damage(self.stats['damage'])
         if success:
             self.attack_cooldown = self.attack_cooldown_duration
-            dx = target.rect.centerx - self.rect.centerx
-            dy = target.rect.centery - self.rect.centery
+            dx = target.x - self.x
+            dy = target.y - self.y
             distance = math.hypot(dx, dy)
             if distance > 0:
                 knockback_force = 12
@@ -124,64 +109,59 @@ class FranceBall(FightingBall):
             self.on_successful_attack(target)
         return success
 
-    def draw_flag_pattern(self, screen):
-        """Рисует правильный флаг Франции с помощью маски"""
-        center_x, center_y = self.rect.center
-        radius = self.radius
-
-        flag_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    def paint_flag(self, flag_surface, radius):
+        """Рисует правильный флаг Франции"""
         stripe_width = (radius * 2) / 3
 
         pygame.draw.rect(flag_surface, (0, 85, 164), (0, 0, stripe_width, radius * 2))
         pygame.draw.rect(flag_surface, (255, 255, 255), (stripe_width, 0, stripe_width, radius * 2))
         pygame.draw.rect(flag_surface, (239, 65, 53), (stripe_width * 2, 0, stripe_width, radius * 2))
 
-        mask_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(mask_surface, (255, 255, 255, 255), (radius, radius), radius)
-        flag_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
-        screen.blit(flag_surface, (center_x - radius, center_y - radius))
-
-    def draw_detailed_baguette(self, screen):
-        """Рисует новый детализированный багет, который вращается"""
-        center_x, center_y = self.rect.center
-        
+    def paint_baguette(self, screen, center, angle, length, width):
+        """Рисует детализированный багет, повернутый вокруг своего центра"""
         # Багет рисуется на отдельной поверхности для удобства вращения
-        baguette_surf = pygame.Surface((self.baguette_length + 20, self.baguette_width + 10), pygame.SRCALPHA)
-        b_center_x, b_center_y = (self.baguette_length + 20)//2, (self.baguette_width + 10)//2
+        baguette_surf = pygame.Surface((length + 20, width + 10), pygame.SRCALPHA)
+        b_center_x, b_center_y = (length + 20)//2, (width + 10)//2
 
         # Основная форма багета
         base_color = (210, 180, 140)
         dark_color = (139, 115, 85)
-        baguette_rect = pygame.Rect(b_center_x - self.baguette_length//2, b_center_y - self.baguette_width//2, self.baguette_length, self.baguette_width)
+        baguette_rect = pygame.Rect(b_center_x - length//2, b_center_y - width//2, length, width)
         pygame.draw.rect(baguette_surf, base_color, baguette_rect, border_radius=5)
         pygame.draw.rect(baguette_surf, dark_color, baguette_rect, 1, border_radius=5)
         
         # Насечки
         for i in range(1, 5):
-            x = b_center_x - self.baguette_length//2 + (i * self.baguette_length / 5)
+            x = b_center_x - length//2 + (i * length / 5)
             pygame.draw.line(baguette_surf, dark_color, (x-5, b_center_y-5), (x+5, b_center_y+5), 1)
 
         # Вращаем багет
-        rotated_baguette = pygame.transform.rotate(baguette_surf, -self.baguette_angle)
+        blit_rotated(screen, baguette_surf, center, angle)
+
+    def draw_detailed_baguette(self, screen):
+        """Рисует новый детализированный багет, который вращается"""
+        center_x, center_y = self.rect.center
         # Позиционируем над шаром
-        new_rect = rotated_baguette.get_rect(center=(center_x, center_y - self.radius - 15))
-        screen.blit(rotated_baguette, new_rect)
+        baguette_center = (center_x, center_y - self.radius - 15)
+        atlas = self.get_sprite_atlas('baguette', self.paint_baguette, self.baguette_length,
+                                      self.baguette_length, self.baguette_width)
+        atlas.blit(screen, baguette_center, self.baguette_angle)
 
         # Эффект блокировки
         if self.block_effect_timer > 0:
             for _ in range(5):
-                angle = self.baguette_angle + random.uniform(-45, 45)
+                angle = self.baguette_angle + self.fx_rng.uniform(-45, 45)
                 rad = math.radians(angle)
-                spark_x = new_rect.centerx + random.uniform(-20, 20) * math.cos(rad)
-                spark_y = new_rect.centery + random.uniform(-20, 20) * math.sin(rad)
-                pygame.draw.circle(screen, random.choice([(255,255,100), (255,255,255)]), (spark_x, spark_y), random.randint(1,4))
+                spark_x = baguette_center[0] + self.fx_rng.uniform(-20, 20) * math.cos(rad)
+                spark_y = baguette_center[1] + self.fx_rng.uniform(-20, 20) * math.sin(rad)
+                pygame.draw.circle(screen, self.fx_rng.choice([(255,255,100), (255,255,255)]), (spark_x, spark_y), self.fx_rng.randint(1,4))
 
     def draw_deflected_bullets(self, screen):
         """Рисует отраженные пули"""
-        for bullet in self.deflected_bullets:
-            pygame.draw.circle(screen, (100, 150, 255), (int(bullet['x']), int(bullet['y'])), 5)
-            pygame.draw.circle(screen, (200, 220, 255), (int(bullet['x']), int(bullet['y'])), 2)
+        bullets = self.deflected_bullets
+        # Каждая пуля - внешний и внутренний круг, в том же порядке, что и по одной
+        draw_circles(screen, np.repeat(bullets['x'], 2), np.repeat(bullets['y'], 2),
+                     np.tile([5, 2], len(bullets)), np.tile([(100, 150, 255), (200, 220, 255)], (len(bullets), 1)))
 
     def draw(self, screen):
         self.draw_flag_pattern(screen)
@@ -191,7 +171,7 @@ class FranceBall(FightingBall):
         self.draw_deflected_bullets(screen)
         
         if self.health > 0:
-            font = pygame.font.Font(None, 28)
+            font = get_font(28)
             health_text = f"{int(self.health)}"
             text_surface = font.render(health_text, True, (255, 255, 255))
             text_rect = text_surface.get_rect(center=self.rect.center)
@@ -1,12 +1,20 @@
 # balls/north_korea_ball.py - ОБНОВЛЕННАЯ ВЕРСИЯ
 from .base_fighter import FightingBall
+from fonts import get_font
+from sprite_atlas import blit_rotated
+from surface_pool import circle_stamp
+from projectiles import ProjectilePool
+from collision import swept_point_hits_circle
 import pygame
 import math
 import random
 
 class NorthKoreaBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=45, color=(255, 255, 255),
+    RENDER_LISTS = {'missiles': ('x', 'y', 'rotation'),
+                    'explosions': ('x', 'y', 'radius', 'timer')}
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=45, color=(255, 255, 255),
                          name="North Korea", weapon_type="missile")
 
         self.stats = {'damage': 20, 'range': 350, 'speed': 3, 'radius': self.radius}
@@ -14,53 +22,49 @@ class NorthKoreaBall(FightingBall):
         self.missile_cooldown_max = 120
         self.missile_damage = 20
         self.explosion_radius = 200
-        self.missiles = []
+        self.missiles = ProjectilePool(fields=('rotation',))
         self.explosions = []
 
     def launch_missile(self, target):
         """Запускает ракету в цель"""
         if self.missile_cooldown <= 0:
-            dx = target.rect.centerx - self.rect.centerx
-            dy = target.rect.centery - self.rect.centery
+            dx = target.x - self.x
+            dy = target.y - self.y
             distance = math.hypot(dx, dy)
             if distance > 0:
-                accuracy = random.uniform(-0.1, 0.1)
+                accuracy = self.rng.uniform(-0.1, 0.1)
                 angle = math.atan2(dy, dx) + accuracy
                 missile_speed = 6
-                missile = {
-                    'x': self.rect.centerx, 'y': self.rect.centery,
-                    'vx': math.cos(angle) * missile_speed, 'vy': math.sin(angle) * missile_speed,
-                    'lifetime': 600, 'trail': [], 'rotation': math.degrees(-angle)
-                }
-                self.missiles.append(missile)
+                self.missiles.spawn(x=self.x, y=self.y,
+                                    vx=math.cos(angle) * missile_speed, vy=math.sin(angle) * missile_speed,
+                                    lifetime=600, rotation=math.degrees(-angle))
                 self.missile_cooldown = self.missile_cooldown_max
                 return True
         return False
 
     def update_missiles(self, target):
         """Обновляет полет ракет"""
-        for m in self.missiles[:]:
-            m['x'] += m['vx']
-            m['y'] += m['vy']
-            m['lifetime'] -= 1
-            m['trail'].append((m['x'], m['y']))
-            if len(m['trail']) > 15: m['trail'].pop(0)
+        missiles = self.missiles
+        missiles.integrate()
+        missiles['lifetime'] -= 1
 
-            if math.hypot(m['x'] - target.rect.centerx, m['y'] - target.rect.centery) < 20 or m['lifetime'] <= 0:
-                self.create_explosion(m['x'], m['y'], target)
-                self.missiles.remove(m)
+        exploded = (swept_point_hits_circle(missiles, target.x, target.y, 20) |
+                    (missiles['lifetime'] <= 0))
+        for index in missiles.in_spawn_order(exploded):
+            self.create_explosion(float(missiles['x'][index]), float(missiles['y'][index]), target)
+        missiles.remove_where(exploded)
 
     def create_explosion(self, x, y, target):
         """Создает взрыв"""
         self.explosions.append({'x': x, 'y': y, 'radius': 10, 'max_radius': self.explosion_radius, 'timer': 30})
-        distance = math.hypot(x - target.rect.centerx, y - target.rect.centery)
+        distance = math.hypot(x - target.x, y - target.y)
         if distance < self.explosion_radius:
             ratio = 1.0 - (distance / self.explosion_radius)
             target.take_damage(self.missile_damage * ratio)
             if distance > 0:
                 knockback = 15 * ratio
-                dx = target.rect.centerx - x
-                dy = target.rect.centery - y
+                dx = target.x - x
+                dy = target.y - y
                 target.vx += (dx / distance) * knockback
                 target.vy += (dy / distance) * knockback
 
@@ -75,7 +79,7 @@ class NorthKoreaBall(FightingBall):
         if self.missile_cooldown > 0: self.missile_cooldown -= 1
         
         if other_ball and self.missile_cooldown <= 0:
-            if math.hypot(other_ball.rect.centerx - self.rect.centerx, other_ball.rect.centery - self.rect.centery) > 100:
+            if math.hypot(other_ball.x - self.x, other_ball.y - self.y) > 100:
                 self.launch_missile(other_ball)
 
         if other_ball: self.update_missiles(other_ball)
@@ -91,13 +95,8 @@ class NorthKoreaBall(FightingBall):
             points.append((center_x + size * math.cos(angle_rad), center_y + size * math.sin(angle_rad)))
         pygame.draw.polygon(screen, color, points)
 
-    def draw_flag_pattern(self, screen):
-        """Рисует правильный флаг Северной Кореи с помощью маски"""
-        center_x, center_y = self.rect.center
-        radius = self.radius
-        
-        flag_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        
+    def paint_flag(self, flag_surface, radius):
+        """Рисует правильный флаг Северной Кореи"""
         h = radius * 2
         # Пропорции полос (примерные): синий 1/6, белый 1/24, красный 2/3
         blue_h = h / 6
@@ -117,15 +116,8 @@ class NorthKoreaBall(FightingBall):
         pygame.draw.circle(flag_surface, (255, 255, 255), star_circle_center, star_circle_radius)
         self.draw_star(flag_surface, star_circle_center[0], star_circle_center[1], star_circle_radius * 0.8, (237, 28, 36))
 
-        # Применяем маску
-        mask_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(mask_surface, (255, 255, 255, 255), (radius, radius), radius)
-        flag_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        
-        screen.blit(flag_surface, (center_x - radius, center_y - radius))
-
-    def draw_missile(self, screen, missile):
-        """Рисует ракету"""
+    def paint_missile(self, screen, center, angle):
+        """Рисует ракету носом по углу angle"""
         surf = pygame.Surface((40, 20), pygame.SRCALPHA)
         # Корпус
         pygame.draw.rect(surf, (150, 150, 150), (0, 7, 30, 6), border_radius=3)
@@ -134,17 +126,21 @@ class NorthKoreaBall(FightingBall):
         # Огонь
         pygame.draw.polygon(surf, (255, 150, 0), [(-5, 10), (0, 7), (0, 13)])
         
-        rotated_surf = pygame.transform.rotate(surf, missile['rotation'])
-        rect = rotated_surf.get_rect(center=(missile['x'], missile['y']))
-        screen.blit(rotated_surf, rect)
+        blit_rotated(screen, surf, center, angle)
+
+    def draw_missiles(self, screen):
+        """Рисует все ракеты"""
+        # rotation хранится против часовой стрелки (как в transform.rotate)
+        atlas = self.get_sprite_atlas('missile', self.paint_missile, 30)
+        missiles = self.missiles
+        atlas.blit_many(screen, missiles.rows('x', 'y'), (-missiles['rotation']).tolist())
 
     def draw_explosion(self, screen, explosion):
         """Рисует взрыв"""
         alpha = 255 * (explosion['timer'] / 30)
         color = (255, 200, 0, alpha)
         
-        temp_surface = pygame.Surface((explosion['radius']*2, explosion['radius']*2), pygame.SRCALPHA)
-        pygame.draw.circle(temp_surface, color, (explosion['radius'], explosion['radius']), explosion['radius'])
+        temp_surface = circle_stamp(explosion['radius'], color)
         screen.blit(temp_surface, (explosion['x'] - explosion['radius'], explosion['y'] - explosion['radius']), special_flags=pygame.BLEND_RGBA_ADD)
 
 
@@ -152,11 +148,11 @@ class NorthKoreaBall(FightingBall):
         self.draw_flag_pattern(screen)
         pygame.draw.circle(screen, (0, 0, 0), self.rect.center, self.radius, 3)
 
-        for missile in self.missiles: self.draw_missile(screen, missile)
+        self.draw_missiles(screen)
         for explosion in self.explosions: self.draw_explosion(screen, explosion)
 
         if self.health > 0:
-            font = pygame.font.Font(None, 28)
+            font = get_font(28)
             health_text = f"{int(self.health)}"
             text_surface = font.render(health_text, True, (255, 255, 255))
             text_rect = text_surface.get_rect(center=self.rect.center)
@@ -1,12 +1,20 @@
 # balls/russia_ball.py - ОБНОВЛЕННАЯ ВЕРСИЯ
 from .base_fighter import FightingBall
+from fonts import get_font
+from sprite_atlas import blit_rotated
+from projectiles import ProjectilePool
+from collision import swept_box_hits_rect
 import pygame
 import math
 import random
+from config import FPS, ARENA_Y, ARENA_HEIGHT
 
 class RussiaBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=45, color=(255, 255, 255),
+    RENDER_FIELDS = FightingBall.RENDER_FIELDS + ('poison_level', 'has_poison_target', 'anim_frame')
+    RENDER_LISTS = {'bottles': ('x', 'y', 'rotation')}
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=45, color=(255, 255, 255),
                          name="Russia", weapon_type="vodka")
 
         self.stats = {'damage': 5, 'range': 150, 'speed': 3, 'radius': self.radius}
@@ -16,7 +24,7 @@ class RussiaBall(FightingBall):
         self.bottle_cooldown_max = 120  # 2 секунды между бросками
 
         # Брошенные бутылки
-        self.bottles = []
+        self.bottles = ProjectilePool(fields=('rotation',))
 
         # Эффект отравления цели
         self.poison_target = None
@@ -24,52 +32,61 @@ class RussiaBall(FightingBall):
         self.poison_timer = 0   # Таймер для сброса отравления
         self.poison_reset_time = 420  # 7 секунд без попаданий
 
+        # Счетчик кадров для анимации дыма (вместо системных часов - кадр воспроизводим)
+        self.anim_frame = 0
+
+    def get_render_field(self, name):
+        if name == 'has_poison_target':
+            return self.poison_target is not None
+        return super().get_render_field(name)
+
+    def set_render_field(self, name, value):
+        if name == 'has_poison_target':
+            self.has_poison_target = bool(value)
+        else:
+            super().set_render_field(name, value)
+
+    def apply_render_state(self, state, opponent=None):
+        super().apply_render_state(state, opponent)
+        # Отравить можно только противника - восстанавливаем ссылку на него
+        self.poison_target = opponent if self.has_poison_target else None
+
     def throw_bottle(self, target):
         """Бросает бутылку водки в цель"""
         if self.bottle_cooldown <= 0:
-            dx = target.rect.centerx - self.rect.centerx
-            dy = target.rect.centery - self.rect.centery
+            dx = target.x - self.x
+            dy = target.y - self.y
             distance = math.sqrt(dx*dx + dy*dy)
 
             if distance > 0:
                 bottle_speed = 8
-                bottle = {
-                    'x': self.rect.centerx,
-                    'y': self.rect.centery,
-                    'vx': (dx / distance) * bottle_speed,
-                    'vy': (dy / distance) * bottle_speed,
-                    'rotation': 0,
-                    'lifetime': 300
-                }
-                self.bottles.append(bottle)
+                self.bottles.spawn(x=self.x, y=self.y,
+                                   vx=(dx / distance) * bottle_speed, vy=(dy / distance) * bottle_speed,
+                                   rotation=0, lifetime=300)
                 self.bottle_cooldown = self.bottle_cooldown_max
                 return True
         return False
 
     def update_bottles(self, target):
         """Обновляет полет бутылок и проверяет попадания"""
-        for bottle in self.bottles[:]:
-            bottle['x'] += bottle['vx']
-            bottle['y'] += bottle['vy']
-            bottle['vy'] += 0.3  # Гравитация
-            bottle['rotation'] += 15  # Вращение бутылки
-            bottle['lifetime'] -= 1
-
-            bottle_rect = pygame.Rect(bottle['x'] - 10, bottle['y'] - 20, 20, 40)
-            if bottle_rect.colliderect(target.rect):
-                self.apply_poison(target)
-                self.bottles.remove(bottle)
-                continue
-
-            from config import ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT
-            if (bottle.get('y', 0) > ARENA_Y + ARENA_HEIGHT or
-                bottle.get('lifetime', 0) <= 0):
-                if bottle in self.bottles:
-                    self.bottles.remove(bottle)
+        bottles = self.bottles
+        bottles.integrate(gravity=0.3)  # Гравитация
+        bottles['rotation'] += 15  # Вращение бутылки
+        bottles['lifetime'] -= 1
+
+        hits = swept_box_hits_rect(bottles, target.rect, -10, -20, 20, 40)
+        for _ in range(int(hits.sum())):
+            self.apply_poison(target)
+
+        # Разбились о цель, упали ниже арены или отлетали свое
+        bottles.remove_where(hits | (bottles['y'] > ARENA_Y + ARENA_HEIGHT) | (bottles['lifetime'] <= 0))
 
 
     def apply_poison(self, target):
         """Применяет эффект отравления к цели"""
+        if self.poison_level == 0:
+            # Скорость до отравления - вернется, когда яд выветрится
+            target.original_speed = target.max_speed
         self.poison_target = target
         self.poison_level = min(5, self.poison_level + 1)
         self.poison_timer = self.poison_reset_time
@@ -91,12 +108,13 @@ class RussiaBall(FightingBall):
                 self.poison_target = None
 
     def update(self, other_ball=None):
+        self.anim_frame += 1
         if self.bottle_cooldown > 0:
             self.bottle_cooldown -= 1
 
         if other_ball and self.bottle_cooldown <= 0:
-            distance = math.hypot(other_ball.rect.centerx - self.rect.centerx,
-                                  other_ball.rect.centery - self.rect.centery)
+            distance = math.hypot(other_ball.x - self.x,
+                                  other_ball.y - self.y)
             if distance < 300:
                 self.throw_bottle(other_ball)
 
@@ -105,13 +123,8 @@ class RussiaBall(FightingBall):
         self.update_poison_effects()
         super().update(other_ball)
 
-    def draw_flag_pattern(self, screen):
-        """Рисует правильный российский флаг на шарике с помощью маски"""
-        center_x, center_y = self.rect.center
-        radius = self.radius
-
-        # Создаем временную поверхность для флага
-        flag_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    def paint_flag(self, flag_surface, radius):
+        """Рисует правильный российский флаг"""
         stripe_height = (radius * 2) / 3
 
         # Рисуем полосы флага
@@ -119,18 +132,8 @@ class RussiaBall(FightingBall):
         pygame.draw.rect(flag_surface, (0, 57, 166), (0, stripe_height, radius * 2, stripe_height))
         pygame.draw.rect(flag_surface, (213, 43, 30), (0, stripe_height * 2, radius * 2, stripe_height))
 
-        # Создаем круглую маску
-        mask_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(mask_surface, (255, 255, 255, 255), (radius, radius), radius)
-
-        # Применяем маску к флагу (вырезаем круг из прямоугольного флага)
-        flag_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
-        # Отображаем готовый флаг на экране
-        screen.blit(flag_surface, (center_x - radius, center_y - radius))
-
 
-    def draw_vodka_bottle(self, screen, x, y, rotation=0):
+    def draw_vodka_bottle(self, screen, center, rotation=0):
         """Рисует более крупную и детализированную бутылку водки"""
         bottle_height = 40
         bottle_width = 12
@@ -162,26 +165,27 @@ class RussiaBall(FightingBall):
         pygame.draw.rect(bottle_surf, (150, 150, 150), cork_rect)
 
         # Вращение и отображение
-        rotated_bottle = pygame.transform.rotate(bottle_surf, -rotation)
-        new_rect = rotated_bottle.get_rect(center=(x, y))
-        screen.blit(rotated_bottle, new_rect)
+        blit_rotated(screen, bottle_surf, center, rotation)
 
 
     def draw_bottles(self, screen):
         """Рисует все летящие бутылки"""
-        for bottle in self.bottles:
-            self.draw_vodka_bottle(screen, int(bottle['x']), int(bottle['y']), bottle['rotation'])
+        atlas = self.get_sprite_atlas('bottle', self.draw_vodka_bottle, 40)
+        bottles = self.bottles
+        atlas.blit_many(screen, zip(bottles['x'].astype(int).tolist(), bottles['y'].astype(int).tolist()),
+                        bottles['rotation'].tolist())
 
     def draw_poison_effects(self, screen):
         """Рисует эффекты отравления на цели"""
         if self.poison_target and self.poison_level > 0:
             target_center = self.poison_target.rect.center
+            ticks = self.anim_frame * 1000 / FPS
             for i in range(self.poison_level * 3):
-                angle = (pygame.time.get_ticks() * 0.1 * (i+1)) % 360
+                angle = (ticks * 0.1 * (i+1)) % 360
                 distance = self.poison_target.radius + 8 + math.sin(math.radians(angle * 4)) * 4
                 smoke_x = target_center[0] + distance * math.cos(math.radians(angle))
                 smoke_y = target_center[1] + distance * math.sin(math.radians(angle))
-                alpha = 60 + int(30 * math.sin(math.radians(pygame.time.get_ticks()*0.2 + i*20)))
+                alpha = 60 + int(30 * math.sin(math.radians(ticks*0.2 + i*20)))
                 pygame.draw.circle(screen, (0, 150, 0, alpha), (smoke_x, smoke_y), 3)
 
     def draw(self, screen):
@@ -196,7 +200,7 @@ class RussiaBall(FightingBall):
 
         # Здоровье
         if self.health > 0:
-            font = pygame.font.Font(None, 28)
+            font = get_font(28)
             health_text = f"{int(self.health)}"
             text_surface = font.render(health_text, True, (255, 255, 255))
             text_rect = text_surface.get_rect(center=self.rect.center)
@@ -4,8 +4,8 @@ import math
 import random
 
 class SpearBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=40, color=(50, 200, 200), 
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=40, color=(50, 200, 200), 
                          name="Spear Hunter", weapon_type="spear")
         
         self.stats = {'damage': 6, 'range': 120, 'speed': 4, 'radius': self.radius}
@@ -36,13 +36,13 @@ class SpearBall(FightingBall):
             self.dash_timer = 0
             # Небольшой импульс в случайном направлении
             
-            angle = random.uniform(0, 360)
+            angle = self.rng.uniform(0, 360)
             force = 4
             self.vx += force * math.cos(math.radians(angle))
             self.vy += force * math.sin(math.radians(angle))
         
         # Дополнительная проверка скорости - если слишком медленно, добавляем энергию
-        total_speed = math.sqrt(self.vx**2 + self.vy**2)
+        total_speed = math.sqrt(self.vx * self.vx + self.vy * self.vy)
         if total_speed < self.min_speed:
             # Усиливаем текущее направление движения или добавляем случайное
             if total_speed > 0.1:
@@ -50,8 +50,8 @@ class SpearBall(FightingBall):
                 self.vx *= factor * 1.2
                 self.vy *= factor * 1.2
             else:
-                self.vx = random.uniform(-self.min_speed, self.min_speed)
-                self.vy = random.uniform(-self.min_speed, self.min_speed)
+                self.vx = self.rng.uniform(-self.min_speed, self.min_speed)
+                self.vy = self.rng.uniform(-self.min_speed, self.min_speed)
 
     def update(self, other_ball=None):
         # Поддерживаем активность копейщика
@@ -72,8 +72,8 @@ class SpearBall(FightingBall):
         
         # НОВОЕ: После удара копейщик получает дополнительный импульс
         # Импульс в сторону от цели
-        dx = self.rect.centerx - target.rect.centerx
-        dy = self.rect.centery - target.rect.centery
+        dx = self.x - target.x
+        dy = self.y - target.y
         distance = math.sqrt(dx*dx + dy*dy)
         if distance > 0:
             boost_force = 3
@@ -2,8 +2,8 @@
 from .base_fighter import FightingBall
 
 class SwordBall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=40, color=(200, 50, 200), 
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=40, color=(200, 50, 200), 
                          name="Sword Master", weapon_type="sword")
         
         self.stats = {'damage': 4, 'range': 100, 'speed': 4, 'radius': self.radius}
@@ -23,5 +23,5 @@ class SwordBall(FightingBall):
         self.weapon_width = min(50, self.weapon_width + 0.8)  # И в ширину
         
         # Дополнительный импульс после удара
-        self.vx += 2 if self.rect.centerx > target.rect.centerx else -2
+        self.vx += 2 if self.x > target.x else -2
         self.vy -= 1
\ No newline at end of file
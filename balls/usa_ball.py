@@ -1,12 +1,20 @@
 # balls/usa_ball.py - ОБНОВЛЕННАЯ ВЕРСИЯ (ВИЗУАЛ)
 from .base_fighter import FightingBall
+from fonts import get_font
+from sprite_atlas import blit_rotated
+from particles import ParticleSystem, draw_rects
+from projectiles import ProjectilePool
+from collision import swept_box_hits_rect
 import pygame
 import math
 import random
 
 class USABall(FightingBall):
-    def __init__(self, x, y):
-        super().__init__(x=x, y=y, radius=45, color=(255, 255, 255),
+    RENDER_FIELDS = FightingBall.RENDER_FIELDS + ('bullets', 'reload_timer', 'muzzle_flash_timer', 'aim_angle')
+    RENDER_LISTS = {'flying_bullets': ('x', 'y', 'vx', 'vy'), 'shell_casings': ('x', 'y')}
+
+    def __init__(self, x, y, rng=None):
+        super().__init__(x=x, y=y, rng=rng, radius=45, color=(255, 255, 255),
                          name="USA", weapon_type="revolver")
 
         self.stats = {'damage': 8, 'range': 250, 'speed': 4, 'radius': self.radius}
@@ -18,36 +26,35 @@ class USABall(FightingBall):
         self.shoot_cooldown = 0
         self.shoot_cooldown_time = 10
 
-        self.flying_bullets = []
+        self.flying_bullets = ProjectilePool()
         self.muzzle_flash_timer = 0
-        self.shell_casings = []
+        # Гильзы - частицы с гравитацией; вращение считается, но не рисуется
+        self.shell_casings = ParticleSystem(gravity=0.2)
+        self.aim_angle = 0  # Куда смотрит револьвер (градусы), следит за противником
 
     def shoot(self, target):
         """Стреляет из револьвера"""
         if self.bullets > 0 and self.shoot_cooldown <= 0 and self.reload_timer <= 0:
-            dx = target.rect.centerx - self.rect.centerx
-            dy = target.rect.centery - self.rect.centery
+            dx = target.x - self.x
+            dy = target.y - self.y
             distance = math.hypot(dx, dy)
 
             if distance > 0:
                 bullet_speed = 15
-                bullet = {
-                    'x': self.rect.centerx, 'y': self.rect.centery,
-                    'vx': (dx / distance) * bullet_speed, 'vy': (dy / distance) * bullet_speed,
-                    'lifetime': 180
-                }
-                self.flying_bullets.append(bullet)
+                self.flying_bullets.spawn(x=self.x, y=self.y,
+                                          vx=(dx / distance) * bullet_speed, vy=(dy / distance) * bullet_speed,
+                                          lifetime=180)
 
                 self.bullets -= 1
                 self.shoot_cooldown = self.shoot_cooldown_time
                 self.muzzle_flash_timer = 8
 
                 casing = {
-                    'x': self.rect.centerx + random.uniform(-5, 5), 'y': self.rect.centery + random.uniform(-5, 5),
-                    'vx': random.uniform(-2, 2), 'vy': random.uniform(-4, -1),
-                    'rotation': random.uniform(0, 360), 'lifetime': 180
+                    'x': self.x + self.rng.uniform(-5, 5), 'y': self.y + self.rng.uniform(-5, 5),
+                    'vx': self.rng.uniform(-2, 2), 'vy': self.rng.uniform(-4, -1),
+                    'rotation': self.rng.uniform(0, 360), 'life': 180
                 }
-                self.shell_casings.append(casing)
+                self.shell_casings.emit(color=(255, 215, 0), spin=casing['vx'] * 5, **casing)
 
                 if self.bullets <= 0:
                     self.reload_timer = self.reload_time
@@ -56,32 +63,18 @@ class USABall(FightingBall):
 
     def update_bullets(self, target):
         """Обновляет полет пуль и проверяет попадания"""
-        for bullet in self.flying_bullets[:]:
-            bullet['x'] += bullet['vx']
-            bullet['y'] += bullet['vy']
-            bullet['lifetime'] -= 1
-
-            bullet_rect = pygame.Rect(bullet['x'] - 4, bullet['y'] - 4, 8, 8)
-            if bullet_rect.colliderect(target.rect):
-                target.take_damage(self.stats['damage'])
-                if bullet in self.flying_bullets:
-                    self.flying_bullets.remove(bullet)
-                continue
-            
-            if bullet['lifetime'] <= 0:
-                if bullet in self.flying_bullets:
-                    self.flying_bullets.remove(bullet)
+        bullets = self.flying_bullets
+        bullets.integrate()
+        bullets['lifetime'] -= 1
+
+        hits = swept_box_hits_rect(bullets, target.rect, -4, -4, 8, 8)
+        for _ in range(int(hits.sum())):
+            target.take_damage(self.stats['damage'])
+        bullets.remove_where(hits | (bullets['lifetime'] <= 0))
 
     def update_casings(self):
         """Обновляет гильзы"""
-        for casing in self.shell_casings[:]:
-            casing['x'] += casing['vx']
-            casing['y'] += casing['vy']
-            casing['vy'] += 0.2
-            casing['rotation'] += casing['vx'] * 5
-            casing['lifetime'] -= 1
-            if casing['lifetime'] <= 0:
-                self.shell_casings.remove(casing)
+        self.shell_casings.update()
 
     def update(self, other_ball=None):
         if self.shoot_cooldown > 0: self.shoot_cooldown -= 1
@@ -92,8 +85,12 @@ class USABall(FightingBall):
             if self.reload_timer <= 0:
                 self.bullets = self.max_bullets
 
+        if other_ball:
+            self.aim_angle = math.degrees(math.atan2(other_ball.y - self.y,
+                                                     other_ball.x - self.x))
+
         if other_ball and self.bullets > 0 and self.shoot_cooldown <= 0 and self.reload_timer <= 0:
-            distance = math.hypot(other_ball.rect.centerx - self.rect.centerx, other_ball.rect.centery - self.rect.centery)
+            distance = math.hypot(other_ball.x - self.x, other_ball.y - self.y)
             if distance < 350:
                 self.shoot(other_ball)
 
@@ -101,13 +98,8 @@ class USABall(FightingBall):
         self.update_casings()
         super().update(other_ball)
 
-    def draw_flag_pattern(self, screen):
-        """Рисует правильный флаг США с помощью маски"""
-        center_x, center_y = self.rect.center
-        radius = self.radius
-        
-        flag_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        
+    def paint_flag(self, flag_surface, radius):
+        """Рисует правильный флаг США"""
         stripe_height = (radius * 2) / 13
         for i in range(13):
             color = (178, 34, 52) if i % 2 == 0 else (255, 255, 255)
@@ -126,24 +118,12 @@ class USABall(FightingBall):
                 if star_x < canton_width - 5 and star_y < canton_height - 5:
                     pygame.draw.circle(flag_surface, (255, 255, 255), (star_x, star_y), 2)
 
-        mask_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(mask_surface, (255, 255, 255, 255), (radius, radius), radius)
-        flag_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        
-        screen.blit(flag_surface, (center_x - radius, center_y - radius))
-
-    def draw_revolver(self, screen):
-        """Рисует БОЛЬШОЙ револьвер, который шар 'держит' в руках"""
-        center_x, center_y = self.rect.center
-        
-        mouse_pos = pygame.mouse.get_pos()
-        angle = math.degrees(math.atan2(mouse_pos[1] - center_y, mouse_pos[0] - center_x))
-        
+    def paint_revolver(self, screen, center, angle):
+        """Рисует корпус револьвера, вынесенный от центра шара по углу прицела"""
         # ИЗМЕНЕНИЕ: Смещение увеличено с 15 до 35, чтобы вынести револьвер за пределы шара
         revolver_offset = 35
-        revolver_offset_x = revolver_offset * math.cos(math.radians(angle))
-        revolver_offset_y = revolver_offset * math.sin(math.radians(angle))
-        gun_x, gun_y = center_x + revolver_offset_x, center_y + revolver_offset_y
+        gun_x = center[0] + revolver_offset * math.cos(math.radians(angle))
+        gun_y = center[1] + revolver_offset * math.sin(math.radians(angle))
 
         # ИЗМЕНЕНИЕ: Поверхность и все элементы револьвера увеличены
         gun_surface = pygame.Surface((90, 60), pygame.SRCALPHA)
@@ -158,24 +138,33 @@ class USABall(FightingBall):
         # Барабан
         pygame.draw.circle(gun_surface, (140, 140, 140), (gs_center_x, gs_center_y), 12)
         pygame.draw.circle(gun_surface, (80, 80, 80), (gs_center_x, gs_center_y), 12, 2)
-        # Индикатор патронов
+
+        blit_rotated(screen, gun_surface, (gun_x, gun_y), angle)
+
+    def draw_revolver(self, screen):
+        """Рисует БОЛЬШОЙ револьвер, который шар 'держит' в руках"""
+        # Угол прицела считается в update(), а не по мыши - кадр зависит только от состояния
+        angle = self.aim_angle
+        atlas = self.get_sprite_atlas('revolver', self.paint_revolver, 100)
+        atlas.blit(screen, self.rect.center, angle)
+
+        # Индикатор патронов меняется от выстрела к выстрелу, поэтому рисуется поверх атласа.
+        # Барабан стоит на 10 пикселей ближе к шару, чем центр поверхности револьвера
+        drum_offset = 35 - 10
+        drum_x = self.rect.centerx + drum_offset * math.cos(math.radians(angle))
+        drum_y = self.rect.centery + drum_offset * math.sin(math.radians(angle))
         for i in range(self.max_bullets):
-            bullet_angle = (360 / self.max_bullets) * i
-            bx = gs_center_x + 9 * math.cos(math.radians(bullet_angle))
-            by = gs_center_y + 9 * math.sin(math.radians(bullet_angle))
+            bullet_angle = math.radians(angle + (360 / self.max_bullets) * i)
+            bx = drum_x + 9 * math.cos(bullet_angle)
+            by = drum_y + 9 * math.sin(bullet_angle)
             color = (255, 215, 0) if i < self.bullets else (50, 50, 50)
-            pygame.draw.circle(gun_surface, color, (bx, by), 3)
-            
-        rotated_gun = pygame.transform.rotate(gun_surface, -angle)
-        new_rect = rotated_gun.get_rect(center=(gun_x, gun_y))
-        screen.blit(rotated_gun, new_rect)
+            pygame.draw.circle(screen, color, (bx, by), 3)
 
     def draw_muzzle_flash(self, screen):
         """Рисует вспышку выстрела"""
         if self.muzzle_flash_timer > 0:
             center_x, center_y = self.rect.center
-            mouse_pos = pygame.mouse.get_pos()
-            angle = math.atan2(mouse_pos[1] - center_y, mouse_pos[0] - center_x)
+            angle = math.radians(self.aim_angle)
             
             # Смещаем вспышку к концу ствола
             flash_start_offset = self.radius + 40
@@ -185,7 +174,7 @@ class USABall(FightingBall):
             
             points = []
             for i in range(5):
-                a = angle + random.uniform(-0.5, 0.5)
+                a = angle + self.fx_rng.uniform(-0.5, 0.5)
                 r = flash_size * (1 - (self.muzzle_flash_timer / 8))
                 points.append((start_pos_x + r * math.cos(a), start_pos_y + r * math.sin(a)))
             
@@ -194,17 +183,15 @@ class USABall(FightingBall):
 
     def draw_bullets(self, screen):
         """Рисует пули"""
-        for bullet in self.flying_bullets:
-            pygame.draw.circle(screen, (255, 255, 0), (int(bullet['x']), int(bullet['y'])), 5)
-            pygame.draw.circle(screen, (255, 150, 0), (int(bullet['x']), int(bullet['y'])), 3)
-            trail_x = bullet['x'] - bullet['vx']
-            trail_y = bullet['y'] - bullet['vy']
-            pygame.draw.line(screen, (255, 200, 0, 150), (bullet['x'], bullet['y']), (trail_x, trail_y), 3)
+        bullets = self.flying_bullets
+        for x, y, vx, vy in bullets.rows('x', 'y', 'vx', 'vy'):
+            pygame.draw.circle(screen, (255, 255, 0), (int(x), int(y)), 5)
+            pygame.draw.circle(screen, (255, 150, 0), (int(x), int(y)), 3)
+            pygame.draw.line(screen, (255, 200, 0, 150), (x, y), (x - vx, y - vy), 3)
 
     def draw_casings(self, screen):
         """Рисует гильзы"""
-        for casing in self.shell_casings:
-            pygame.draw.rect(screen, (255, 215, 0), (int(casing['x']), int(casing['y']), 5, 3))
+        draw_rects(screen, self.shell_casings.field('x'), self.shell_casings.field('y'), (5, 3), (255, 215, 0))
 
     def draw_reload_indicator(self, screen):
         """Рисует индикатор перезарядки"""
@@ -225,7 +212,7 @@ class USABall(FightingBall):
         self.draw_reload_indicator(screen)
         
         if self.health > 0:
-            font = pygame.font.Font(None, 28)
+            font = get_font(28)
             health_text = f"{int(self.health)}"
             text_surface = font.render(health_text, True, (255, 255, 255))
             text_rect = text_surface.get_rect(center=self.rect.center)
@@ -0,0 +1,53 @@
+# broadphase.py
+
+EXTENT_SLACK = 1.0  # Запас интервалов в пикселях: округление в точных проверках не теряет касаний
+
+
+class SweepAndPrune:
+    """
+    Грубая фаза столкновений по оси x: тела, оружие и пути снарядов дуэли - интервалы
+    [left, right] под ключами вроде ('weapon', 0), отсортированные по левому краю.
+    GameState пересобирает ее раз за шаг перед проходом столкновений, и точные проверки
+    (капсулы, круги, пути снарядов) делаются только для пар с перекрывшимися
+    интервалами. Интервалы - с запасом, поэтому результат совпадает с полным перебором.
+    """
+
+    def __init__(self):
+        self.pairs = set()  # (ключ, ключ) перекрывшихся интервалов, в обоих порядках
+
+    def rebuild(self, proxies):
+        """proxies: (left, right, ключ) на текущий шаг"""
+        pairs = set()
+        active = []  # (right, ключ) интервалов, начавшихся левее текущего
+        for left, right, key in sorted(proxies):
+            active = [entry for entry in active if entry[0] >= left]
+            for _, other in active:
+                pairs.add((key, other))
+                pairs.add((other, key))
+            active.append((right, key))
+        self.pairs = pairs
+
+    def overlaps(self, first, second):
+        """Интервалы first и second перекрылись на этом шаге (отсутствующий ключ - нет)"""
+        return (first, second) in self.pairs
+
+
+def capsule_extent(capsule):
+    """x-интервал капсулы оружия"""
+    reach = capsule.radius + EXTENT_SLACK
+    x0, x1 = (capsule.x0, capsule.x1) if capsule.x0 < capsule.x1 else (capsule.x1, capsule.x0)
+    return x0 - reach, x1 + reach
+
+
+def circle_extent(center_x, radius):
+    """x-интервал тела шарика"""
+    return center_x - radius - EXTENT_SLACK, center_x + radius + EXTENT_SLACK
+
+
+def path_extent(pool, margin=0.0):
+    """x-интервал путей снарядов пула за последний шаг (None для пустого пула)"""
+    if pool.count == 0:
+        return None
+    reach = margin + EXTENT_SLACK
+    return (min(pool['x'].min(), pool['last_x'].min()) - reach,
+            max(pool['x'].max(), pool['last_x'].max()) + reach)
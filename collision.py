@@ -0,0 +1,153 @@
+# collision.py
+import math
+from collections import namedtuple
+import numpy as np
+
+# Форма оружия: отрезок (x0, y0) - (x1, y1), раздутый на radius. Повернутое оружие
+# описывается точно, а не ограничивающим прямоугольником; круг - капсула нулевой длины
+Capsule = namedtuple('Capsule', ['x0', 'y0', 'x1', 'y1', 'radius'])
+
+
+def _clamp01(value):
+    return 0.0 if value < 0.0 else 1.0 if value > 1.0 else value
+
+
+def segment_distance_sq(ax0, ay0, ax1, ay1, bx0, by0, bx1, by1):
+    """Квадрат расстояния между отрезками (ближайшие точки, как у Эриксона)"""
+    dax, day = ax1 - ax0, ay1 - ay0
+    dbx, dby = bx1 - bx0, by1 - by0
+    rx, ry = ax0 - bx0, ay0 - by0
+    a = dax * dax + day * day
+    e = dbx * dbx + dby * dby
+    f = dbx * rx + dby * ry
+    if a == 0.0 and e == 0.0:
+        s = t = 0.0
+    elif a == 0.0:
+        s, t = 0.0, _clamp01(f / e)
+    else:
+        c = dax * rx + day * ry
+        if e == 0.0:
+            s, t = _clamp01(-c / a), 0.0
+        else:
+            b = dax * dbx + day * dby
+            denom = a * e - b * b
+            s = _clamp01((b * f - c * e) / denom) if denom != 0.0 else 0.0
+            t = (b * s + f) / e
+            if t < 0.0:
+                s, t = _clamp01(-c / a), 0.0
+            elif t > 1.0:
+                s, t = _clamp01((b - c) / a), 1.0
+    dx = (ax0 + dax * s) - (bx0 + dbx * t)
+    dy = (ay0 + day * s) - (by0 + dby * t)
+    return dx * dx + dy * dy
+
+
+def capsules_collide(first, second):
+    """Капсулы пересекаются (касание не считается, как у Rect.colliderect)"""
+    reach = first.radius + second.radius
+    return segment_distance_sq(*first[:4], *second[:4]) < reach * reach
+
+
+def capsule_hits_circle(capsule, center_x, center_y, radius):
+    """Капсула задевает круг - оружие против тела шарика"""
+    reach = capsule.radius + radius
+    return segment_distance_sq(*capsule[:4], center_x, center_y, center_x, center_y) < reach * reach
+
+
+def segments_hit_rect(x0, y0, x1, y1, left, top, right, bottom):
+    """
+    Маска отрезков (x0, y0) -> (x1, y1), проходящих через внутренность прямоугольника
+    (left, right) x (top, bottom). Slab-тест: отрезок пересекает прямоугольник, если
+    интервалы входа-выхода по обеим осям перекрываются. Касание границы, как и в
+    Rect.colliderect, попаданием не считается; неподвижная точка - частный случай.
+    """
+    t_enter = 0.0
+    t_exit = 1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start, end, low, high in ((x0, x1, left, right), (y0, y1, top, bottom)):
+            # Без движения по оси обратная величина бесконечна: доли пути становятся -inf/+inf
+            # (точка строго внутри полосы), +inf/+inf (снаружи) или nan (на границе) -
+            # nan проваливает итоговое сравнение, как и положено касанию
+            inverse = 1.0 / (end - start)
+            t_low = (low - start) * inverse
+            t_high = (high - start) * inverse
+            t_enter = np.maximum(t_enter, np.minimum(t_low, t_high))
+            t_exit = np.minimum(t_exit, np.maximum(t_low, t_high))
+    return t_enter < t_exit
+
+
+def segments_hit_circle(x0, y0, x1, y1, center_x, center_y, radius):
+    """Маска отрезков, проходящих строго ближе radius к центру круга"""
+    dx = x1 - x0
+    dy = y1 - y0
+    length_sq = dx * dx + dy * dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ((center_x - x0) * dx + (center_y - y0) * dy) / length_sq
+    # Ближайшая к центру точка отрезка (для неподвижного снаряда - он сам)
+    t = np.where(length_sq > 0, np.clip(t, 0.0, 1.0), 0.0)
+    return np.hypot(x0 + t * dx - center_x, y0 + t * dy - center_y) < radius
+
+
+def _path_columns(pool):
+    """(last_x, last_y, x, y) - отрезки пути снарядов за последний шаг"""
+    return [pool[name] for name in ('last_x', 'last_y', 'x', 'y')]
+
+
+def swept_box_hits_rect(pool, rect, offset_x, offset_y, width, height):
+    """
+    Маска снарядов пула, чей прямоугольник Rect(x + offset_x, y + offset_y, width, height)
+    задел rect на пути от прошлой позиции (last_x, last_y) к текущей. Прямоугольник
+    снаряда сводится к точке, а rect расширяется на его размер (сумма Минковского).
+    """
+    if pool.count == 0 or rect.width <= 0 or rect.height <= 0 or width <= 0 or height <= 0:
+        return np.zeros(pool.count, dtype=bool)
+    return segments_hit_rect(*_path_columns(pool),
+                             rect.left - offset_x - width, rect.top - offset_y - height,
+                             rect.right - offset_x, rect.bottom - offset_y)
+
+
+def swept_point_hits_circle(pool, center_x, center_y, radius):
+    """Маска снарядов пула, прошедших за последний шаг строго ближе radius к точке"""
+    if pool.count == 0:
+        return np.zeros(0, dtype=bool)
+    return segments_hit_circle(*_path_columns(pool), center_x, center_y, radius)
+
+
+def segments_hit_capsule(x0, y0, x1, y1, capsule, margin=0.0):
+    """
+    Маска отрезков, прошедших строго ближе capsule.radius + margin к оси капсулы -
+    векторный вариант segment_distance_sq для путей снарядов (снаряд - круг радиуса margin).
+    """
+    dax, day = x1 - x0, y1 - y0
+    dbx, dby = capsule.x1 - capsule.x0, capsule.y1 - capsule.y0
+    rx, ry = x0 - capsule.x0, y0 - capsule.y0
+    a = dax * dax + day * day
+    e = dbx * dbx + dby * dby
+    f = dbx * rx + dby * ry
+    c = dax * rx + day * ry
+    b = dax * dbx + day * dby
+    moving = a > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if e > 0:
+            denom = a * e - b * b
+            s = np.where(moving & (denom != 0), np.clip((b * f - c * e) / denom, 0.0, 1.0), 0.0)
+            t = (b * s + f) / e
+            s = np.where(t < 0, np.clip(-c / a, 0.0, 1.0), np.where(t > 1, np.clip((b - c) / a, 0.0, 1.0), s))
+            t = np.clip(t, 0.0, 1.0)
+            # Неподвижный снаряд - просто ближайшая точка оси капсулы
+            s = np.where(moving, s, 0.0)
+            t = np.where(moving, t, np.clip(f / e, 0.0, 1.0))
+        else:
+            s = np.where(moving, np.clip(-c / a, 0.0, 1.0), 0.0)
+            t = 0.0
+    dx = (x0 + dax * s) - (capsule.x0 + dbx * t)
+    dy = (y0 + day * s) - (capsule.y0 + dby * t)
+    reach = capsule.radius + margin
+    return dx * dx + dy * dy < reach * reach
+
+
+def swept_point_hits_capsule(pool, capsule, margin=0.0):
+    """Маска снарядов пула (кругов радиуса margin), задевших капсулу оружия за последний шаг"""
+    if pool.count == 0:
+        return np.zeros(0, dtype=bool)
+    return segments_hit_capsule(*_path_columns(pool), capsule, margin)
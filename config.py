@@ -38,7 +38,13 @@ ASSETS_DIR = "assets" # Папка для звуков
 OUTPUT_DIR = "output"
 FRAMES_DIR = f"{OUTPUT_DIR}/frames"
 FINAL_VIDEO_PATH = f"{OUTPUT_DIR}/final_video.mp4"
+VIDEO_ONLY_PATH = f"{OUTPUT_DIR}/video_only.mp4"  # Видео без звука из ffmpeg-энкодера
 INTRO_AUDIO_PATH = f"{OUTPUT_DIR}/intro.mp3"
+REPLAY_PATH = f"{OUTPUT_DIR}/duel.replay"  # Бинарный повтор дуэли для перерисовки без симуляции
+CACHE_DIR = ".cache"
+SOUND_CACHE_DIR = f"{CACHE_DIR}/sounds"  # Декодированные звуки (.npy), пересоздаются при изменении mp3
+INTRO_CACHE_DIR = f"{CACHE_DIR}/intro"   # Озвучки интро по хешу (текст, язык, голос)
+INTRO_TTS_BACKENDS = ["gtts", "pyttsx3"]  # Движки по порядку: следующий пробуется, если предыдущий не смог
 
 # ЗВУКОВЫЕ ФАЙЛЫ ДЛЯ COUNTRY BALLS
 # Звуки оружия стран
@@ -0,0 +1,142 @@
+# duel_trace.py
+import importlib
+import random
+from collections import namedtuple
+from config import ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT
+
+# Поля GameState, которые читает Renderer на каждом кадре
+GAME_FIELDS = ('frame_count', 'hit_effect_timer', 'parry_effect_timer', 'time_freeze_timer', 'winner_index')
+
+# Один кадр трассы: кортеж полей GameState + снимки двух шариков
+FrameRecord = namedtuple('FrameRecord', ['game', 'ball1', 'ball2'])
+
+
+def class_path(cls):
+    return f"{cls.__module__}:{cls.__name__}"
+
+
+def load_class(path):
+    module_name, class_name = path.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class DuelTrace:
+    """
+    Запись дуэли: сначала симуляция целиком, потом отрисовка по записи.
+    Каждый кадр хранит только то, что нужно Renderer.draw().
+    """
+
+    def __init__(self, fighter_classes, fps, hit_duration, parry_duration, time_freeze_duration, seed=0):
+        self.fighter_classes = list(fighter_classes)
+        self.fps = fps
+        self.seed = seed
+        self.hit_duration = hit_duration
+        self.parry_duration = parry_duration
+        self.time_freeze_duration = time_freeze_duration
+        self.frames = []
+        self.hit_events = []
+        self.parry_events = []
+        self.winner = None
+
+    @classmethod
+    def for_game(cls, game_state, fps):
+        return cls([class_path(type(ball)) for ball in game_state.balls], fps,
+                   game_state.hit_duration, game_state.parry_duration, game_state.time_freeze_duration,
+                   game_state.seed)
+
+    def record(self, game_state):
+        """Добавляет снимок текущего состояния игры"""
+        if game_state.winner is None:
+            winner_index = 0
+        else:
+            winner_index = 1 if game_state.winner == game_state.ball1.name else 2
+        game = (game_state.frame_count, game_state.hit_effect_timer, game_state.parry_effect_timer,
+                game_state.time_freeze_timer, winner_index)
+        self.frames.append(FrameRecord(game,
+                                       game_state.ball1.get_render_state(),
+                                       game_state.ball2.get_render_state()))
+
+    def hold(self, frames):
+        """Повторяет последний кадр (победный экран без симуляции)"""
+        if self.frames:
+            self.frames.extend([self.frames[-1]] * frames)
+
+    def finish(self, game_state):
+        """Сохраняет события и итог после окончания симуляции"""
+        self.hit_events = list(game_state.hit_events)
+        self.parry_events = list(game_state.parry_events)
+        self.winner = game_state.winner
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    @property
+    def duration(self):
+        return len(self.frames) / self.fps
+
+    def is_boring(self, min_hits=0, min_parries=0):
+        """Скучная дуэль - мало ударов/парирований; её можно выбросить до рендера"""
+        return len(self.hit_events) < min_hits or len(self.parry_events) < min_parries
+
+
+def record_duel(game_state, fps, max_frames, victory_frames=0, on_frame=None):
+    """
+    Симулирует дуэль до конца без отрисовки и возвращает DuelTrace.
+    on_frame(game_state, frame_index) вызывается после каждого шага (для прогресса).
+    """
+    trace = DuelTrace.for_game(game_state, fps)
+    for frame_index in range(max_frames):
+        game_state.update()
+        trace.record(game_state)
+        if on_frame:
+            on_frame(game_state, frame_index)
+        if game_state.winner:
+            trace.hold(victory_frames)
+            break
+    trace.finish(game_state)
+    return trace
+
+
+class TracePlayback:
+    """
+    Заменитель GameState для Renderer: шарики-куклы, в которые
+    подставляется записанное состояние нужного кадра.
+    """
+
+    def __init__(self, trace):
+        self.trace = trace
+        ball_classes = [load_class(path) for path in trace.fighter_classes]
+        # Куклы не симулируются - их RNG нужен только конструктору
+        puppet_rng = random.Random(trace.seed)
+        self.ball1 = ball_classes[0](x=ARENA_X + 100, y=ARENA_Y + 100, rng=puppet_rng)
+        self.ball2 = ball_classes[1](x=ARENA_X + ARENA_WIDTH - 100, y=ARENA_Y + ARENA_HEIGHT - 100, rng=puppet_rng)
+        self.balls = [self.ball1, self.ball2]
+        self.seed = trace.seed
+
+        self.hit_duration = trace.hit_duration
+        self.parry_duration = trace.parry_duration
+        self.time_freeze_duration = trace.time_freeze_duration
+
+        self.frame_index = -1
+        self.frame_count = 0
+        self.hit_effect_timer = 0
+        self.parry_effect_timer = 0
+        self.time_freeze_timer = 0
+        self.winner = None
+
+    def __len__(self):
+        return len(self.trace)
+
+    def seek(self, frame_index):
+        """Подставляет состояние кадра frame_index и возвращает себя для Renderer.draw()"""
+        record = self.trace[frame_index]
+        (self.frame_count, self.hit_effect_timer, self.parry_effect_timer,
+         self.time_freeze_timer, winner_index) = record.game
+        self.winner = self.balls[winner_index - 1].name if winner_index else None
+        self.ball1.apply_render_state(record.ball1, self.ball2)
+        self.ball2.apply_render_state(record.ball2, self.ball1)
+        self.frame_index = frame_index
+        return self
@@ -2,6 +2,59 @@
 import pygame
 import sys
 from config import WIDTH, HEIGHT, VANILLA, BLACK, WHITE, GOLD
+from fonts import get_ui_font
+
+# Реестр стран-бойцов: номер на экране выбора -> описание и имя класса
+FIGHTERS = {
+    1: {
+        'name': 'Russia',
+        'color': (213, 43, 30),
+        'description': 'Vodka Bottles',
+        'special': 'Poison effect stacks with each hit',
+        'class': 'RussiaBall',
+        'sound': 'assets/sounds/vodka_throw.mp3'
+    },
+    2: {
+        'name': 'USA', 
+        'color': (178, 34, 52),
+        'description': 'Revolver',
+        'special': '6 bullets, 2sec reload time',
+        'class': 'USABall',
+        'sound': 'assets/sounds/gunshot.mp3'
+    },
+    3: {
+        'name': 'France',
+        'color': (0, 85, 164),
+        'description': 'Baguette',
+        'special': 'Blocks bullets, strong knockback',
+        'class': 'FranceBall',
+        'sound': 'assets/sounds/baguette_hit.mp3'
+    },
+    4: {
+        'name': 'China',
+        'color': (238, 28, 37),
+        'description': 'Nunchucks',
+        'special': 'Creates clones after hits',
+        'class': 'ChinaBall',
+        'sound': 'assets/sounds/nunchuck_swing.mp3'
+    },
+    5: {
+        'name': 'Canada',
+        'color': (255, 0, 0),
+        'description': 'Politeness',
+        'special': 'Very weak but apologetic',
+        'class': 'CanadaBall',
+        'sound': 'assets/sounds/sorry.mp3'
+    },
+    6: {
+        'name': 'North Korea',
+        'color': (237, 28, 36),
+        'description': 'Missiles',
+        'special': '15 damage explosion every 5sec',
+        'class': 'NorthKoreaBall',
+        'sound': 'assets/sounds/missile_launch.mp3'
+    }
+}
 
 class FighterSelector:
     def __init__(self):
@@ -9,65 +62,11 @@ class FighterSelector:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Выберите страны для эпической дуэли!")
         
-        try:
-            self.font_large = pygame.font.Font("assets/fonts/BebasNeue-Regular.ttf", 80)
-            self.font_medium = pygame.font.Font("assets/fonts/BebasNeue-Regular.ttf", 50)
-            self.font_small = pygame.font.Font("assets/fonts/BebasNeue-Regular.ttf", 35)
-        except:
-            self.font_large = pygame.font.Font(None, 80)
-            self.font_medium = pygame.font.Font(None, 50)
-            self.font_small = pygame.font.Font(None, 35)
+        self.font_large = get_ui_font(80)
+        self.font_medium = get_ui_font(50)
+        self.font_small = get_ui_font(35)
         
-        self.fighters = {
-            1: {
-                'name': 'Russia',
-                'color': (213, 43, 30),
-                'description': 'Vodka Bottles',
-                'special': 'Poison effect stacks with each hit',
-                'class': 'RussiaBall',
-                'sound': 'assets/sounds/vodka_throw.mp3'
-            },
-            2: {
-                'name': 'USA', 
-                'color': (178, 34, 52),
-                'description': 'Revolver',
-                'special': '6 bullets, 2sec reload time',
-                'class': 'USABall',
-                'sound': 'assets/sounds/gunshot.mp3'
-            },
-            3: {
-                'name': 'France',
-                'color': (0, 85, 164),
-                'description': 'Baguette',
-                'special': 'Blocks bullets, strong knockback',
-                'class': 'FranceBall',
-                'sound': 'assets/sounds/baguette_hit.mp3'
-            },
-            4: {
-                'name': 'China',
-                'color': (238, 28, 37),
-                'description': 'Nunchucks',
-                'special': 'Creates clones after hits',
-                'class': 'ChinaBall',
-                'sound': 'assets/sounds/nunchuck_swing.mp3'
-            },
-            5: {
-                'name': 'Canada',
-                'color': (255, 0, 0),
-                'description': 'Politeness',
-                'special': 'Very weak but apologetic',
-                'class': 'CanadaBall',
-                'sound': 'assets/sounds/sorry.mp3'
-            },
-            6: {
-                'name': 'North Korea',
-                'color': (237, 28, 36),
-                'description': 'Missiles',
-                'special': '15 damage explosion every 5sec',
-                'class': 'NorthKoreaBall',
-                'sound': 'assets/sounds/missile_launch.mp3'
-            }
-        }
+        self.fighters = FIGHTERS
         
         self.selected_fighter1 = None
         self.selected_fighter2 = None
@@ -0,0 +1,41 @@
+# fonts.py
+import pygame
+from config import FONT_PATH
+
+# Общий реестр шрифтов процесса: (путь, размер) -> pygame.font.Font.
+# Шрифт загружается один раз; None - встроенный шрифт pygame.
+_fonts = {}
+
+# Размеры, которые интерфейс использует на каждом кадре
+PRELOAD_SIZES = {
+    FONT_PATH: (90, 80, 50, 35, 32, 24),
+    None: (28, 22, 20),
+}
+
+
+def get_font(size, path=None):
+    """Шрифт нужного размера из реестра; если файла шрифта нет - встроенный того же размера"""
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        try:
+            font = pygame.font.Font(path, size)
+        except (OSError, pygame.error):
+            # Если шрифт не найден, используем системный
+            font = get_font(size)
+        _fonts[key] = font
+    return font
+
+
+def get_ui_font(size):
+    """Шрифт интерфейса (Bebas Neue) нужного размера"""
+    return get_font(size, FONT_PATH)
+
+
+def preload_fonts(sizes=PRELOAD_SIZES):
+    """Заранее загружает размеры интерфейса, чтобы первый кадр не платил за загрузку"""
+    for path, path_sizes in sizes.items():
+        for size in path_sizes:
+            get_font(size, path)
@@ -1,83 +1,134 @@
 # main.py
 import os
 import shutil
+import argparse
+import random
 import pygame
 import time
 import math
 from config import *
 from simulation import GameState
+from duel_trace import record_duel, TracePlayback
+from replay_file import write_replay
+from parallel_render import render_trace_parallel
 from renderer import Renderer
-from audio_generator import generate_intro_audio
-from video_compiler import compile_video
-from fighter_selector import FighterSelector, get_fighter_classes
+from audio_generator import generate_intro_audio, intro_text
+from video_compiler import compile_video, mux_video
+from video_encoder import FFmpegVideoSink, PNGFrameSink
+from fighter_selector import FighterSelector, FIGHTERS, get_fighter_classes
 
-def cleanup():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Epic Ball Duel - генератор видео дуэлей")
+    parser.add_argument("--save-frames", action="store_true",
+                        help="Отладка: сохранять каждый кадр в PNG и собирать видео из них (медленно)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Экспорт без окна и без ограничения FPS (SDL dummy-драйвер, для серверов)")
+    parser.add_argument("--fighters", nargs=2, type=int, metavar=("FIGHTER1", "FIGHTER2"),
+                        help="Номера бойцов 1-6 без экрана выбора (обязательно в --headless)")
+    parser.add_argument("--min-hits", type=int, default=0,
+                        help="Выбрасывать дуэли с меньшим числом ударов до рендера")
+    parser.add_argument("--max-attempts", type=int, default=10,
+                        help="Сколько раз пересимулировать скучную дуэль")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Сид дуэли: одинаковый сид дает одинаковую дуэль и одинаковые кадры")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Процессов для рендера кадров (0 - все ядра, 1 - в текущем процессе)")
+    parser.add_argument("--save-replay", nargs="?", const=REPLAY_PATH, default=None, metavar="PATH",
+                        help=f"Сохранить бинарный повтор дуэли (по умолчанию {REPLAY_PATH}); "
+                             f"его можно перерисовать через replay_file.py без симуляции")
+    parser.add_argument("--substeps", type=int, default=1,
+                        help="Подшагов движения за кадр: точнее столкновения быстрых шариков, дуэль по сиду та же")
+    args = parser.parse_args()
+
+    if args.substeps < 1:
+        parser.error("--substeps должно быть не меньше 1")
+    if args.save_frames and args.workers != 1:
+        parser.error("--save-frames работает только с --workers 1")
+
+    if args.headless and not args.fighters:
+        parser.error("--headless требует --fighters")
+    if args.fighters:
+        for fighter_id in args.fighters:
+            if fighter_id not in FIGHTERS:
+                parser.error(f"Неизвестный боец {fighter_id}, допустимы 1-{len(FIGHTERS)}")
+        if args.fighters[0] == args.fighters[1]:
+            parser.error("Бойцы должны быть разными")
+    return args
+
+def cleanup(save_frames=False):
     """Очистка временных файлов и создание необходимых папок"""
     if os.path.exists(FRAMES_DIR):
         shutil.rmtree(FRAMES_DIR)
-    os.makedirs(FRAMES_DIR, exist_ok=True)
+    if save_frames:
+        os.makedirs(FRAMES_DIR, exist_ok=True)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     # Создаем папку assets если её нет (для звуков)
     if not os.path.exists(ASSETS_DIR):
         os.makedirs(ASSETS_DIR, exist_ok=True)
         print(f"Создана папка {ASSETS_DIR} для звуковых файлов")
 
-def create_fighters(fighter1_id, fighter2_id):
-    """Создает бойцов на основе выбора пользователя"""
+def create_game(fighter1_id, fighter2_id, seed=None, substeps=1):
+    """Создает бойцов на основе выбора пользователя и дуэль с заданным сидом"""
     fighter_classes = get_fighter_classes()
-    selector = FighterSelector()
     
     # Получаем классы бойцов
-    fighter1_class_name = selector.fighters[fighter1_id]['class']
-    fighter2_class_name = selector.fighters[fighter2_id]['class']
+    fighter1_class_name = FIGHTERS[fighter1_id]['class']
+    fighter2_class_name = FIGHTERS[fighter2_id]['class']
     
     fighter1_class = fighter_classes[fighter1_class_name]
     fighter2_class = fighter_classes[fighter2_class_name]
     
-    # Создаем бойцов в противоположных углах арены
-    fighter1 = fighter1_class(x=ARENA_X + 100, y=ARENA_Y + 100)
-    fighter2 = fighter2_class(x=ARENA_X + ARENA_WIDTH - 100, y=ARENA_Y + ARENA_HEIGHT - 100)
-    
-    return fighter1, fighter2
+    # Бойцы появляются в противоположных углах арены
+    return GameState.create(fighter1_class, fighter2_class, seed, substeps)
 
 def main():
+    args = parse_args()
+    
+    # Безголовый режим: SDL рисует в память, окна нет (нужно до pygame.init)
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    
     pygame.init()
     
     # Инициализируем звук
     pygame.mixer.init()
     
-    # НОВЫЙ ИНТЕРФЕЙС ВЫБОРА БОЙЦОВ
-    print("🎮 Добро пожаловать в ЭПИЧЕСКУЮ АРЕНУ!")
-    print("⚔️ Выберите ваших бойцов для дуэли!")
-    
-    selector = FighterSelector()
-    fighter1_id, fighter2_id = selector.select_fighters()
+    if args.fighters:
+        fighter1_id, fighter2_id = args.fighters
+    else:
+        # НОВЫЙ ИНТЕРФЕЙС ВЫБОРА БОЙЦОВ
+        print("🎮 Добро пожаловать в ЭПИЧЕСКУЮ АРЕНУ!")
+        print("⚔️ Выберите ваших бойцов для дуэли!")
+        
+        selector = FighterSelector()
+        fighter1_id, fighter2_id = selector.select_fighters()
     
     if fighter1_id is None or fighter2_id is None:
         print("Выбор отменен.")
         return
     
-    # Создаем выбранных бойцов
-    ball1, ball2 = create_fighters(fighter1_id, fighter2_id)
+    # Создаем выбранных бойцов (сид определяет всю дуэль целиком)
+    seed = args.seed if args.seed is not None else random.randrange(2**32)
+    game_state = create_game(fighter1_id, fighter2_id, seed, args.substeps)
+    ball1, ball2 = game_state.ball1, game_state.ball2
     
     print(f"🥊 {ball1.name} VS {ball2.name}")
     print(f"⚔️ {ball1.weapon_type.title()} против {ball2.weapon_type.title()}")
     
-    # Сохраняем главный экран в переменную
-    display_screen = pygame.display.set_mode((WIDTH, HEIGHT)) 
-    pygame.display.set_caption(f"Epic Ball Duel - {ball1.name} VS {ball2.name}!")
+    # Сохраняем главный экран в переменную (в безголовом режиме окна нет)
+    display_screen = None
+    if not args.headless:
+        display_screen = pygame.display.set_mode((WIDTH, HEIGHT)) 
+        pygame.display.set_caption(f"Epic Ball Duel - {ball1.name} VS {ball2.name}!")
 
-    cleanup()
-
-    renderer = Renderer(WIDTH, HEIGHT)
-    game_state = GameState(ball1, ball2)
+    cleanup(args.save_frames)
 
     # Генерируем интро аудио с именами выбранных бойцов
-    intro_text = f"Fight {ball1.name} versus {ball2.name} "
-    generate_intro_audio(intro_text, INTRO_AUDIO_PATH)
+    # (wav вместо mp3, если озвучил локальный движок; без интро - путь к несуществующему файлу)
+    intro_audio_path = generate_intro_audio(intro_text(ball1.name, ball2.name), INTRO_AUDIO_PATH) or INTRO_AUDIO_PATH
 
-    running = True
-    frame_count = 0
     clock = pygame.time.Clock()
     max_frames = FPS * 150  # 2.5 минуты максимум
 
@@ -90,29 +141,10 @@ def main():
     print("  ✅ Динамические заголовки и статистики")
     print("  ✅ Отдельные звуки для ударов и парирования")
 
-    while running and frame_count < max_frames:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-        game_state.update()
-
-        # Рендер
-        screen_surface = renderer.draw(game_state)
-        
-        # Показываем на экране
-        display_screen.blit(screen_surface, (0, 0))
-        pygame.display.flip()
-
-        # Сохранение кадра для видео
-        frame_filename = os.path.join(FRAMES_DIR, f"frame_{frame_count:05d}.png")
-        pygame.image.save(screen_surface, frame_filename)
-
-        frame_count += 1
-        clock.tick(FPS)
-
-        # Показываем прогресс
-        if frame_count % (FPS * 15) == 0:  # Каждые 15 секунд
+    def report_progress(game_state, frame_index):
+        """Печатает прогресс симуляции каждые 15 секунд дуэли"""
+        frame_count = frame_index + 1
+        if frame_count % (FPS * 15) == 0:
             minutes = frame_count // FPS // 60
             seconds = (frame_count // FPS) % 60
             
@@ -126,44 +158,101 @@ def main():
                   f"💥 Hits: {len(game_state.hit_events)} | "
                   f"✨ Parries: {len(game_state.parry_events)}")
 
-        if game_state.winner:
-            winner_ball = ball1 if game_state.winner == ball1.name else ball2
-            print(f"🏆 ПОБЕДИТЕЛЬ: {game_state.winner}!")
-            print(f"💪 Финальный урон: {int(winner_ball.stats['damage'])}")
-            
-            # Адаптивная финальная статистика
-            if hasattr(winner_ball, 'weapon_length'):
-                print(f"⚔️ Финальная длина оружия: {int(winner_ball.weapon_length)} пикселей!")
-            elif hasattr(winner_ball, 'arrows_per_shot'):
-                print(f"🏹 Финальное количество стрел: {winner_ball.arrows_per_shot} за залп!")
-            
-            print(f"💥 Всего ударов в бою: {len(game_state.hit_events)}")
-            print(f"✨ Всего парирований: {len(game_state.parry_events)}")
+    # 1. СИМУЛЯЦИЯ: сначала вся дуэль целиком, без единого пикселя.
+    #    Скучные дуэли выбрасываем и пересимулируем до рендера.
+    simulation_start = time.time()
+    for attempt in range(1, args.max_attempts + 1):
+        if attempt > 1:
+            game_state = create_game(fighter1_id, fighter2_id, seed + attempt - 1, args.substeps)
+            ball1, ball2 = game_state.ball1, game_state.ball2
+        trace = record_duel(game_state, FPS, max_frames, victory_frames=FPS * 2,
+                            on_frame=report_progress)
+        if not trace.is_boring(min_hits=args.min_hits):
+            break
+        print(f"😴 Скучная дуэль ({len(trace.hit_events)} ударов < {args.min_hits}), "
+              f"пересимулируем (попытка {attempt}/{args.max_attempts})")
+    print(f"🧮 Симуляция: {len(trace)} кадров за {time.time() - simulation_start:.1f} с (сид {game_state.seed})")
+
+    if game_state.winner:
+        winner_ball = ball1 if game_state.winner == ball1.name else ball2
+        print(f"🏆 ПОБЕДИТЕЛЬ: {game_state.winner}!")
+        print(f"💪 Финальный урон: {int(winner_ball.stats['damage'])}")
+        
+        # Адаптивная финальная статистика
+        if hasattr(winner_ball, 'weapon_length'):
+            print(f"⚔️ Финальная длина оружия: {int(winner_ball.weapon_length)} пикселей!")
+        elif hasattr(winner_ball, 'arrows_per_shot'):
+            print(f"🏹 Финальное количество стрел: {winner_ball.arrows_per_shot} за залп!")
+        
+    print(f"💥 Всего ударов в бою: {len(trace.hit_events)}")
+    print(f"✨ Всего парирований: {len(trace.parry_events)}")
+
+    if args.save_replay:
+        print(f"📼 Повтор сохранен: {write_replay(trace, args.save_replay)}")
+
+    # 2. РЕНДЕР: кадры рисуются по записи (победный экран уже в ней)
+    # Кадры идут сразу в ffmpeg; PNG на диске - только в отладочном режиме
+    if args.save_frames:
+        frame_sink = PNGFrameSink(FRAMES_DIR)
+    else:
+        frame_sink = FFmpegVideoSink(VIDEO_ONLY_PATH, WIDTH, HEIGHT, FPS)
+
+    def present(screen_surface):
+        """Показывает кадр в окне с ограничением FPS; в безголовом режиме ничего не делает"""
+        if display_screen is None:
+            return True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        display_screen.blit(screen_surface, (0, 0))
+        pygame.display.flip()
+        clock.tick(FPS)
+        return True
+
+    # with: при ошибке рендера ffmpeg убивается, а недописанное видео удаляется
+    with frame_sink:
+        export_start = time.time()
+        frame_count = 0
+        if args.workers == 1:
+            renderer = Renderer(WIDTH, HEIGHT)
+            playback = TracePlayback(trace)
+            for frame_index in range(len(playback)):
+                screen_surface = renderer.draw(playback.seek(frame_index))
             
-            # Сохраняем еще 3 секунды кадров с победным экраном
-            for victory_frame in range(FPS * 2):
-                screen_surface = renderer.draw(game_state)
-                display_screen.blit(screen_surface, (0, 0))
-                pygame.display.flip()
-                
-                frame_filename = os.path.join(FRAMES_DIR, f"frame_{frame_count:05d}.png")
-                pygame.image.save(screen_surface, frame_filename)
+                # Отправка кадра в видео
+                frame_sink.write_frame(screen_surface)
                 frame_count += 1
-                clock.tick(FPS)
-            running = False
 
-    pygame.quit()
+                # Показываем на экране
+                if not present(screen_surface):
+                    break
+        else:
+            # Куски кадров рисуются пулом процессов и приходят в энкодер по порядку
+            def show_frame(frame_index, frame_bytes):
+                if display_screen is None:
+                    return True
+                return present(pygame.image.frombytes(frame_bytes, (WIDTH, HEIGHT), "RGB"))
+
+            frame_count = render_trace_parallel(trace, frame_sink, WIDTH, HEIGHT,
+                                                workers=args.workers or None, on_frame=show_frame)
+
+        pygame.quit()
+    
+    export_time = time.time() - export_start
+    print(f"⚡ Отрисовано {frame_count} кадров за {export_time:.1f} с "
+          f"({frame_count / max(export_time, 1e-6):.1f} кадров/с)")
     
     print("🎬 Компилируем финальное видео...")
     
     # Передаем как удары, так и парирования для звуков
-    all_sound_events = game_state.hit_events + game_state.parry_events
-    compile_video(FRAMES_DIR, INTRO_AUDIO_PATH, HIT_SOUND_PATH, all_sound_events, 
-                 FINAL_VIDEO_PATH, FPS, game_state.parry_events)
-    
-    # Очищаем временные кадры
-    if os.path.exists(FRAMES_DIR):
-        shutil.rmtree(FRAMES_DIR)
+    all_sound_events = trace.hit_events + trace.parry_events
+    if args.save_frames:
+        compile_video(FRAMES_DIR, intro_audio_path, HIT_SOUND_PATH, all_sound_events, 
+                     FINAL_VIDEO_PATH, FPS, trace.parry_events)
+        print(f"🖼️ Отладочные кадры сохранены в {FRAMES_DIR}")
+    else:
+        mux_video(VIDEO_ONLY_PATH, intro_audio_path, HIT_SOUND_PATH, all_sound_events,
+                  FINAL_VIDEO_PATH, FPS, frame_count, trace.parry_events)
     
     print(f"✅ ГОТОВО! Эпическое видео с новыми бойцами: {FINAL_VIDEO_PATH}")
     print("🎥 Готово для TikTok/YouTube Shorts!")
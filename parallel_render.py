@@ -0,0 +1,92 @@
+# parallel_render.py
+import os
+import multiprocessing
+from collections import deque
+
+# Состояние процесса-рабочего: у каждого свой Renderer и своя запись дуэли
+_worker_renderer = None
+_worker_playback = None
+
+
+def _init_worker(trace, width, height):
+    """Инициализация рабочего процесса: безголовый pygame + Renderer + кукла GameState"""
+    global _worker_renderer, _worker_playback
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    import pygame
+    from renderer import Renderer
+    from duel_trace import TracePlayback
+
+    pygame.init()
+    _worker_renderer = Renderer(width, height)
+    _worker_playback = TracePlayback(trace)
+
+
+def _render_chunk(start, end):
+    """Рисует кадры [start, end) и возвращает их сырые RGB-байты по порядку"""
+    import pygame
+    frames = []
+    for frame_index in range(start, end):
+        surface = _worker_renderer.draw(_worker_playback.seek(frame_index))
+        frames.append(pygame.image.tobytes(surface, "RGB"))
+    return frames
+
+
+def split_frames(frame_total, chunk_size, first_frame=0):
+    """Делит диапазон кадров [first_frame, frame_total) на куски [start, end)"""
+    return [(start, min(start + chunk_size, frame_total)) for start in range(first_frame, frame_total, chunk_size)]
+
+
+def render_trace_parallel(trace, sink, width, height, workers=None, chunk_size=16, on_frame=None,
+                          start=0, end=None):
+    """
+    Рисует записанную дуэль пулом процессов и пишет кадры в sink строго по порядку.
+
+    Args:
+        trace: DuelTrace (или любая запись с тем же интерфейсом)
+        sink: приемник с методом write_bytes(frame_bytes), например FFmpegVideoSink
+        workers: число процессов (по умолчанию - все ядра)
+        chunk_size: сколько кадров рисует рабочий за одно задание
+        on_frame(frame_index, frame_bytes): необязательный колбэк (превью, прогресс);
+            вернув False, можно остановить рендер
+        start, end: рисовать только кадры [start, end) - например, отрезок повтора
+
+    Returns:
+        Количество записанных кадров
+    """
+    workers = workers or os.cpu_count() or 1
+    end = len(trace) if end is None else min(end, len(trace))
+    chunks = split_frames(end, chunk_size, start)
+
+    # spawn: рабочие не наследуют окно и звуковое устройство родителя
+    context = multiprocessing.get_context("spawn")
+
+    # Ограничиваем число кусков "в полете", чтобы готовые кадры не копились в памяти,
+    # пока энкодер не успевает их забирать
+    max_in_flight = workers * 2
+    frames_written = 0
+
+    with context.Pool(workers, initializer=_init_worker, initargs=(trace, width, height)) as pool:
+        pending = deque()
+        next_chunk = 0
+        stopped = False
+
+        while (next_chunk < len(chunks) or pending) and not stopped:
+            while next_chunk < len(chunks) and len(pending) < max_in_flight:
+                chunk = chunks[next_chunk]
+                pending.append((chunk[0], pool.apply_async(_render_chunk, chunk)))
+                next_chunk += 1
+
+            chunk_start, result = pending.popleft()
+            for offset, frame_bytes in enumerate(result.get()):
+                sink.write_bytes(frame_bytes)
+                frames_written += 1
+                if on_frame is not None and on_frame(chunk_start + offset, frame_bytes) is False:
+                    stopped = True
+                    break
+
+        if stopped:
+            pool.terminate()
+
+    return frames_written
@@ -0,0 +1,138 @@
+# particles.py
+import math
+import numpy as np
+from surface_pool import circle_stamp, rect_stamp
+
+
+def draw_circles(surface, xs, ys, sizes, colors):
+    """Рисует пачку кругов одним blits(): круг радиуса s в точке (x, y) - штамп в (x - s, y - s)"""
+    xs = np.asarray(xs).astype(int).tolist()
+    ys = np.asarray(ys).astype(int).tolist()
+    sizes = np.asarray(sizes).astype(int).tolist()
+    colors = np.asarray(colors).tolist()
+    surface.blits([(circle_stamp(size, tuple(color)), (x - size, y - size))
+                   for x, y, size, color in zip(xs, ys, sizes, colors)], doreturn=False)
+
+
+def draw_rects(surface, xs, ys, size, color):
+    """Рисует пачку одинаковых прямоугольников с левым верхним углом в (x, y)"""
+    stamp = rect_stamp(size, color)
+    xs = np.asarray(xs).astype(int).tolist()
+    ys = np.asarray(ys).astype(int).tolist()
+    surface.blits([(stamp, position) for position in zip(xs, ys)], doreturn=False)
+
+
+def spark_burst(rng, count, center, min_distance, max_distance, colors, min_size, max_size):
+    """
+    Искры вокруг точки за один кадр: случайный угол и расстояние, цвет из палитры,
+    радиус от min_size до max_size включительно. Частицы живут один кадр, поэтому
+    состояние не хранится - все берется из RNG кадра.
+    """
+    angle = rng.uniform(0, 2 * math.pi, count)
+    # Как random.uniform: при слабом эффекте max_distance может оказаться меньше min_distance
+    distance = min_distance + (max_distance - min_distance) * rng.random(count)
+    xs = center[0] + distance * np.cos(angle)
+    ys = center[1] + distance * np.sin(angle)
+    palette = np.asarray(colors, dtype=np.uint8)
+    return xs, ys, rng.integers(min_size, max_size + 1, count), palette[rng.integers(0, len(palette), count)]
+
+
+def scatter(rng, count, width, height, colors, min_size, max_size):
+    """Частицы в случайных точках прямоугольника (0..width, 0..height) - конфетти, иней заморозки"""
+    xs = rng.integers(0, width + 1, count)
+    ys = rng.integers(0, height + 1, count)
+    palette = np.asarray(colors, dtype=np.uint8)
+    return xs, ys, rng.integers(min_size, max_size + 1, count), palette[rng.integers(0, len(palette), count)]
+
+
+class ParticleSystem:
+    """
+    Долгоживущие частицы как структура массивов NumPy (позиция, скорость, жизнь,
+    размер, поворот, цвет). Шаг симуляции и удаление погибших - векторные
+    операции над всем буфером; порядок живых частиц сохраняется.
+    """
+
+    FIELDS = ('x', 'y', 'vx', 'vy', 'life', 'size', 'rotation', 'spin')
+
+    def __init__(self, capacity=32, gravity=0.0):
+        self.gravity = gravity
+        self.count = 0
+        self.arrays = {name: np.zeros(capacity) for name in self.FIELDS}
+        self.colors = np.zeros((capacity, 4), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def field(self, name):
+        """Живая часть массива поля (представление, а не копия)"""
+        return self.arrays[name][:self.count]
+
+    def reserve(self, capacity):
+        """Увеличивает буферы минимум до capacity (с удвоением)"""
+        old_capacity = len(self.colors)
+        if capacity <= old_capacity:
+            return
+        new_capacity = max(capacity, old_capacity * 2)
+        for name, array in self.arrays.items():
+            grown = np.zeros(new_capacity)
+            grown[:self.count] = array[:self.count]
+            self.arrays[name] = grown
+        grown = np.zeros((new_capacity, 4), dtype=np.uint8)
+        grown[:self.count] = self.colors[:self.count]
+        self.colors = grown
+
+    def emit(self, color=(255, 255, 255, 255), **values):
+        """Добавляет частицы; поля - числа или массивы одной длины (не заданные поля равны 0)"""
+        count = max((np.size(value) for value in values.values()), default=1)
+        start, end = self.count, self.count + count
+        self.reserve(end)
+        for name in self.FIELDS:
+            self.arrays[name][start:end] = values.get(name, 0.0)
+        color = np.asarray(color, dtype=np.uint8)
+        if color.shape[-1] == 3:
+            self.colors[start:end, :3] = color
+            self.colors[start:end, 3] = 255
+        else:
+            self.colors[start:end] = color
+        self.count = end
+
+    def update(self):
+        """Один кадр: движение, гравитация, вращение, старение и удаление погибших"""
+        n = self.count
+        if n == 0:
+            return
+        a = self.arrays
+        a['x'][:n] += a['vx'][:n]
+        a['y'][:n] += a['vy'][:n]
+        a['vy'][:n] += self.gravity
+        a['rotation'][:n] += a['spin'][:n]
+        a['life'][:n] -= 1
+        self.compact(a['life'][:n] > 0)
+
+    def compact(self, keep):
+        """Оставляет частицы, отмеченные в маске keep, не меняя их порядок"""
+        if keep.all():
+            return
+        alive = int(np.count_nonzero(keep))
+        for array in self.arrays.values():
+            array[:alive] = array[:self.count][keep]
+        self.colors[:alive] = self.colors[:self.count][keep]
+        self.count = alive
+
+    def clear(self):
+        self.count = 0
+
+    def rows(self, *names):
+        """Кортежи значений полей по частицам - для снимков отрисовки"""
+        if self.count == 0:
+            return []
+        return list(zip(*(self.field(name).tolist() for name in names)))
+
+    def load_rows(self, names, rows):
+        """Заполняет систему из снимка: остальные поля равны 0, цвет - белый"""
+        self.clear()
+        if rows:
+            self.emit(**dict(zip(names, zip(*rows))))
+
+    def draw_circles(self, surface):
+        draw_circles(surface, self.field('x'), self.field('y'), self.field('size'), self.colors[:self.count])
@@ -0,0 +1,110 @@
+# projectiles.py
+import numpy as np
+
+
+class ProjectilePool:
+    """
+    Летящие снаряды бойца: колонки NumPy (x, y, vx, vy, lifetime и поля оружия).
+    last_x, last_y - позиция до последнего шага полета: по отрезку от нее к (x, y)
+    столкновения проверяются без туннелирования (см. collision.py).
+    Емкость удваивается при переполнении, удаление переносит последний снаряд
+    на место удаленного - порядок снарядов в пуле не сохраняется. Там, где
+    порядок важен, номер выстрела serial восстанавливает порядок запуска.
+    """
+
+    BASE_FIELDS = ('x', 'y', 'last_x', 'last_y', 'vx', 'vy', 'lifetime', 'serial')
+
+    def __init__(self, fields=(), capacity=16):
+        self.fields = self.BASE_FIELDS + tuple(name for name in fields if name not in self.BASE_FIELDS)
+        self.columns = {name: np.zeros(capacity) for name in self.fields}
+        self.capacity = capacity
+        self.count = 0
+        self.spawned = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, name):
+        """Колонка живых снарядов (представление: запись меняет пул)"""
+        return self.columns[name][:self.count]
+
+    def __setitem__(self, name, values):
+        self.columns[name][:self.count] = values
+
+    def reserve(self, capacity):
+        if capacity <= self.capacity:
+            return
+        self.capacity = max(capacity, self.capacity * 2)
+        for name, column in self.columns.items():
+            grown = np.zeros(self.capacity)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    def spawn(self, **values):
+        """
+        Добавляет снаряды; значения - числа или массивы одной длины, не заданные поля равны 0.
+        Только что выпущенный снаряд еще никуда не летел: last_x, last_y по умолчанию равны x, y.
+        """
+        values.setdefault('last_x', values.get('x', 0.0))
+        values.setdefault('last_y', values.get('y', 0.0))
+        count = max((np.size(value) for value in values.values()), default=1)
+        start, end = self.count, self.count + count
+        self.reserve(end)
+        for name in self.fields:
+            self.columns[name][start:end] = values.get(name, 0.0)
+        self.columns['serial'][start:end] = np.arange(self.spawned, self.spawned + count)
+        self.spawned += count
+        self.count = end
+
+    def remove(self, index):
+        """Удаляет снаряд за O(1): на его место встает последний"""
+        last = self.count - 1
+        if index != last:
+            for column in self.columns.values():
+                column[index] = column[last]
+        self.count = last
+
+    def remove_where(self, mask):
+        """Удаляет снаряды, отмеченные в маске (с конца, чтобы перенесенные уже были проверены)"""
+        if not mask.any():
+            return
+        for index in np.flatnonzero(mask)[::-1]:
+            self.remove(index)
+
+    def in_spawn_order(self, mask):
+        """Индексы отмеченных снарядов в порядке запуска"""
+        indices = np.flatnonzero(mask)
+        return indices[np.argsort(self['serial'][indices], kind='stable')]
+
+    def take_where(self, mask):
+        """Забирает отмеченные снаряды из пула в порядке запуска: {поле: массив значений}"""
+        indices = self.in_spawn_order(mask)
+        taken = {name: self[name][indices] for name in self.fields}
+        self.remove_where(mask)
+        return taken
+
+    def clear(self):
+        self.count = 0
+
+    def integrate(self, gravity=0.0):
+        """Шаг полета всех снарядов: сдвиг на скорость, затем гравитация"""
+        n = self.count
+        if n == 0:
+            return
+        self.columns['last_x'][:n] = self.columns['x'][:n]
+        self.columns['last_y'][:n] = self.columns['y'][:n]
+        self.columns['x'][:n] += self.columns['vx'][:n]
+        self.columns['y'][:n] += self.columns['vy'][:n]
+        if gravity:
+            self.columns['vy'][:n] += gravity
+
+    def rows(self, *names, mask=None):
+        """Кортежи значений полей по снарядам - для снимков отрисовки"""
+        columns = [self[name] if mask is None else self[name][mask] for name in names]
+        return list(zip(*(column.tolist() for column in columns)))
+
+    def load_rows(self, names, rows):
+        """Заполняет пул из снимка: остальные поля равны 0"""
+        self.clear()
+        if rows:
+            self.spawn(**dict(zip(names, zip(*rows))))
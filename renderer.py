@@ -1,52 +1,68 @@
 import pygame
 import math
 import random
+import numpy as np
 from config import *
+from text_cache import TextSurfaceCache
+from fonts import get_ui_font, preload_fonts
+from surface_pool import SurfacePool, circle_stamp
+from particles import draw_circles, spark_burst, scatter
 
 class Renderer:
     def __init__(self, width, height):
         pygame.init()
         self.screen = pygame.Surface((width, height))
-        try:
-            self.font_large = pygame.font.Font(FONT_PATH, 90)
-            self.font_medium = pygame.font.Font(FONT_PATH, 50)
-            self.font_small = pygame.font.Font(FONT_PATH, 32)
-            self.font_tiny = pygame.font.Font(FONT_PATH, 24)
-        except:
-            # Если шрифт не найден, используем системный
-            self.font_large = pygame.font.Font(None, 90)
-            self.font_medium = pygame.font.Font(None, 50)
-            self.font_small = pygame.font.Font(None, 32)
-            self.font_tiny = pygame.font.Font(None, 24)
+        self.rng = random.Random()
+        self.np_rng = np.random.default_rng()
+        # Статичный слой (фон + арена) рисуется один раз и пересобирается
+        # только при смене разрешения или настроек арены
+        self.static_layer = None
+        self.static_layer_key = None
+        self.text_cache = TextSurfaceCache()
+        # Полноэкранные оверлеи переиспользуются, круги эффектов берутся из штампов
+        self.surface_pool = SurfacePool()
+        preload_fonts()
+        self.font_large = get_ui_font(90)
+        self.font_medium = get_ui_font(50)
+        self.font_small = get_ui_font(32)
+        self.font_tiny = get_ui_font(24)
 
     def draw_text_with_shadow(self, text, font, color, x, y, center=True, shadow_offset=2):
-        """Рисует текст с тенью для лучшей читаемости"""
-        # Тень
-        shadow_surface = font.render(text, True, (0, 0, 0))
-        shadow_rect = shadow_surface.get_rect()
-        if center:
-            shadow_rect.center = (x + shadow_offset, y + shadow_offset)
-        else:
-            shadow_rect.topleft = (x + shadow_offset, y + shadow_offset)
-        self.screen.blit(shadow_surface, shadow_rect)
-        
-        # Основной текст
-        text_surface = font.render(text, True, color)
-        text_rect = text_surface.get_rect()
+        """Рисует текст с тенью для лучшей читаемости (готовая поверхность берется из кэша)"""
+        surface = self.text_cache.get(font, text, color, shadow_offset)
+        padding = abs(shadow_offset)
+        text_rect = pygame.Rect(0, 0, surface.get_width() - padding, surface.get_height() - padding)
         if center:
             text_rect.center = (x, y)
         else:
             text_rect.topleft = (x, y)
-        self.screen.blit(text_surface, text_rect)
+        origin = max(0, -shadow_offset)
+        self.screen.blit(surface, (text_rect.x - origin, text_rect.y - origin),
+                         special_flags=pygame.BLEND_PREMULTIPLIED)
 
-    def draw_gradient_background(self):
+    def draw_gradient_background(self, surface):
         """Рисует градиентный фон для лучшего вида"""
         for y in range(HEIGHT):
             color_ratio = y / HEIGHT
             r = int(243 * (1 - color_ratio) + 200 * color_ratio)
             g = int(229 * (1 - color_ratio) + 220 * color_ratio)
             b = int(171 * (1 - color_ratio) + 180 * color_ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
+            pygame.draw.line(surface, (r, g, b), (0, y), (WIDTH, y))
+
+    def get_arena_area(self):
+        """Прямоугольник, который занимает арена вместе с рамкой (линии фона включают правый край)"""
+        return pygame.Rect(ARENA_X, ARENA_Y, ARENA_WIDTH + 1, ARENA_HEIGHT)
+
+    def get_static_layer(self):
+        """Фон и арена одной поверхностью; пересобирается только при смене размера или арены"""
+        key = (self.screen.get_size(), WIDTH, HEIGHT, ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT)
+        if self.static_layer_key != key:
+            layer = pygame.Surface(self.screen.get_size())
+            self.draw_gradient_background(layer)
+            self.draw_arena_decorations(layer)
+            self.static_layer = layer
+            self.static_layer_key = key
+        return self.static_layer
 
     def draw_enhanced_hit_effect(self, game_state):
         """НОВЫЙ эффект удара с остановкой времени"""
@@ -62,10 +78,8 @@ class Renderer:
         
         # 1. УДАРНАЯ ВОЛНА в красных тонах
         explosion_radius = int(60 * intensity)
-        explosion_surface = pygame.Surface((explosion_radius * 2, explosion_radius * 2), pygame.SRCALPHA)
         explosion_color = (255, 100, 100, int(180 * intensity))
-        pygame.draw.circle(explosion_surface, explosion_color, 
-                         (explosion_radius, explosion_radius), explosion_radius)
+        explosion_surface = circle_stamp(explosion_radius, explosion_color)
         self.screen.blit(explosion_surface, 
                         (center_x - explosion_radius, center_y - explosion_radius))
         
@@ -75,37 +89,23 @@ class Renderer:
             wave_thickness = max(1, int(6 * intensity))
             wave_alpha = int(120 * intensity)
             
-            wave_surface = pygame.Surface((wave_radius * 2, wave_radius * 2), pygame.SRCALPHA)
             wave_color = (255, 50, 50, wave_alpha)
-            pygame.draw.circle(wave_surface, wave_color, 
-                             (wave_radius, wave_radius), wave_radius, wave_thickness)
+            wave_surface = circle_stamp(wave_radius, wave_color, wave_thickness)
             self.screen.blit(wave_surface, 
                            (center_x - wave_radius, center_y - wave_radius))
         
         # 3. КРАСНЫЕ ИСКРЫ для удара
         num_sparks = max(3, int(15 * intensity))
-        for i in range(num_sparks):
-            angle = random.uniform(0, 360)
-            distance = random.uniform(15, 80 * intensity)
-            
-            spark_x = center_x + distance * math.cos(math.radians(angle))
-            spark_y = center_y + distance * math.sin(math.radians(angle))
-            
-            # Красные тона для ударов
-            colors = [(255, 100, 100), (255, 150, 50), (255, 200, 100), (255, 80, 80)]
-            spark_color = random.choice(colors)
-            
-            spark_size = random.randint(2, 8)
-            pygame.draw.circle(self.screen, spark_color, (int(spark_x), int(spark_y)), spark_size)
+        # Красные тона для ударов
+        colors = [(255, 100, 100), (255, 150, 50), (255, 200, 100), (255, 80, 80)]
+        draw_circles(self.screen, *spark_burst(self.np_rng, num_sparks, (center_x, center_y),
+                                               15, 80 * intensity, colors, 2, 8))
         
         # 4. ТЕКСТ "HIT!" при ударе
         if game_state.hit_effect_timer > game_state.hit_duration * 0.7:
             hit_text = "HIT!"
             text_size = int(50 * intensity)
-            try:
-                hit_font = pygame.font.Font(FONT_PATH, text_size)
-            except:
-                hit_font = pygame.font.Font(None, text_size)
+            hit_font = get_ui_font(text_size)
             
             self.draw_text_with_shadow(hit_text, hit_font, (255, 255, 255), 
                                      center_x, center_y - 60, True, 3)
@@ -124,37 +124,23 @@ class Renderer:
         
         # 1. Голубая вспышка парирования
         parry_radius = int(40 * intensity)
-        parry_surface = pygame.Surface((parry_radius * 2, parry_radius * 2), pygame.SRCALPHA)
         parry_color = (100, 200, 255, int(120 * intensity))
-        pygame.draw.circle(parry_surface, parry_color, 
-                         (parry_radius, parry_radius), parry_radius)
+        parry_surface = circle_stamp(parry_radius, parry_color)
         self.screen.blit(parry_surface, 
                         (center_x - parry_radius, center_y - parry_radius))
         
         # 2. Голубые искры
         num_sparks = max(2, int(8 * intensity))
-        for i in range(num_sparks):
-            angle = random.uniform(0, 360)
-            distance = random.uniform(10, 50 * intensity)
-            
-            spark_x = center_x + distance * math.cos(math.radians(angle))
-            spark_y = center_y + distance * math.sin(math.radians(angle))
-            
-            # Голубые тона для парирования
-            colors = [(100, 200, 255), (150, 220, 255), (200, 240, 255)]
-            spark_color = random.choice(colors)
-            
-            spark_size = random.randint(2, 5)
-            pygame.draw.circle(self.screen, spark_color, (int(spark_x), int(spark_y)), spark_size)
+        # Голубые тона для парирования
+        colors = [(100, 200, 255), (150, 220, 255), (200, 240, 255)]
+        draw_circles(self.screen, *spark_burst(self.np_rng, num_sparks, (center_x, center_y),
+                                               10, 50 * intensity, colors, 2, 5))
         
         # 3. Текст "PARRY!" только в начале
         if game_state.parry_effect_timer > game_state.parry_duration * 0.8:
             parry_text = "PARRY!"
             text_size = int(35 * intensity)
-            try:
-                parry_font = pygame.font.Font(FONT_PATH, text_size)
-            except:
-                parry_font = pygame.font.Font(None, text_size)
+            parry_font = get_ui_font(text_size)
             
             self.draw_text_with_shadow(parry_text, parry_font, (100, 200, 255), 
                                      center_x, center_y - 50, True, 2)
@@ -166,21 +152,14 @@ class Renderer:
         
         # Красноватый оттенок на весь экран для ударов
         freeze_intensity = game_state.time_freeze_timer / game_state.time_freeze_duration
-        freeze_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         freeze_alpha = int(30 * freeze_intensity)
-        freeze_surface.fill((255, 100, 100, freeze_alpha))  # Красноватый для ударов
+        freeze_surface = self.surface_pool.get((WIDTH, HEIGHT), fill=(255, 100, 100, freeze_alpha))  # Красноватый для ударов
         self.screen.blit(freeze_surface, (0, 0))
         
         # Частицы "заморозки" по краям экрана
-        for i in range(int(15 * freeze_intensity)):
-            x = random.randint(0, WIDTH)
-            y = random.randint(0, HEIGHT)
-            size = random.randint(2, 4)
-            alpha = int(120 * freeze_intensity)
-            
-            particle_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, (255, 150, 150, alpha), (size, size), size)
-            self.screen.blit(particle_surface, (x - size, y - size))
+        alpha = int(120 * freeze_intensity)
+        draw_circles(self.screen, *scatter(self.np_rng, int(15 * freeze_intensity), WIDTH, HEIGHT,
+                                           [(255, 150, 150, alpha)], 2, 4))
 
     def draw_health_bar(self, ball, x, y, width, height, is_top=True):
         """Рисует стильную полоску здоровья с приятными цветами"""
@@ -216,7 +195,7 @@ class Renderer:
         self.draw_text_with_shadow(name_text, self.font_small, text_color, 
                                    x + width // 2, y + height // 2, True, 1)
 
-    def draw_arena_decorations(self):
+    def draw_arena_decorations(self, surface):
         """Рисует декоративные элементы арены"""
         # Основная арена
         arena_rect = pygame.Rect(ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT)
@@ -227,13 +206,13 @@ class Renderer:
             r = int(230 + (245 - 230) * ratio)
             g = int(230 + (245 - 230) * ratio)
             b = int(230 + (245 - 230) * ratio)
-            pygame.draw.line(self.screen, (r, g, b), 
+            pygame.draw.line(surface, (r, g, b), 
                            (ARENA_X, ARENA_Y + i), (ARENA_X + ARENA_WIDTH, ARENA_Y + i))
         
         # Красивая рамка арены
-        pygame.draw.rect(self.screen, (100, 100, 100), arena_rect, 8)
-        pygame.draw.rect(self.screen, (150, 150, 150), arena_rect, 4)
-        pygame.draw.rect(self.screen, BLACK, arena_rect, 2)
+        pygame.draw.rect(surface, (100, 100, 100), arena_rect, 8)
+        pygame.draw.rect(surface, (150, 150, 150), arena_rect, 4)
+        pygame.draw.rect(surface, BLACK, arena_rect, 2)
         
         # Угловые украшения
         corner_size = 20
@@ -246,8 +225,8 @@ class Renderer:
         
         for corner_x, corner_y in corners:
             corner_rect = pygame.Rect(corner_x, corner_y, corner_size, corner_size)
-            pygame.draw.rect(self.screen, GOLD, corner_rect)
-            pygame.draw.rect(self.screen, BLACK, corner_rect, 2)
+            pygame.draw.rect(surface, GOLD, corner_rect)
+            pygame.draw.rect(surface, BLACK, corner_rect, 2)
 
     def draw_combat_effects(self, game_state):
         """Рисует эффекты боя"""
@@ -257,9 +236,7 @@ class Renderer:
                 # Эффект защиты
                 shield_radius = ball.radius + 15
                 alpha = int(100 * (ball.invulnerable_timer / 25))
-                shield_surface = pygame.Surface((shield_radius * 2, shield_radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(shield_surface, (100, 100, 255, alpha), 
-                                 (shield_radius, shield_radius), shield_radius, 3)
+                shield_surface = circle_stamp(shield_radius, (100, 100, 255, alpha), 3)
                 self.screen.blit(shield_surface, 
                                (ball.rect.centerx - shield_radius, ball.rect.centery - shield_radius))
 
@@ -267,10 +244,8 @@ class Renderer:
             if ball.attack_cooldown > 10:
                 intensity = ball.attack_cooldown / 20
                 glow_radius = int(ball.radius + 10 * intensity)
-                glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
                 glow_color = (*ball.color, int(80 * intensity))
-                pygame.draw.circle(glow_surface, glow_color, 
-                                 (glow_radius, glow_radius), glow_radius)
+                glow_surface = circle_stamp(glow_radius, glow_color)
                 self.screen.blit(glow_surface, 
                                (ball.rect.centerx - glow_radius, ball.rect.centery - glow_radius))
 
@@ -313,26 +288,42 @@ class Renderer:
         type2 = ball2.weapon_type.upper()
         return f"{type1}  VS  {type2}"
 
+    def frame_rng(self, game_state):
+        """
+        RNG эффектов кадра, выведенный из (сид дуэли, номер кадра): кадр рисуется
+        одинаково в любом процессе и в любом порядке
+        """
+        seed = getattr(game_state, 'seed', 0)
+        frame_index = getattr(game_state, 'frame_index', game_state.frame_count)
+        return random.Random(f"{seed}:{frame_index}")
+
     def draw(self, game_state):
-        # Градиентный фон
-        self.draw_gradient_background()
+        self.rng = self.frame_rng(game_state)
+        # Векторные частицы берут NumPy-генератор, засеянный тем же RNG кадра
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+
+        # Градиентный фон и арена с декорациями - одним блитом
+        static_layer = self.get_static_layer()
+        self.screen.blit(static_layer, (0, 0))
 
         # Эффект заморозки времени (теперь только при ударах)
-        self.draw_freeze_time_effect(game_state)
+        if game_state.time_freeze_timer > 0:
+            self.draw_freeze_time_effect(game_state)
+            # Арена рисуется поверх оттенка заморозки - возвращаем её из статичного слоя
+            arena_area = self.get_arena_area()
+            self.screen.blit(static_layer, arena_area, arena_area)
 
         # Динамический заголовок
         title_text = self.get_dynamic_title(game_state.ball1, game_state.ball2)
         self.draw_text_with_shadow(title_text, self.font_medium, BLACK, 
                                    WIDTH // 2, TITLE_Y, True, 2)
 
-        # Арена с декорациями
-        self.draw_arena_decorations()
-
         # Эффекты боя
         self.draw_combat_effects(game_state)
 
-        # Рисуем шары
+        # Рисуем шары (случайные эффекты шаров берут RNG кадра)
         for ball in game_state.balls:
+            ball.fx_rng = self.rng
             ball.draw(self.screen)
 
         # Эффекты ударов и парирований
@@ -367,17 +358,13 @@ class Renderer:
         # Экран победы с анимацией
         if game_state.winner:
             # Полупрозрачный оверлей
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 200))
+            overlay = self.surface_pool.get((WIDTH, HEIGHT), fill=(0, 0, 0, 200))
             self.screen.blit(overlay, (0, 0))
             
             # Анимированный текст победы
             pulse = math.sin(game_state.frame_count * 0.2) * 0.3 + 0.7
             winner_size = int(90 * pulse)
-            try:
-                winner_font = pygame.font.Font(FONT_PATH, winner_size)
-            except:
-                winner_font = pygame.font.Font(None, winner_size)
+            winner_font = get_ui_font(winner_size)
             
             winner_text = f"{game_state.winner.upper()}"
             self.draw_text_with_shadow(winner_text, winner_font, GOLD, 
@@ -388,11 +375,7 @@ class Renderer:
                                      WIDTH // 2, HEIGHT // 2 + 50, True, 2)
             
             # Эффект конфетти
-            for i in range(20):
-                x = random.randint(0, WIDTH)
-                y = random.randint(0, HEIGHT)
-                color = random.choice([(255, 215, 0), (255, 100, 100), (100, 255, 100), (100, 100, 255)])
-                size = random.randint(3, 8)
-                pygame.draw.circle(self.screen, color, (x, y), size)
+            confetti_colors = [(255, 215, 0), (255, 100, 100), (100, 255, 100), (100, 100, 255)]
+            draw_circles(self.screen, *scatter(self.np_rng, 20, WIDTH, HEIGHT, confetti_colors, 3, 8))
 
         return self.screen
\ No newline at end of file
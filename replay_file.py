@@ -0,0 +1,292 @@
+# replay_file.py
+import os
+import json
+import mmap
+import struct
+import argparse
+from duel_trace import FrameRecord, GAME_FIELDS, load_class
+
+# Формат файла повтора:
+#   MAGIC | uint32 длина заголовка | JSON-заголовок | выравнивание | записи кадров
+# Все записи кадров одной длины, поэтому кадр N лежит по смещению
+# data_offset + N * record_size и читается за O(1) прямо из mmap.
+MAGIC = b"DUELRPL1"
+VERSION = 1
+DATA_ALIGNMENT = 64
+
+
+def column_code(values):
+    """Тип столбца по всем значениям: bool, целое или float64"""
+    if values and all(isinstance(value, bool) for value in values):
+        return '?'
+    if all(isinstance(value, int) for value in values):
+        return 'q' if values else 'd'
+    return 'd'
+
+
+def build_ball_layout(trace, ball_index):
+    """
+    Раскладка одного шарика: типы скалярных полей и для каждого списка
+    снарядов - емкость (максимум за всю дуэль) и типы полей элемента
+    """
+    ball_class = load_class(trace.fighter_classes[ball_index])
+    states = [frame[1 + ball_index] for frame in trace.frames]
+
+    fields = []
+    for column, name in enumerate(ball_class.RENDER_FIELDS):
+        fields.append([name, column_code([state[0][column] for state in states])])
+
+    lists = []
+    for name, item_fields in ball_class.RENDER_LISTS.items():
+        capacity = max((len(state[1].get(name, ())) for state in states), default=0)
+        codes = []
+        for column in range(len(item_fields)):
+            codes.append(column_code([item[column] for state in states for item in state[1].get(name, ())]))
+        lists.append({'name': name, 'capacity': capacity, 'fields': list(item_fields), 'codes': codes})
+
+    return {'class': trace.fighter_classes[ball_index], 'fields': fields, 'lists': lists}
+
+
+def record_format(layout):
+    """struct-формат одной записи кадра по раскладке"""
+    parts = ['<', 'i' * len(GAME_FIELDS)]
+    for ball_layout in layout:
+        parts.append(''.join(code for _, code in ball_layout['fields']))
+        for list_layout in ball_layout['lists']:
+            parts.append('I' + ''.join(list_layout['codes']) * list_layout['capacity'])
+    return ''.join(parts)
+
+
+def pack_ball(ball_layout, state, values):
+    scalars, lists = state
+    values.extend(scalars)
+    for list_layout in ball_layout['lists']:
+        items = lists.get(list_layout['name'], ())
+        values.append(len(items))
+        for item in items:
+            values.extend(item)
+        values.extend([0] * (len(list_layout['codes']) * (list_layout['capacity'] - len(items))))
+
+
+def unpack_ball(ball_layout, values, position):
+    field_count = len(ball_layout['fields'])
+    scalars = tuple(values[position:position + field_count])
+    position += field_count
+
+    lists = {}
+    for list_layout in ball_layout['lists']:
+        width = len(list_layout['codes'])
+        count = values[position]
+        position += 1
+        items = [tuple(values[position + i * width:position + (i + 1) * width]) for i in range(count)]
+        position += width * list_layout['capacity']
+        lists[list_layout['name']] = items
+    return (scalars, lists), position
+
+
+def write_replay(trace, path):
+    """Записывает DuelTrace в файл повтора с записями фиксированной длины"""
+    layout = [build_ball_layout(trace, 0), build_ball_layout(trace, 1)]
+    frame_struct = struct.Struct(record_format(layout))
+
+    header = {
+        'version': VERSION,
+        'fighter_classes': trace.fighter_classes,
+        'fps': trace.fps,
+        'seed': trace.seed,
+        'hit_duration': trace.hit_duration,
+        'parry_duration': trace.parry_duration,
+        'time_freeze_duration': trace.time_freeze_duration,
+        'hit_events': trace.hit_events,
+        'parry_events': trace.parry_events,
+        'winner': trace.winner,
+        'frame_total': len(trace),
+        'layout': layout,
+        'record_format': frame_struct.format,
+        'record_size': frame_struct.size,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    prefix_size = len(MAGIC) + 4 + len(header_bytes)
+    padding = (-prefix_size) % DATA_ALIGNMENT
+
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with open(path, 'wb') as replay:
+        replay.write(MAGIC)
+        replay.write(struct.pack('<I', len(header_bytes)))
+        replay.write(header_bytes)
+        replay.write(b'\0' * padding)
+        for frame in trace.frames:
+            values = list(frame.game)
+            pack_ball(layout[0], frame.ball1, values)
+            pack_ball(layout[1], frame.ball2, values)
+            replay.write(frame_struct.pack(*values))
+    return path
+
+
+class ReplayFile:
+    """
+    Файл повтора, открытый через mmap. Ведет себя как DuelTrace
+    (len, [N], метаданные), поэтому его можно отдать TracePlayback
+    и render_trace_parallel без повторной симуляции.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.open()
+
+    def open(self):
+        self.file = open(self.path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path}: это не файл повтора дуэли")
+        header_size, = struct.unpack_from('<I', self.mm, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self.mm[header_start:header_start + header_size].decode('utf-8'))
+        if header['version'] != VERSION:
+            raise ValueError(f"{self.path}: неподдерживаемая версия {header['version']}")
+
+        prefix_size = header_start + header_size
+        self.data_offset = prefix_size + (-prefix_size) % DATA_ALIGNMENT
+
+        self.fighter_classes = header['fighter_classes']
+        self.fps = header['fps']
+        self.seed = header['seed']
+        self.hit_duration = header['hit_duration']
+        self.parry_duration = header['parry_duration']
+        self.time_freeze_duration = header['time_freeze_duration']
+        self.hit_events = header['hit_events']
+        self.parry_events = header['parry_events']
+        self.winner = header['winner']
+        self.frame_total = header['frame_total']
+        self.layout = header['layout']
+        self.frame_struct = struct.Struct(header['record_format'])
+
+        expected_size = self.data_offset + self.frame_total * self.frame_struct.size
+        if len(self.mm) < expected_size:
+            raise ValueError(f"{self.path}: файл обрезан ({len(self.mm)} < {expected_size} байт)")
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    # mmap нельзя передать в другой процесс - передаем путь и открываем заново
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.open()
+
+    def __len__(self):
+        return self.frame_total
+
+    def __getitem__(self, frame_index):
+        if frame_index < 0:
+            frame_index += self.frame_total
+        if not 0 <= frame_index < self.frame_total:
+            raise IndexError(frame_index)
+
+        values = self.frame_struct.unpack_from(self.mm, self.data_offset + frame_index * self.frame_struct.size)
+        game = tuple(values[:len(GAME_FIELDS)])
+        ball1, position = unpack_ball(self.layout[0], values, len(GAME_FIELDS))
+        ball2, position = unpack_ball(self.layout[1], values, position)
+        return FrameRecord(game, ball1, ball2)
+
+    @property
+    def duration(self):
+        return self.frame_total / self.fps
+
+
+def render_replay(replay, output_path, start=0, end=None, workers=1):
+    """Перерисовывает кусок повтора [start, end) в видео без звука"""
+    from config import WIDTH, HEIGHT
+    from video_encoder import FFmpegVideoSink
+
+    end = len(replay) if end is None else min(end, len(replay))
+    with FFmpegVideoSink(output_path, WIDTH, HEIGHT, replay.fps) as sink:
+        if workers == 1:
+            from renderer import Renderer
+            from duel_trace import TracePlayback
+            renderer = Renderer(WIDTH, HEIGHT)
+            playback = TracePlayback(replay)
+            for frame_index in range(start, end):
+                sink.write_frame(renderer.draw(playback.seek(frame_index)))
+        else:
+            from parallel_render import render_trace_parallel
+            render_trace_parallel(replay, sink, WIDTH, HEIGHT, workers=workers or None, start=start, end=end)
+    return output_path
+
+
+def save_thumbnail(replay, frame_index, output_path):
+    """Рисует один кадр повтора в PNG"""
+    import pygame
+    from config import WIDTH, HEIGHT
+    from renderer import Renderer
+    from duel_trace import TracePlayback
+
+    renderer = Renderer(WIDTH, HEIGHT)
+    pygame.image.save(renderer.draw(TracePlayback(replay).seek(frame_index)), output_path)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Работа с файлами повторов дуэлей")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    info_parser = subparsers.add_parser('info', help="Показать заголовок повтора")
+    info_parser.add_argument('replay')
+
+    thumb_parser = subparsers.add_parser('thumbnail', help="Нарисовать один кадр в PNG")
+    thumb_parser.add_argument('replay')
+    thumb_parser.add_argument('--frame', type=int, default=None, help="Номер кадра (по умолчанию последний)")
+    thumb_parser.add_argument('--out', default='output/thumbnail.png')
+
+    clip_parser = subparsers.add_parser('clip', help="Перерисовать отрезок в видео (без звука)")
+    clip_parser.add_argument('replay')
+    clip_parser.add_argument('--start', type=float, default=0, help="Начало, секунды")
+    clip_parser.add_argument('--end', type=float, default=None, help="Конец, секунды")
+    clip_parser.add_argument('--out', default='output/clip.mp4')
+    clip_parser.add_argument('--workers', type=int, default=1)
+
+    args = parser.parse_args()
+
+    if args.command != 'info':
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        import pygame
+        pygame.init()
+
+    with ReplayFile(args.replay) as replay:
+        if args.command == 'info':
+            print(f"🥊 {' VS '.join(replay.fighter_classes)} | сид {replay.seed} | победитель: {replay.winner}")
+            print(f"🎞️ {len(replay)} кадров ({replay.duration:.1f} с), запись {replay.frame_struct.size} байт")
+            print(f"💥 Ударов: {len(replay.hit_events)} | ✨ Парирований: {len(replay.parry_events)}")
+        elif len(replay) == 0:
+            parser.error(f"в повторе {args.replay} нет кадров")
+        elif args.command == 'thumbnail':
+            frame_index = len(replay) - 1 if args.frame is None else args.frame
+            if not 0 <= frame_index < len(replay):
+                parser.error(f"--frame {args.frame} вне повтора (кадры 0..{len(replay) - 1})")
+            print(f"🖼️ Кадр {frame_index} -> {save_thumbnail(replay, frame_index, args.out)}")
+        elif args.command == 'clip':
+            start = int(args.start * replay.fps)
+            end = len(replay) if args.end is None else int(args.end * replay.fps)
+            if not 0 <= start < min(end, len(replay)):
+                parser.error(f"отрезок --start {args.start} --end {args.end} пуст или вне повтора "
+                             f"(0..{replay.duration:.1f} с)")
+            print(f"🎬 Отрезок -> {render_replay(replay, args.out, start, end, args.workers)}")
+
+
+if __name__ == "__main__":
+    main()
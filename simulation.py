@@ -3,14 +3,31 @@ import pygame
 import math
 import random
 from config import *
+from collision import capsules_collide, capsule_hits_circle
+from broadphase import SweepAndPrune, capsule_extent, circle_extent
 
 class GameState:
-    def __init__(self, ball1, ball2):
+    def __init__(self, ball1, ball2, seed=None, rng=None, substeps=1):
         self.ball1 = ball1
         self.ball2 = ball2
         self.balls = [self.ball1, self.ball2]
         self.winner = None
         
+        # Один сид на дуэль: вся случайность симуляции идет через self.rng,
+        # поэтому дуэль можно воспроизвести, закэшировать и рисовать кусками
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        for ball in self.balls:
+            ball.rng = self.rng
+        
+        # Фиксированное число подшагов движения за кадр: больше - точнее быстрые
+        # столкновения, а дуэль с тем же сидом и substeps воспроизводится точно
+        self.substeps = substeps
+        for ball in self.balls:
+            ball.substeps = substeps
+        
         # НОВАЯ ЛОГИКА: остановка времени при УДАРЕ, а не парировании
         self.hit_effect_timer = 0
         self.hit_duration = 30  # 0.5 секунды эффекта удара
@@ -25,24 +42,38 @@ class GameState:
         self.parry_events = []  # Отдельно отслеживаем парирования
         self.frame_count = 0
         
+        # Грубая фаза: пересобирается раз за шаг перед проходом столкновений
+        self.broadphase = SweepAndPrune()
+        
         # Система предотвращения застреваний
         self.separation_force = 2.0
         self.last_positions = {}
         self.stuck_timer = {}
         
         for ball in self.balls:
-            self.last_positions[ball] = ball.rect.center
+            self.last_positions[ball] = (ball.x, ball.y)
             self.stuck_timer[ball] = 0
 
+    @classmethod
+    def create(cls, ball1_class, ball2_class, seed=None, substeps=1):
+        """Создает дуэль по классам бойцов: оба бойца и GameState получают один RNG из сида"""
+        if seed is None:
+            seed = random.randrange(2**32)
+        rng = random.Random(seed)
+        ball1 = ball1_class(x=ARENA_X + 100, y=ARENA_Y + 100, rng=rng)
+        ball2 = ball2_class(x=ARENA_X + ARENA_WIDTH - 100, y=ARENA_Y + ARENA_HEIGHT - 100, rng=rng)
+        return cls(ball1, ball2, seed=seed, rng=rng, substeps=substeps)
+
     def check_balls_stuck(self):
         """Проверяет, не застряли ли шарики, и разделяет их"""
         for ball in self.balls:
-            current_pos = ball.rect.center
+            current_pos = (ball.x, ball.y)
             last_pos = self.last_positions[ball]
             
             # Если шарик почти не двигается
-            distance_moved = math.sqrt((current_pos[0] - last_pos[0])**2 + 
-                                     (current_pos[1] - last_pos[1])**2)
+            dx = current_pos[0] - last_pos[0]
+            dy = current_pos[1] - last_pos[1]
+            distance_moved = math.sqrt(dx * dx + dy * dy)
             
             if distance_moved < 1:
                 self.stuck_timer[ball] += 1
@@ -51,16 +82,16 @@ class GameState:
             
             # Если застрял больше 30 кадров - добавляем импульс
             if self.stuck_timer[ball] > 30:
-                ball.vx += random.uniform(-3, 3)
-                ball.vy += random.uniform(-3, 3)
+                ball.vx += self.rng.uniform(-3, 3)
+                ball.vy += self.rng.uniform(-3, 3)
                 self.stuck_timer[ball] = 0
             
             self.last_positions[ball] = current_pos
 
     def force_separate_balls(self):
         """Принудительно разделяет шарики если они слишком близко"""
-        dx = self.ball2.rect.centerx - self.ball1.rect.centerx
-        dy = self.ball2.rect.centery - self.ball1.rect.centery
+        dx = self.ball2.x - self.ball1.x
+        dy = self.ball2.y - self.ball1.y
         distance = math.sqrt(dx*dx + dy*dy)
         min_distance = self.ball1.radius + self.ball2.radius + 5
         
@@ -74,10 +105,8 @@ class GameState:
             separation_per_ball = separation_needed / 2
             
             # Раздвигаем шарики
-            self.ball1.rect.centerx -= nx * separation_per_ball
-            self.ball1.rect.centery -= ny * separation_per_ball
-            self.ball2.rect.centerx += nx * separation_per_ball
-            self.ball2.rect.centery += ny * separation_per_ball
+            self.ball1.set_position(self.ball1.x - nx * separation_per_ball, self.ball1.y - ny * separation_per_ball)
+            self.ball2.set_position(self.ball2.x + nx * separation_per_ball, self.ball2.y + ny * separation_per_ball)
             
             # Добавляем силу отталкивания
             push_force = 3
@@ -91,23 +120,26 @@ class GameState:
         if self.time_freeze_timer > 0:
             return
             
-        weapon1_rect = self.ball1.get_weapon_rect()
-        weapon2_rect = self.ball2.get_weapon_rect()
+        # Оружие - капсулы по точной форме, шарики - круги
+        weapon1 = self.ball1.get_weapon_shape()
+        weapon2 = self.ball2.get_weapon_shape()
+        broadphase = self.broadphase
+        broadphase.rebuild(self.collision_proxies((weapon1, weapon2)))
         
         # Проверяем парирование стрел лучника
         parry_occurred = False
         
         # Если у лучника есть стрелы, проверяем их столкновение с оружием
-        if hasattr(self.ball1, 'check_arrow_weapon_collision'):
-            if self.ball1.check_arrow_weapon_collision(weapon2_rect):
+        if hasattr(self.ball1, 'check_arrow_weapon_collision') and broadphase.overlaps(('arrows', 0), ('weapon', 1)):
+            if self.ball1.check_arrow_weapon_collision(weapon2):
                 parry_occurred = True
         
-        if hasattr(self.ball2, 'check_arrow_weapon_collision'):
-            if self.ball2.check_arrow_weapon_collision(weapon1_rect):
+        if hasattr(self.ball2, 'check_arrow_weapon_collision') and broadphase.overlaps(('arrows', 1), ('weapon', 0)):
+            if self.ball2.check_arrow_weapon_collision(weapon1):
                 parry_occurred = True
         
         # 1. ПАРИРОВАНИЕ ОРУЖИЯ - теперь БЕЗ остановки времени
-        if weapon1_rect.colliderect(weapon2_rect):
+        if broadphase.overlaps(('weapon', 0), ('weapon', 1)) and capsules_collide(weapon1, weapon2):
             parry_occurred = True
         
         if parry_occurred:
@@ -118,17 +150,32 @@ class GameState:
         hit_occurred = False
         
         # Проверяем удар первого шарика
-        if weapon1_rect.colliderect(self.ball2.rect) and self.ball1.can_attack():
+        if (broadphase.overlaps(('weapon', 0), ('body', 1)) and
+                capsule_hits_circle(weapon1, self.ball2.x, self.ball2.y, self.ball2.radius) and self.ball1.can_attack()):
             if self.ball1.attack(self.ball2):
                 self.trigger_hit()
                 hit_occurred = True
         
         # Проверяем удар второго шарика
-        if weapon2_rect.colliderect(self.ball1.rect) and self.ball2.can_attack():
+        if (broadphase.overlaps(('weapon', 1), ('body', 0)) and
+                capsule_hits_circle(weapon2, self.ball1.x, self.ball1.y, self.ball1.radius) and self.ball2.can_attack()):
             if self.ball2.attack(self.ball1):
                 self.trigger_hit()
                 hit_occurred = True
 
+    def collision_proxies(self, weapons):
+        """(left, right, ключ) тел, оружия и стрел обоих бойцов для грубой фазы"""
+        proxies = []
+        for index, (ball, weapon) in enumerate(zip(self.balls, weapons)):
+            proxies.append((*circle_extent(ball.x, ball.radius), ('body', index)))
+            proxies.append((*capsule_extent(weapon), ('weapon', index)))
+            # Стрелы лучника сбиваются оружием противника
+            if hasattr(ball, 'check_arrow_weapon_collision'):
+                arrows = ball.arrow_extent()
+                if arrows is not None:
+                    proxies.append((*arrows, ('arrows', index)))
+        return proxies
+
     def trigger_parry(self):
         """Запускает эффект парирования БЕЗ остановки времени"""
         self.ball1.parry()
@@ -154,30 +201,30 @@ class GameState:
         for ball in self.balls:
             margin = 5
             
-            if ball.rect.left < ARENA_X + margin:
-                ball.rect.left = ARENA_X + margin
+            if ball.x - ball.radius < ARENA_X + margin:
+                ball.set_position(ARENA_X + margin + ball.radius, ball.y)
                 ball.vx = abs(ball.vx) * ball.bounce_energy
                 
-            if ball.rect.right > ARENA_X + ARENA_WIDTH - margin:
-                ball.rect.right = ARENA_X + ARENA_WIDTH - margin
+            if ball.x + ball.radius > ARENA_X + ARENA_WIDTH - margin:
+                ball.set_position(ARENA_X + ARENA_WIDTH - margin - ball.radius, ball.y)
                 ball.vx = -abs(ball.vx) * ball.bounce_energy
                 
-            if ball.rect.top < ARENA_Y + margin:
-                ball.rect.top = ARENA_Y + margin
+            if ball.y - ball.radius < ARENA_Y + margin:
+                ball.set_position(ball.x, ARENA_Y + margin + ball.radius)
                 ball.vy = abs(ball.vy) * ball.bounce_energy
                 
-            if ball.rect.bottom > ARENA_Y + ARENA_HEIGHT - margin:
-                ball.rect.bottom = ARENA_Y + ARENA_HEIGHT - margin
+            if ball.y + ball.radius > ARENA_Y + ARENA_HEIGHT - margin:
+                ball.set_position(ball.x, ARENA_Y + ARENA_HEIGHT - margin - ball.radius)
                 ball.vy = -abs(ball.vy) * ball.bounce_energy
 
     def add_random_energy(self):
         """Добавляет случайную энергию для поддержания динамики"""
         if self.frame_count % 180 == 0:  # Каждые 3 секунды
             for ball in self.balls:
-                total_speed = math.sqrt(ball.vx**2 + ball.vy**2)
+                total_speed = math.sqrt(ball.vx * ball.vx + ball.vy * ball.vy)
                 if total_speed < 3:  # Если движется слишком медленно
-                    ball.vx += random.uniform(-2, 2)
-                    ball.vy += random.uniform(-2, 2)
+                    ball.vx += self.rng.uniform(-2, 2)
+                    ball.vy += self.rng.uniform(-2, 2)
 
     def update(self):
         self.frame_count += 1
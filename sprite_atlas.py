@@ -0,0 +1,110 @@
+# sprite_atlas.py
+import math
+from collections import OrderedDict
+import pygame
+
+ANGLE_STEP = 2           # Шаг квантования углов, градусы
+LENGTH_BUCKET = 4        # Шаг квантования растущей длины оружия, пиксели
+MAX_ATLAS_BYTES = 192 * 1024 * 1024  # Общий бюджет памяти атласов процесса
+
+
+def quantize(value, step):
+    """Округляет значение до ближайшего кратного step"""
+    return int(round(value / step)) * step
+
+
+def blit_rotated(surface, sprite, center, angle):
+    """Поворачивает спрайт на angle (по часовой, как оружие) и ставит его центром в center"""
+    rotated = pygame.transform.rotate(sprite, -angle)
+    surface.blit(rotated, rotated.get_rect(center=center))
+
+
+class RotationAtlas:
+    """
+    Один рисунок (оружие, снаряд) под квантованными углами.
+    paint(surface, pivot, angle) рисует его вокруг точки pivot так же,
+    как рисовал бы прямо на экран; спрайт угла создается при первом запросе
+    и обрезается по видимым пикселям.
+    """
+
+    def __init__(self, paint, extent, step=ANGLE_STEP):
+        self.paint = paint
+        self.extent = int(math.ceil(extent))
+        self.step = step
+        self.bucket_count = int(round(360 / step))
+        self.sprites = {}
+        self.bytes = 0
+        self.cached = False  # Учитывается ли атлас в общем бюджете процесса
+
+    def get(self, angle):
+        """(спрайт, смещение x, смещение y) относительно опорной точки для ближайшего угла"""
+        index = int(round(angle / self.step)) % self.bucket_count
+        entry = self.sprites.get(index)
+        if entry is None:
+            size = self.extent * 2 + 1
+            canvas = pygame.Surface((size, size), pygame.SRCALPHA)
+            self.paint(canvas, (self.extent, self.extent), index * self.step)
+            bounds = canvas.get_bounding_rect()
+            sprite = canvas.subsurface(bounds).copy()
+            entry = (sprite, bounds.x - self.extent, bounds.y - self.extent)
+            self.sprites[index] = entry
+            sprite_bytes = bounds.width * bounds.height * 4
+            self.bytes += sprite_bytes
+            if self.cached:
+                _track_bytes(sprite_bytes)
+        return entry
+
+    def blit(self, screen, pivot, angle):
+        sprite, offset_x, offset_y = self.get(angle)
+        screen.blit(sprite, (int(round(pivot[0])) + offset_x, int(round(pivot[1])) + offset_y))
+
+    def blit_many(self, screen, pivots, angles):
+        """Один blits() для многих копий рисунка (снаряды одного вида)"""
+        sequence = []
+        for (pivot_x, pivot_y), angle in zip(pivots, angles):
+            sprite, offset_x, offset_y = self.get(angle)
+            sequence.append((sprite, (int(round(pivot_x)) + offset_x, int(round(pivot_y)) + offset_y)))
+        screen.blits(sequence, doreturn=False)
+
+    def prerender(self):
+        """Заполняет все углы сразу (по умолчанию углы рисуются лениво)"""
+        for index in range(self.bucket_count):
+            self.get(index * self.step)
+        return self
+
+
+# Атласы процесса: ключ (класс, рисунок, параметры) -> RotationAtlas.
+# Выросшее оружие получает новый ключ, а старые атласы вытесняются по LRU.
+_atlases = OrderedDict()
+_atlas_bytes = 0  # Сумма bytes атласов из _atlases, ведется при дорисовке и вытеснении
+
+
+def _track_bytes(delta):
+    global _atlas_bytes
+    _atlas_bytes += delta
+
+
+def get_atlas(key, paint, extent, step=ANGLE_STEP):
+    """Атлас по ключу; создается при первом запросе"""
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = RotationAtlas(paint, extent, step)
+        atlas.cached = True
+        _atlases[key] = atlas
+    else:
+        _atlases.move_to_end(key)
+
+    # Атласы дорисовываются лениво, поэтому бюджет проверяется при каждом запросе
+    while _atlas_bytes > MAX_ATLAS_BYTES and len(_atlases) > 1:
+        _, evicted = _atlases.popitem(last=False)
+        evicted.cached = False
+        _track_bytes(-evicted.bytes)
+    return atlas
+
+
+def clear_atlases():
+    global _atlas_bytes
+    for atlas in _atlases.values():
+        atlas.cached = False
+    _atlases.clear()
+    _atlas_bytes = 0
@@ -0,0 +1,87 @@
+# surface_pool.py
+from collections import OrderedDict
+import pygame
+
+MAX_POOLED_SURFACES = 16   # Разных размеров временных поверхностей на пул
+MAX_STAMPS = 512           # Готовых кругов эффектов на процесс
+
+
+class SurfacePool:
+    """
+    Временные поверхности эффектов, переиспользуемые между кадрами.
+    Ключ - (ширина, высота, флаги); поверхность действительна до следующего
+    запроса того же ключа, поэтому эффект рисует на нее и сразу блитит.
+    """
+
+    def __init__(self, max_entries=MAX_POOLED_SURFACES):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.allocations = 0
+
+    def get(self, size, flags=pygame.SRCALPHA, fill=(0, 0, 0, 0)):
+        """Поверхность нужного размера, залитая цветом fill"""
+        key = (int(size[0]), int(size[1]), flags)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(key[:2], flags)
+            self.allocations += 1
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        surface.fill(fill)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def __len__(self):
+        return len(self.surfaces)
+
+
+# Штампы: круг на прозрачной поверхности, нарисованный один раз.
+# Радиус и альфа эффектов зависят от целочисленных таймеров, поэтому
+# разных штампов за бой набирается немного.
+_stamps = OrderedDict()
+
+
+def circle_stamp(radius, color, width=0, size=None, center=None):
+    """
+    Готовая поверхность с кругом. По умолчанию квадрат 2r x 2r с кругом в центре -
+    так эффекты рисовали свои временные поверхности. Рисовать на штамп нельзя.
+    """
+    if size is None:
+        size = (radius * 2, radius * 2)
+    if center is None:
+        center = (radius, radius)
+    key = (radius, tuple(color), width, tuple(size), tuple(center))
+    stamp = _stamps.get(key)
+    if stamp is None:
+        stamp = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.circle(stamp, color, center, radius, width)
+        _stamps[key] = stamp
+        if len(_stamps) > MAX_STAMPS:
+            _stamps.popitem(last=False)
+    else:
+        _stamps.move_to_end(key)
+    return stamp
+
+
+def rect_stamp(size, color):
+    """Готовый залитый прямоугольник (непрозрачный цвет блитится без смешивания)"""
+    key = ('rect', tuple(size), tuple(color))
+    stamp = _stamps.get(key)
+    if stamp is None:
+        stamp = pygame.Surface(size, pygame.SRCALPHA if len(color) == 4 else 0)
+        stamp.fill(color)
+        _stamps[key] = stamp
+        if len(_stamps) > MAX_STAMPS:
+            _stamps.popitem(last=False)
+    else:
+        _stamps.move_to_end(key)
+    return stamp
+
+
+def clear_stamps():
+    _stamps.clear()
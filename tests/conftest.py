@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import sys
+
+# Модули проекта лежат в корне репозитория; экран pygame в тестах не нужен
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,32 @@
+# tests/test_audio_mixer.py
+import os
+import wave
+import numpy as np
+from audio_mixer import SAMPLE_RATE, load_pcm
+
+
+def write_tone(path, frequency, seconds):
+    samples = (np.sin(np.arange(int(8000 * seconds)) * frequency / 8000 * 2 * np.pi) * 8000).astype(np.int16)
+    with wave.open(str(path), 'wb') as sound_file:
+        sound_file.setnchannels(1)
+        sound_file.setsampwidth(2)
+        sound_file.setframerate(8000)
+        sound_file.writeframes(samples.tobytes())
+
+
+def test_changed_sound_replaces_its_cache_entry(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    sound, neighbour = tmp_path / 'hit.wav', tmp_path / 'hit-2.wav'
+    write_tone(sound, 440, 0.1)
+    write_tone(neighbour, 220, 0.1)
+    load_pcm(str(sound), cache_dir=cache_dir)
+    load_pcm(str(neighbour), cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+    write_tone(sound, 880, 0.2)
+    samples = load_pcm(str(sound), cache_dir=cache_dir)
+    names = sorted(os.listdir(cache_dir))
+    # Старая версия hit удалена, hit-2 (имя начинается так же) не тронут
+    assert len(names) == 2
+    assert sum(name.startswith('hit-2-') for name in names) == 1
+    assert len(samples) > 0.15 * SAMPLE_RATE
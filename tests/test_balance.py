@@ -0,0 +1,24 @@
+# tests/test_balance.py
+from balance import fighter_names, matrix_to_dict, run_matrix
+
+MAX_FRAMES = 300  # Коротких дуэлей хватает, чтобы проверить сборку матрицы
+
+
+def test_run_matrix_two_by_two():
+    stats = run_matrix(['RussiaBall', 'USABall'], duels=2, max_frames=MAX_FRAMES, workers=1)
+    assert set(stats) == {('RussiaBall', 'RussiaBall'), ('RussiaBall', 'USABall'),
+                          ('USABall', 'RussiaBall'), ('USABall', 'USABall')}
+    for matchup in stats.values():
+        assert matchup.duels == 2
+        assert matchup.wins[0] + matchup.wins[1] + matchup.draws == 2
+
+    report = matrix_to_dict(['RussiaBall', 'USABall'], stats)
+    assert len(report['win_rate_matrix']) == 2
+    assert len(report['matchups']) == 4
+
+
+def test_run_matrix_accepts_country_names():
+    stats = run_matrix(['Russia', 'USA'], duels=1, max_frames=MAX_FRAMES, workers=1)
+    assert fighter_names(['Russia', 'USA']) == ['RussiaBall', 'USABall']
+    assert set(stats) == {(a, b) for a in ('RussiaBall', 'USABall') for b in ('RussiaBall', 'USABall')}
+    assert all(matchup.duels == 1 for matchup in stats.values())
@@ -0,0 +1,39 @@
+# tests/test_broadphase.py
+import itertools
+import random
+import pytest
+from broadphase import SweepAndPrune
+from duel_engine import run_duel
+from balls.bow_ball import BowBall
+from balls.sword_ball import SwordBall
+from balls.usa_ball import USABall
+from balls.china_ball import ChinaBall
+from balls.france_ball import FranceBall
+
+MAX_FRAMES = 1500
+
+
+def test_pairs_match_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        proxies = []
+        for index in range(rng.randint(0, 8)):
+            left = rng.uniform(0, 500)
+            proxies.append((left, left + rng.uniform(0, 120), ('body', index)))
+        broadphase = SweepAndPrune()
+        broadphase.rebuild(proxies)
+        for (left_a, right_a, a), (left_b, right_b, b) in itertools.combinations(proxies, 2):
+            expected = left_a <= right_b and left_b <= right_a
+            assert broadphase.overlaps(a, b) == expected
+            assert broadphase.overlaps(b, a) == expected
+
+
+@pytest.mark.parametrize('fighter_a, fighter_b', [
+    (BowBall, SwordBall), (USABall, BowBall), (ChinaBall, FranceBall), (SwordBall, SwordBall)])
+def test_duel_matches_linear_path(monkeypatch, fighter_a, fighter_b):
+    pruned = [run_duel(fighter_a, fighter_b, seed, MAX_FRAMES) for seed in range(2)]
+    # Без грубой фазы точные проверки идут для каждой пары
+    monkeypatch.setattr(SweepAndPrune, 'overlaps', lambda self, first, second: True)
+    linear = [run_duel(fighter_a, fighter_b, seed, MAX_FRAMES) for seed in range(2)]
+    assert pruned == linear
+    assert sum(result.hits + result.parries for result in linear) > 0
@@ -0,0 +1,30 @@
+# tests/test_duel_engine.py
+from duel_engine import iter_duels, resolve_fighter, run_duel
+from balls.russia_ball import RussiaBall
+
+MAX_FRAMES = 1500
+
+
+def test_same_seed_same_result():
+    first = run_duel('RussiaBall', 'USABall', seed=11, max_frames=MAX_FRAMES)
+    second = run_duel('RussiaBall', 'USABall', seed=11, max_frames=MAX_FRAMES)
+    assert first == second
+    assert first.seed == 11
+    assert first.fighters == ('RussiaBall', 'USABall')
+
+
+def test_batch_matches_single_duels():
+    jobs = [('Canada', 'France', seed, MAX_FRAMES) for seed in range(3)]
+    assert list(iter_duels(jobs, workers=1)) == [run_duel(*job) for job in jobs]
+
+
+def test_resolve_fighter_names():
+    assert resolve_fighter('Russia') is RussiaBall
+    assert resolve_fighter('RussiaBall') is RussiaBall
+    assert resolve_fighter(RussiaBall) is RussiaBall
+
+
+def test_russia_poison_wears_off():
+    # Яд выветривается и возвращает скорость цели, сохраненную при первой дозе
+    for seed in range(3):
+        run_duel('RussiaBall', 'ChinaBall', seed, max_frames=MAX_FRAMES)
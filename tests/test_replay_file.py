@@ -0,0 +1,66 @@
+# tests/test_replay_file.py
+import pickle
+import pytest
+from config import FPS
+from simulation import GameState
+from duel_trace import DuelTrace, record_duel
+from replay_file import ReplayFile, write_replay
+from balls.bow_ball import BowBall
+from balls.sword_ball import SwordBall
+
+
+@pytest.fixture(scope='module')
+def trace():
+    return record_duel(GameState.create(BowBall, SwordBall, seed=3), FPS, 1200, victory_frames=30)
+
+
+def test_round_trip(trace, tmp_path):
+    path = write_replay(trace, str(tmp_path / 'duel.rpl'))
+    with ReplayFile(path) as replay:
+        assert len(replay) == len(trace)
+        assert replay.fighter_classes == trace.fighter_classes
+        assert (replay.seed, replay.fps, replay.winner) == (trace.seed, trace.fps, trace.winner)
+        assert replay.hit_events == trace.hit_events
+        assert replay.parry_events == trace.parry_events
+        assert all(replay[index] == trace[index] for index in range(len(trace)))
+        assert replay[-1] == trace[len(trace) - 1]
+        with pytest.raises(IndexError):
+            replay[len(trace)]
+
+
+def test_reopens_after_pickle(trace, tmp_path):
+    path = write_replay(trace, str(tmp_path / 'duel.rpl'))
+    with ReplayFile(path) as replay:
+        clone = pickle.loads(pickle.dumps(replay))
+        try:
+            assert clone[len(trace) // 2] == trace[len(trace) // 2]
+        finally:
+            clone.close()
+
+
+def empty_copy(trace):
+    return DuelTrace(trace.fighter_classes, trace.fps, trace.hit_duration,
+                     trace.parry_duration, trace.time_freeze_duration, trace.seed)
+
+
+def run_cli(monkeypatch, *argv):
+    from replay_file import main
+    monkeypatch.setattr('sys.argv', ['replay_file.py', *argv])
+    with pytest.raises(SystemExit) as error:
+        main()
+    return error.value.code
+
+
+def test_empty_replay(trace, tmp_path, monkeypatch):
+    path = write_replay(empty_copy(trace), str(tmp_path / 'empty.rpl'))
+    with ReplayFile(path) as replay:
+        assert len(replay) == 0
+    assert run_cli(monkeypatch, 'thumbnail', path, '--out', str(tmp_path / 'thumb.png')) == 2
+    assert run_cli(monkeypatch, 'clip', path, '--out', str(tmp_path / 'clip.mp4')) == 2
+
+
+@pytest.mark.parametrize('argv', [('thumbnail', '--frame', '-1'), ('thumbnail', '--frame', '100000'),
+                                  ('clip', '--start', '-1'), ('clip', '--start', '5', '--end', '4')])
+def test_cli_rejects_frames_outside_replay(trace, tmp_path, monkeypatch, argv):
+    path = write_replay(trace, str(tmp_path / 'duel.rpl'))
+    assert run_cli(monkeypatch, argv[0], path, *argv[1:], '--out', str(tmp_path / 'out')) == 2
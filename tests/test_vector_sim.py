@@ -0,0 +1,21 @@
+# tests/test_vector_sim.py
+import itertools
+import pytest
+from duel_engine import run_duel
+from vector_sim import MELEE_FIGHTERS, run_vector_duels, verify
+from balls.spear_ball import SpearBall
+
+PAIRS = list(itertools.product([cls.__name__ for cls in MELEE_FIGHTERS], repeat=2))
+
+
+@pytest.mark.parametrize('substeps', [1, 3])
+def test_matches_object_engine(substeps):
+    jobs = [(a, b, seed) for a, b in PAIRS for seed in (0, 1, 17)]
+    assert verify(jobs, substeps=substeps) == []
+
+
+def test_results_keep_job_order():
+    jobs = [('AxeBall', 'SwordBall', 4), ('SpearBall', 'SpearBall', 2), ('SwordBall', 'AxeBall', 9)]
+    results = run_vector_duels(jobs)
+    assert [(result.fighters, result.seed) for result in results] == [((a, b), seed) for a, b, seed in jobs]
+    assert results[1] == run_duel(SpearBall, SpearBall, 2)
@@ -0,0 +1,68 @@
+# text_cache.py
+from collections import OrderedDict
+import pygame
+
+
+class TextSurfaceCache:
+    """
+    LRU-кэш готового текста с тенью: ключ (шрифт, текст, цвет, смещение тени).
+    Тень и текст сводятся в одну поверхность с премультиплицированной альфой,
+    поэтому один блит дает тот же результат, что и два отдельных.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, font, text, color, shadow_offset):
+        """Поверхность текста с тенью; текст лежит в (0, 0), тень - в (shadow_offset, shadow_offset)"""
+        key = (font, text, tuple(color), shadow_offset)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.render(font, text, color, shadow_offset)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    @staticmethod
+    def premultiplied(surface):
+        """Копия с премультиплицированной альфой (copy() выравнивает шаг строк после SDL_ttf)"""
+        if not surface.get_flags() & pygame.SRCALPHA:
+            # Так font.render возвращает пустую строку - рисовать нечего
+            return pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        return surface.copy().premul_alpha()
+
+    @classmethod
+    def render(cls, font, text, color, shadow_offset):
+        text_surface = cls.premultiplied(font.render(text, True, color))
+        shadow_surface = cls.premultiplied(font.render(text, True, (0, 0, 0)))
+        width, height = text_surface.get_size()
+        surface = pygame.Surface((width + abs(shadow_offset), height + abs(shadow_offset)), pygame.SRCALPHA)
+        text_pos = (max(0, -shadow_offset),) * 2
+        shadow_pos = (max(0, shadow_offset),) * 2
+        surface.blit(shadow_surface, shadow_pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+        surface.blit(text_surface, text_pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hit_rate}
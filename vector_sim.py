@@ -0,0 +1,676 @@
+# vector_sim.py
+import math
+import time
+import random
+import argparse
+import itertools
+import numpy as np
+from config import ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT
+from duel_engine import DEFAULT_MAX_FRAMES, DuelResult, run_duel
+from balls.sword_ball import SwordBall
+from balls.spear_ball import SpearBall
+from balls.axe_ball import AxeBall
+
+# Бойцы, которых умеет векторный движок: без снарядов и клонов, только шарик и оружие
+MELEE_FIGHTERS = (SwordBall, SpearBall, AxeBall)
+SWORD, SPEAR, AXE = range(len(MELEE_FIGHTERS))
+
+# Рост после удачной атаки, как в on_successful_attack: (урон, длина, ширина, предел ширины)
+GROWTH = {SWORD: (2.5, 8, 0.8, 50), SPEAR: (2.0, 15, 0.6, 40), AXE: (1.0, 6, 1.2, 60)}
+
+# Оружие поворачивается на целое число градусов за шаг, поэтому sin/cos берутся из таблицы,
+# посчитанной через math так же, как FightingBall.get_direction() - значения совпадают точно
+_RADIANS = [math.radians(angle) for angle in range(360)]
+SIN_TABLE = np.array([math.sin(radians) for radians in _RADIANS])
+COS_TABLE = np.array([math.cos(radians) for radians in _RADIANS])
+
+# Экземпляр каждого бойца, из которого читаются стартовые параметры класса
+_prototypes = {}
+
+
+def prototype(kind):
+    """Образец бойца вида kind (параметры класса, а не состояние дуэли)"""
+    ball = _prototypes.get(kind)
+    if ball is None:
+        ball = MELEE_FIGHTERS[kind](x=0, y=0, rng=random.Random(0))
+        _prototypes[kind] = ball
+    return ball
+
+
+def fighter_kind(fighter):
+    """Номер вида бойца ближнего боя по классу или его имени ('SwordBall')"""
+    for kind, cls in enumerate(MELEE_FIGHTERS):
+        if fighter is cls or fighter == cls.__name__:
+            return kind
+    name = getattr(fighter, '__name__', fighter)
+    raise ValueError(f"Векторный движок не умеет бойца {name!r}: только "
+                     f"{', '.join(cls.__name__ for cls in MELEE_FIGHTERS)}")
+
+
+def segment_distance_sq(ax0, ay0, ax1, ay1, bx0, by0, bx1, by1):
+    """
+    Векторный collision.segment_distance_sq для отрезков ненулевой длины (оружие):
+    та же ветка и тот же порядок операций, поэтому и результат тот же до бита.
+    """
+    dax, day = ax1 - ax0, ay1 - ay0
+    dbx, dby = bx1 - bx0, by1 - by0
+    rx, ry = ax0 - bx0, ay0 - by0
+    a = dax * dax + day * day
+    e = dbx * dbx + dby * dby
+    f = dbx * rx + dby * ry
+    c = dax * rx + day * ry
+    b = dax * dbx + day * dby
+    denom = a * e - b * b
+    s = np.where(denom != 0.0, np.clip((b * f - c * e) / denom, 0.0, 1.0), 0.0)
+    t = (b * s + f) / e
+    s = np.where(t < 0.0, np.clip(-c / a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / a, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+    dx = (ax0 + dax * s) - (bx0 + dbx * t)
+    dy = (ay0 + day * s) - (by0 + dby * t)
+    return dx * dx + dy * dy
+
+
+def point_distance_sq(ax0, ay0, ax1, ay1, px, py):
+    """Квадрат расстояния от точки до отрезка ненулевой длины (ветка e == 0 segment_distance_sq)"""
+    dax, day = ax1 - ax0, ay1 - ay0
+    rx, ry = ax0 - px, ay0 - py
+    a = dax * dax + day * day
+    c = dax * rx + day * ry
+    s = np.clip(-c / a, 0.0, 1.0)
+    dx = (ax0 + dax * s) - px
+    dy = (ay0 + day * s) - py
+    return dx * dx + dy * dy
+
+
+class VectorDuels:
+    """
+    Много дуэлей ближнего боя сразу: состояние - структура массивов NumPy, по строке
+    на дуэль и по столбцу на бойца (ball1, ball2). step() проходит те же фазы, что
+    GameState.update() и FightingBall.update() с переопределениями SwordBall,
+    SpearBall и AxeBall, но для всех дуэлей одной операцией. Случайность каждая
+    дуэль берет из своего random.Random(seed) в том же порядке, что объектный
+    движок, поэтому итоги совпадают с run_duel() при том же числе подшагов (см. verify()).
+    x, y - дробные центры шариков, как FightingBall.x, y.
+    Закончившиеся дуэли время от времени вычищаются из массивов.
+    """
+
+    # Поля бойцов (форма (дуэли, 2)) и поля дуэлей (форма (дуэли,)) - все сжимаются вместе
+    BALL_FIELDS = ('kind', 'x', 'y', 'vx', 'vy', 'radius', 'gravity', 'friction', 'bounce_energy',
+                   'min_speed', 'max_speed', 'weapon_angle', 'weapon_rotation_speed',
+                   'weapon_rotation_direction', 'weapon_length', 'weapon_width', 'damage', 'range',
+                   'health', 'max_health', 'is_invulnerable', 'invulnerable_timer',
+                   'invulnerable_duration', 'attack_cooldown', 'attack_cooldown_duration',
+                   'last_x', 'last_y', 'stuck_timer', 'spear_timer', 'dash_cooldown', 'is_dashing',
+                   'dash_timer')
+    DUEL_FIELDS = ('duel', 'active', 'time_freeze_timer', 'hits', 'parries')
+    # Параметры классов, которые читаются с образца бойца
+    CLASS_FIELDS = ('radius', 'gravity', 'friction', 'bounce_energy', 'min_speed', 'max_speed',
+                    'weapon_rotation_speed', 'weapon_length', 'weapon_width', 'max_health',
+                    'invulnerable_duration', 'attack_cooldown_duration')
+    TIME_FREEZE_DURATION = 15  # Как GameState.time_freeze_duration
+
+    def __init__(self, fighter_a, fighter_b, seeds, substeps=1):
+        """
+        fighter_a, fighter_b - боец на все дуэли или список бойцов по дуэлям
+        (классы или имена классов из MELEE_FIGHTERS); seeds - сид каждой дуэли;
+        substeps - подшагов движения за кадр, как у GameState.
+        """
+        self.seeds = list(seeds)
+        self.substeps = substeps
+        count = len(self.seeds)
+        kinds = np.zeros((count, 2), dtype=np.int64)
+        for column, fighter in enumerate((fighter_a, fighter_b)):
+            if isinstance(fighter, (list, tuple)):
+                kinds[:, column] = [fighter_kind(item) for item in fighter]
+            else:
+                kinds[:, column] = fighter_kind(fighter)
+        self.kind = kinds
+        self.frame = 0
+
+        for name in self.CLASS_FIELDS:
+            values = [getattr(prototype(kind), name) for kind in range(len(MELEE_FIGHTERS))]
+            setattr(self, name, np.array(values, dtype=float)[kinds])
+        for name in ('radius', 'weapon_rotation_speed', 'invulnerable_duration', 'attack_cooldown_duration'):
+            setattr(self, name, getattr(self, name).astype(np.int64))
+        for name in ('damage', 'range'):
+            values = [prototype(kind).stats[name] for kind in range(len(MELEE_FIGHTERS))]
+            setattr(self, name, np.array(values, dtype=float)[kinds])
+        self.health = self.max_health.copy()
+
+        # Старт как в GameState.create: ball1 у левого верхнего угла, ball2 у правого нижнего,
+        # и по два числа из RNG дуэли на скорость каждого бойца в конструкторе
+        self.rngs = [random.Random(seed) for seed in self.seeds]
+        velocities = np.array([[rng.uniform(-8, 8), rng.uniform(-6, 6), rng.uniform(-8, 8), rng.uniform(-6, 6)]
+                               for rng in self.rngs]).reshape(count, 4)
+        self.vx = velocities[:, 0::2].copy()
+        self.vy = velocities[:, 1::2].copy()
+        centers = np.array([[ARENA_X + 100, ARENA_Y + 100],
+                            [ARENA_X + ARENA_WIDTH - 100, ARENA_Y + ARENA_HEIGHT - 100]], dtype=float)
+        self.x = np.tile(centers[:, 0], (count, 1))
+        self.y = np.tile(centers[:, 1], (count, 1))
+        self.last_x = self.x.copy()
+        self.last_y = self.y.copy()
+
+        zeros = np.zeros((count, 2), dtype=np.int64)
+        self.weapon_angle = zeros.copy()
+        self.weapon_rotation_direction = np.ones((count, 2), dtype=np.int64)
+        self.is_invulnerable = np.zeros((count, 2), dtype=bool)
+        self.is_dashing = np.zeros((count, 2), dtype=bool)
+        for name in ('invulnerable_timer', 'attack_cooldown', 'stuck_timer', 'spear_timer',
+                     'dash_cooldown', 'dash_timer'):
+            setattr(self, name, zeros.copy())
+
+        self.duel = np.arange(count)
+        self.active = np.ones(count, dtype=bool)
+        self.time_freeze_timer = np.zeros(count, dtype=np.int64)
+        self.hits = np.zeros(count, dtype=np.int64)
+        self.parries = np.zeros(count, dtype=np.int64)
+
+        # Итоги по номеру дуэли: заполняются, когда дуэль заканчивается (или в finish())
+        self.kinds = kinds.copy()
+        self.winner_index = np.full(count, -1)
+        self.frames = np.zeros(count, dtype=np.int64)
+        self.final = {name: np.zeros((count, 2)) for name in ('health', 'weapon_length', 'damage', 'range')}
+        self.final_events = np.zeros((count, 2), dtype=np.int64)
+        self.finished = np.zeros(count, dtype=bool)
+
+    def __len__(self):
+        """Дуэлей, еще лежащих в массивах"""
+        return len(self.duel)
+
+    # --- Вспомогательное ---
+
+    def uniform(self, mask, low, high, count=1):
+        """
+        (строки, числа формы (строки, count)): для каждой отмеченной дуэли - count вызовов
+        rng.uniform(low, high) ее генератора подряд, как в объектном движке.
+        """
+        rows = np.flatnonzero(mask)
+        low = np.broadcast_to(low, mask.shape)[rows].tolist()
+        high = np.broadcast_to(high, mask.shape)[rows].tolist()
+        values = [self.rngs[row].uniform(lo, hi) for row, lo, hi in zip(rows, low, high) for _ in range(count)]
+        return rows, np.array(values, dtype=float).reshape(len(rows), count)
+
+    def center(self, i):
+        """Центры бойца i (представления массивов x, y)"""
+        return self.x[:, i], self.y[:, i]
+
+    def move_center(self, i, center_x, center_y, mask):
+        """set_position(...) бойца i для отмеченных дуэлей"""
+        np.copyto(self.x[:, i], center_x, where=mask)
+        np.copyto(self.y[:, i], center_y, where=mask)
+
+    def weapon_shape(self, i):
+        """Капсула оружия бойца i: (x0, y0, x1, y1, радиус), как get_weapon_shape()"""
+        center_x, center_y = self.center(i)
+        sin_a = SIN_TABLE[self.weapon_angle[:, i]]
+        cos_a = COS_TABLE[self.weapon_angle[:, i]]
+        radius = self.radius[:, i]
+        reach = radius + self.weapon_length[:, i]
+        return (center_x + radius * sin_a, center_y - radius * cos_a,
+                center_x + reach * sin_a, center_y - reach * cos_a, self.weapon_width[:, i] / 2)
+
+    def can_attack(self, i):
+        return (self.attack_cooldown[:, i] <= 0) & ~self.is_invulnerable[:, i]
+
+    # --- Фазы шага ---
+
+    def step(self):
+        """Один кадр всех дуэлей (GameState.update)"""
+        self.frame += 1
+        frozen = self.active & (self.time_freeze_timer > 0)
+        self.time_freeze_timer[frozen] -= 1
+        moving = self.active & ~frozen
+        if not moving.any():
+            return
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.update_ball(0, 1, moving)
+            self.update_ball(1, 0, moving)
+            self.check_balls_stuck(moving)
+            self.force_separate_balls(moving)
+            self.weapon_collisions(moving)
+            self.keep_balls_in_arena(moving)
+            if self.frame % 180 == 0:
+                self.add_random_energy(moving)
+        self.check_winners(moving)
+
+    def update_ball(self, i, j, mask):
+        """FightingBall.update бойца i против j (с заходами SpearBall и AxeBall перед ним)"""
+        kind = self.kind[:, i]
+        spear = mask & (kind == SPEAR)
+        if spear.any():
+            self.maintain_activity(i, spear)
+        axe = mask & (kind == AXE)
+        if axe.any():
+            self.update_dash(i, j, axe)
+
+        ticking = mask & self.is_invulnerable[:, i]
+        timer = self.invulnerable_timer[:, i]
+        timer[ticking] -= 1
+        self.is_invulnerable[ticking & (timer <= 0), i] = False
+        cooldown = self.attack_cooldown[:, i]
+        cooldown[mask & (cooldown > 0)] -= 1
+
+        angle = self.weapon_angle[:, i]
+        turned = angle + self.weapon_rotation_speed[:, i] * self.weapon_rotation_direction[:, i]
+        turned = np.where(turned >= 360, turned - 360, np.where(turned < 0, turned + 360, turned))
+        np.copyto(angle, turned, where=mask)
+
+        vx, vy = self.vx[:, i], self.vy[:, i]
+        np.copyto(vy, vy + self.gravity[:, i], where=mask)
+        np.copyto(vx, vx * self.friction[:, i], where=mask)
+        np.copyto(vy, vy * self.friction[:, i], where=mask)
+
+        max_speed = self.max_speed[:, i]
+        speed = np.sqrt(vx * vx + vy * vy)
+        fast = mask & (speed > max_speed)
+        factor = max_speed / speed
+        np.copyto(vx, vx * factor, where=fast)
+        np.copyto(vy, vy * factor, where=fast)
+
+        for _ in range(self.substeps):
+            self.move_center(i, self.x[:, i] + vx / self.substeps, self.y[:, i] + vy / self.substeps, mask)
+            self.check_collision_with_other(i, j, mask)
+            self.bounce_off_walls(i, mask)
+
+        min_speed = self.min_speed[:, i]
+        total_speed = np.sqrt(vx * vx + vy * vy)
+        slow = mask & (total_speed < min_speed)
+        factor = min_speed / np.maximum(total_speed, 0.1)
+        np.copyto(vx, vx * (factor * 1.1), where=slow)
+        np.copyto(vy, vy * (factor * 1.1), where=slow)
+
+    def maintain_activity(self, i, mask):
+        """SpearBall.maintain_activity: рывок раз в dash_interval кадров и своя минимальная скорость"""
+        timer = self.spear_timer[:, i]
+        timer[mask] += 1
+        dash = mask & (timer >= prototype(SPEAR).dash_interval)
+        timer[dash] = 0
+        vx, vy = self.vx[:, i], self.vy[:, i]
+        rows, angles = self.uniform(dash, 0, 360)
+        for row, angle in zip(rows, angles[:, 0].tolist()):
+            vx[row] += 4 * math.cos(math.radians(angle))
+            vy[row] += 4 * math.sin(math.radians(angle))
+
+        min_speed = self.min_speed[:, i]
+        total_speed = np.sqrt(vx * vx + vy * vy)
+        slow = mask & (total_speed < min_speed)
+        moving = slow & (total_speed > 0.1)
+        factor = min_speed / total_speed
+        np.copyto(vx, vx * (factor * 1.2), where=moving)
+        np.copyto(vy, vy * (factor * 1.2), where=moving)
+        rows, values = self.uniform(slow & ~moving, -min_speed, min_speed, 2)
+        vx[rows] = values[:, 0]
+        vy[rows] = values[:, 1]
+
+    def update_dash(self, i, j, mask):
+        """AxeBall.update до базового: перезарядка, конец рывка и рывок к противнику на дистанции"""
+        ball = prototype(AXE)
+        cooldown = self.dash_cooldown[:, i]
+        cooldown[mask & (cooldown > 0)] -= 1
+        dashing = self.is_dashing[:, i]
+        timer = self.dash_timer[:, i]
+        going = mask & dashing
+        timer[going] -= 1
+        ending = going & (timer <= 0)
+        dashing[ending] = False
+        vx, vy = self.vx[:, i], self.vy[:, i]
+        np.copyto(vx, vx * 0.7, where=ending)
+        np.copyto(vy, vy * 0.7, where=ending)
+
+        own_x, own_y = self.center(i)
+        other_x, other_y = self.center(j)
+        dx, dy = other_x - own_x, other_y - own_y
+        distance = np.sqrt(dx * dx + dy * dy)
+        start = mask & (cooldown <= 0) & ~dashing & (150 < distance) & (distance < 400)
+        dashing[start] = True
+        timer[start] = ball.dash_duration
+        cooldown[start] = ball.dash_cooldown_max
+        np.copyto(vx, (dx / distance) * 15, where=start)
+        np.copyto(vy, (dy / distance) * 15, where=start)
+
+    def check_collision_with_other(self, i, j, mask):
+        """FightingBall.check_collision_with_other: раздвигает шарики и обменивает нормальные скорости"""
+        own_x, own_y = self.center(i)
+        other_x, other_y = self.center(j)
+        dx, dy = other_x - own_x, other_y - own_y
+        distance = np.sqrt(dx * dx + dy * dy)
+        min_distance = self.radius[:, i] + self.radius[:, j]
+        touching = mask & (distance < min_distance) & (distance > 0)
+        if not touching.any():
+            return
+        move_distance = (min_distance - distance) / 2
+        nx, ny = dx / distance, dy / distance
+        self.move_center(i, own_x - nx * move_distance, own_y - ny * move_distance, touching)
+        self.move_center(j, other_x + nx * move_distance, other_y + ny * move_distance, touching)
+
+        own_vx, own_vy, other_vx, other_vy = self.vx[:, i], self.vy[:, i], self.vx[:, j], self.vy[:, j]
+        own_n = own_vx * nx + own_vy * ny
+        other_n = other_vx * nx + other_vy * ny
+        np.copyto(own_vx, own_vx + (other_n - own_n) * nx * 0.7, where=touching)
+        np.copyto(own_vy, own_vy + (other_n - own_n) * ny * 0.7, where=touching)
+        np.copyto(other_vx, other_vx + (own_n - other_n) * nx * 0.7, where=touching)
+        np.copyto(other_vy, other_vy + (own_n - other_n) * ny * 0.7, where=touching)
+
+    def bounce_off_walls(self, i, mask):
+        """FightingBall.bounce_off_walls (с подталкиванием от вертикального зацикливания)"""
+        x, y, vx, vy = self.x[:, i], self.y[:, i], self.vx[:, i], self.vy[:, i]
+        radius = self.radius[:, i]
+        bounce = self.bounce_energy[:, i]
+
+        left = mask & (x - radius <= ARENA_X)
+        np.copyto(x, ARENA_X + radius, where=left)
+        np.copyto(vx, -vx * bounce + 2, where=left)
+        right = mask & (x + radius >= ARENA_X + ARENA_WIDTH)
+        np.copyto(x, ARENA_X + ARENA_WIDTH - radius, where=right)
+        np.copyto(vx, -vx * bounce - 2, where=right)
+
+        for edge in ('top', 'bottom'):
+            if edge == 'top':
+                hit = mask & (y - radius <= ARENA_Y)
+                np.copyto(y, ARENA_Y + radius, where=hit)
+            else:
+                hit = mask & (y + radius >= ARENA_Y + ARENA_HEIGHT)
+                np.copyto(y, ARENA_Y + ARENA_HEIGHT - radius, where=hit)
+            np.copyto(vy, -vy * bounce, where=hit)
+            rows, values = self.uniform(hit & (np.abs(vx) < 3), -4, 4)
+            vx[rows] += values[:, 0]
+
+    def check_balls_stuck(self, mask):
+        """GameState.check_balls_stuck: толчок шарику, почти не сдвигавшемуся больше 30 кадров"""
+        for i in (0, 1):
+            center_x, center_y = self.center(i)
+            last_x, last_y = self.last_x[:, i], self.last_y[:, i]
+            dx, dy = center_x - last_x, center_y - last_y
+            distance_moved = np.sqrt(dx * dx + dy * dy)
+            stuck = self.stuck_timer[:, i]
+            np.copyto(stuck, np.where(distance_moved < 1, stuck + 1, 0), where=mask)
+            rows, values = self.uniform(mask & (stuck > 30), -3, 3, 2)
+            self.vx[rows, i] += values[:, 0]
+            self.vy[rows, i] += values[:, 1]
+            stuck[rows] = 0
+            np.copyto(last_x, center_x, where=mask)
+            np.copyto(last_y, center_y, where=mask)
+
+    def force_separate_balls(self, mask):
+        """GameState.force_separate_balls: зазор в 5 пикселей и толчок в разные стороны"""
+        x1, y1 = self.center(0)
+        x2, y2 = self.center(1)
+        dx, dy = x2 - x1, y2 - y1
+        distance = np.sqrt(dx * dx + dy * dy)
+        min_distance = self.radius[:, 0] + self.radius[:, 1] + 5
+        close = mask & (distance < min_distance) & (distance > 0)
+        if not close.any():
+            return
+        nx, ny = dx / distance, dy / distance
+        separation = (min_distance - distance) / 2
+        self.move_center(0, x1 - nx * separation, y1 - ny * separation, close)
+        self.move_center(1, x2 + nx * separation, y2 + ny * separation, close)
+        for i, sign in ((0, -1), (1, 1)):
+            vx, vy = self.vx[:, i], self.vy[:, i]
+            np.copyto(vx, vx - nx * 3 if sign < 0 else vx + nx * 3, where=close)
+            np.copyto(vy, vy - ny * 3 if sign < 0 else vy + ny * 3, where=close)
+
+    def weapon_collisions(self, mask):
+        """GameState.enhanced_collision_detection: парирование капсул оружия, иначе удары по телу"""
+        weapons = [self.weapon_shape(i) for i in (0, 1)]
+        reach = weapons[0][4] + weapons[1][4]
+        parried = mask & (segment_distance_sq(*weapons[0][:4], *weapons[1][:4]) < reach * reach)
+        if parried.any():
+            self.parry(parried)
+        mask = mask & ~parried
+        for i, j in ((0, 1), (1, 0)):
+            center_x, center_y = self.center(j)
+            reach = weapons[i][4] + self.radius[:, j]
+            touching = point_distance_sq(*weapons[i][:4], center_x, center_y) < reach * reach
+            attacking = mask & touching & self.can_attack(i)
+            if attacking.any():
+                self.attack(i, j, attacking)
+
+    def parry(self, mask):
+        """FightingBall.parry обоих бойцов: отброс от центра арены и случайная добавка"""
+        center_x = ARENA_X + ARENA_WIDTH / 2
+        center_y = ARENA_Y + ARENA_HEIGHT / 2
+        for i in (0, 1):
+            own_x, own_y = self.center(i)
+            dx, dy = own_x - center_x, own_y - center_y
+            distance = np.sqrt(dx * dx + dy * dy)
+            away = mask & (distance > 0)
+            vx, vy = self.vx[:, i], self.vy[:, i]
+            np.copyto(vx, vx + (dx / distance) * 8, where=away)
+            np.copyto(vy, vy + ((dy / distance) * 8 - 3), where=away)
+            rows, values = self.uniform(mask, -2, 2, 2)
+            vx[rows] += values[:, 0]
+            vy[rows] += values[:, 1]
+        self.parries[mask] += 1
+
+    def attack(self, i, j, mask):
+        """FightingBall.attack бойца i по j (can_attack уже проверен) с take_damage и ростом оружия"""
+        # take_damage: мимо неуязвимого и топора в рывке
+        landed = mask & ~self.is_invulnerable[:, j] & ~((self.kind[:, j] == AXE) & self.is_dashing[:, j])
+        if not landed.any():
+            return
+        health = self.health[:, j]
+        np.copyto(health, np.maximum(health - self.damage[:, i], 0), where=landed)
+        self.is_invulnerable[landed, j] = True
+        np.copyto(self.invulnerable_timer[:, j], self.invulnerable_duration[:, j], where=landed)
+        self.weapon_rotation_direction[landed, j] *= -1
+
+        attacker_x, attacker_y = self.center(i)
+        target_x, target_y = self.center(j)
+        dx, dy = target_x - attacker_x, target_y - attacker_y
+        distance = np.sqrt(dx * dx + dy * dy)
+        pushed = landed & (distance > 0)
+        vx, vy = self.vx[:, j], self.vy[:, j]
+        np.copyto(vx, vx + (dx / distance) * 6, where=pushed)
+        np.copyto(vy, vy + ((dy / distance) * 6 - 2), where=pushed)
+
+        np.copyto(self.attack_cooldown[:, i], self.attack_cooldown_duration[:, i], where=landed)
+        self.on_successful_attack(i, j, landed)
+        self.time_freeze_timer[landed] = self.TIME_FREEZE_DURATION
+        self.hits[landed] += 1
+
+    def on_successful_attack(self, i, j, mask):
+        """Рост оружия и особенности классов из их on_successful_attack"""
+        kind = self.kind[:, i]
+        vx, vy = self.vx[:, i], self.vy[:, i]
+        own_x, own_y = self.center(i)
+        other_x, other_y = self.center(j)
+        for fighter, (damage, length, width, width_cap) in GROWTH.items():
+            grown = mask & (kind == fighter)
+            if not grown.any():
+                continue
+            self.damage[grown, i] += damage
+            self.weapon_length[grown, i] += length
+            np.copyto(self.weapon_width[:, i], np.minimum(width_cap, self.weapon_width[:, i] + width), where=grown)
+            if fighter == SWORD:
+                np.copyto(vx, vx + np.where(own_x > other_x, 2, -2), where=grown)
+                np.copyto(vy, vy - 1, where=grown)
+            elif fighter == SPEAR:
+                self.range[grown, i] += 10
+                max_speed = self.max_speed[:, i]
+                np.copyto(max_speed, np.minimum(30, max_speed + 0.5), where=grown)
+                dx, dy = own_x - other_x, own_y - other_y
+                distance = np.sqrt(dx * dx + dy * dy)
+                pushed = grown & (distance > 0)
+                np.copyto(vx, vx + (dx / distance) * 3, where=pushed)
+                np.copyto(vy, vy + (dy / distance) * 3, where=pushed)
+            else:
+                health = self.health[:, i]
+                np.copyto(health, np.minimum(self.max_health[:, i], health + 1), where=grown)
+
+    def keep_balls_in_arena(self, mask):
+        """GameState.keep_balls_in_arena: страховка в 5 пикселей от стен"""
+        margin = 5
+        for i in (0, 1):
+            x, y, vx, vy = self.x[:, i], self.y[:, i], self.vx[:, i], self.vy[:, i]
+            radius = self.radius[:, i]
+            bounce = self.bounce_energy[:, i]
+            hit = mask & (x - radius < ARENA_X + margin)
+            np.copyto(x, ARENA_X + margin + radius, where=hit)
+            np.copyto(vx, np.abs(vx) * bounce, where=hit)
+            hit = mask & (x + radius > ARENA_X + ARENA_WIDTH - margin)
+            np.copyto(x, ARENA_X + ARENA_WIDTH - margin - radius, where=hit)
+            np.copyto(vx, -np.abs(vx) * bounce, where=hit)
+            hit = mask & (y - radius < ARENA_Y + margin)
+            np.copyto(y, ARENA_Y + margin + radius, where=hit)
+            np.copyto(vy, np.abs(vy) * bounce, where=hit)
+            hit = mask & (y + radius > ARENA_Y + ARENA_HEIGHT - margin)
+            np.copyto(y, ARENA_Y + ARENA_HEIGHT - margin - radius, where=hit)
+            np.copyto(vy, -np.abs(vy) * bounce, where=hit)
+
+    def add_random_energy(self, mask):
+        """GameState.add_random_energy (раз в 180 кадров): встряска медленным шарикам"""
+        for i in (0, 1):
+            vx, vy = self.vx[:, i], self.vy[:, i]
+            rows, values = self.uniform(mask & (np.sqrt(vx * vx + vy * vy) < 3), -2, 2, 2)
+            vx[rows] += values[:, 0]
+            vy[rows] += values[:, 1]
+
+    def check_winners(self, mask):
+        """Проверка победителя: у ball1 не осталось здоровья - победил ball2, иначе наоборот"""
+        first_dead = self.health[:, 0] <= 0
+        done = mask & (first_dead | (self.health[:, 1] <= 0))
+        if not done.any():
+            return
+        self.store(done, np.where(first_dead, 1, 0))
+        self.active[done] = False
+        # Массивы сжимаются, когда в них больше четверти закончившихся дуэлей
+        if self.active.sum() < 0.75 * len(self):
+            self.compact()
+
+    def store(self, mask, winner_index):
+        """Переносит итоги отмеченных дуэлей в массивы по номеру дуэли"""
+        duels = self.duel[mask]
+        self.winner_index[duels] = winner_index[mask]
+        self.frames[duels] = self.frame
+        for name, values in self.final.items():
+            values[duels] = getattr(self, name)[mask]
+        self.final_events[duels, 0] = self.hits[mask]
+        self.final_events[duels, 1] = self.parries[mask]
+        self.finished[duels] = True
+
+    def compact(self):
+        keep = self.active
+        for name in self.BALL_FIELDS + self.DUEL_FIELDS:
+            setattr(self, name, getattr(self, name)[keep])
+        self.rngs = [rng for rng, kept in zip(self.rngs, keep.tolist()) if kept]
+
+    # --- Прогон ---
+
+    def run(self, max_frames=DEFAULT_MAX_FRAMES):
+        """Шагает, пока не закончатся все дуэли или max_frames; недоигранные - ничьи"""
+        while self.frame < max_frames and self.active.any():
+            self.step()
+        self.finish()
+        return self
+
+    def finish(self):
+        """Записывает итоги еще идущих дуэлей как ничьи на текущем кадре"""
+        if self.active.any():
+            self.store(self.active, np.full(len(self), -1))
+            self.active[:] = False
+            self.compact()
+
+    def results(self):
+        """DuelResult по каждой дуэли в порядке сидов - как у run_duel()"""
+        results = []
+        for duel, seed in enumerate(self.seeds):
+            balls = [prototype(kind) for kind in self.kinds[duel].tolist()]
+            final_stats = []
+            for column, ball in enumerate(balls):
+                stats = dict(ball.stats, damage=float(self.final['damage'][duel, column]),
+                             range=float(self.final['range'][duel, column]))
+                final_stats.append({
+                    'class': type(ball).__name__,
+                    'name': ball.name,
+                    'health': float(self.final['health'][duel, column]),
+                    'max_health': ball.max_health,
+                    'weapon_length': float(self.final['weapon_length'][duel, column]),
+                    'stats': stats,
+                })
+            winner_index = int(self.winner_index[duel])
+            winner_index = None if winner_index < 0 else winner_index
+            results.append(DuelResult(fighters=tuple(type(ball).__name__ for ball in balls),
+                                      seed=seed,
+                                      winner=None if winner_index is None else balls[winner_index].name,
+                                      winner_index=winner_index,
+                                      frames=int(self.frames[duel]),
+                                      hits=int(self.final_events[duel, 0]),
+                                      parries=int(self.final_events[duel, 1]),
+                                      final_stats=tuple(final_stats)))
+        return results
+
+
+def run_vector_duels(jobs, max_frames=DEFAULT_MAX_FRAMES, substeps=1):
+    """
+    Аналог duel_engine.run_duels для бойцов ближнего боя: все дуэли jobs (кортежи
+    (fighter_a, fighter_b, seed)) идут одним VectorDuels, результаты - в порядке jobs.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    fighters_a, fighters_b, seeds = (list(column) for column in zip(*jobs))
+    return VectorDuels(fighters_a, fighters_b, seeds, substeps).run(max_frames).results()
+
+
+def verify(jobs, max_frames=DEFAULT_MAX_FRAMES, substeps=1):
+    """
+    Сверка с объектным движком: [(сид, поле, векторный итог, объектный итог)] по всем
+    расхождениям в исходе, длине, числе ударов и парирований и итоговых характеристиках.
+    """
+    jobs = list(jobs)
+    mismatches = []
+    for (fighter_a, fighter_b, seed), vector in zip(jobs, run_vector_duels(jobs, max_frames, substeps)):
+        reference = run_duel(MELEE_FIGHTERS[fighter_kind(fighter_a)], MELEE_FIGHTERS[fighter_kind(fighter_b)],
+                             seed, max_frames, substeps)
+        for field in ('winner', 'winner_index', 'frames', 'hits', 'parries', 'final_stats'):
+            if getattr(vector, field) != getattr(reference, field):
+                mismatches.append((seed, field, getattr(vector, field), getattr(reference, field)))
+    return mismatches
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Векторный прогон дуэлей ближнего боя (Sword/Spear/Axe)")
+    parser.add_argument("--fighters", nargs="+", default=[cls.__name__ for cls in MELEE_FIGHTERS],
+                        help="Бойцы ближнего боя (имена классов)")
+    parser.add_argument("--duels", type=int, default=1000, help="Дуэлей на каждую упорядоченную пару")
+    parser.add_argument("--seed", type=int, default=0, help="Сид первой дуэли пары, дальше seed+1, ...")
+    parser.add_argument("--max-frames", type=int, default=DEFAULT_MAX_FRAMES, help="Предел длины дуэли в кадрах")
+    parser.add_argument("--substeps", type=int, default=1, help="Подшагов движения за кадр (как у GameState)")
+    parser.add_argument("--check", type=int, default=0,
+                        help="Сверить первые N дуэлей каждой пары с объектным движком (run_duel)")
+    return parser.parse_args()
+
+
+def main():
+    from balance import MatchupStats, print_matrix
+    args = parse_args()
+    fighters = [MELEE_FIGHTERS[fighter_kind(fighter)].__name__ for fighter in args.fighters]
+    pairs = list(itertools.product(fighters, repeat=2))
+    jobs = [(a, b, args.seed + index) for a, b in pairs for index in range(args.duels)]
+    print(f"🧮 {len(jobs)} дуэлей ({len(pairs)} пар по {args.duels}) одним векторным прогоном")
+
+    started = time.time()
+    duels = VectorDuels(*(list(column) for column in zip(*jobs)), args.substeps).run(args.max_frames)
+    results = duels.results()
+    elapsed = time.time() - started
+    frames = sum(result.frames for result in results)
+    print(f"⚡ {frames} кадров за {elapsed:.1f} с - {frames / elapsed / 1000:.0f} кадров/мс")
+
+    stats = {pair: MatchupStats(*pair) for pair in pairs}
+    for result in results:
+        stats[result.fighters].add(result)
+    print_matrix(fighters, stats)
+
+    if args.check:
+        checked = [(a, b, args.seed + index) for a, b in pairs for index in range(min(args.check, args.duels))]
+        mismatches = verify(checked, args.max_frames, args.substeps)
+        for seed, field, vector, reference in mismatches[:10]:
+            print(f"  ❌ сид {seed}, {field}: {vector!r} != {reference!r}")
+        status = "✅ совпадают" if not mismatches else f"❌ расхождений: {len(mismatches)}"
+        print(f"🔍 Сверка {len(checked)} дуэлей с объектным движком: {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,57 @@
 # video_compiler.py
 import os
 import glob
-from moviepy.editor import ImageSequenceClip, AudioFileClip, CompositeAudioClip
+import subprocess
+from moviepy.editor import ImageSequenceClip, AudioFileClip
+from audio_mixer import AudioMixer, decode_sound, load_pcm
+from video_encoder import get_ffmpeg_binary
 
-def compile_video(frames_dir, intro_audio_path, hit_sound_path, hit_frames, output_path, fps, parry_frames=None):
+def load_sound(path, cache=True):
+    """
+    Декодирует звук в PCM; если файла нет или он битый - None. cache=False - без
+    кэша на диске: для звуков, которые каждый запуск новые (интро дуэли).
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return load_pcm(path) if cache else decode_sound(path)
+    except RuntimeError as e:
+        print(f"Не удалось загрузить звук {path}: {e}")
+        return None
+
+def build_audio_track(intro_audio_path, hit_sound_path, hit_frames, fps, duration, parry_frames=None):
     """
-    Компилирует видео с НОВОЙ логикой звуков:
+    Сводит звуковую дорожку длиной duration секунд:
     - Удары (hit_frames) = звук удара + остановка времени
     - Парирования (parry_frames) = только звук парирования
     
-    Args:
-        frames_dir: Папка с кадрами
-        intro_audio_path: Путь к интро аудио
-        hit_sound_path: Путь к звуку удара
-        hit_frames: Список кадров с ударами (с остановкой времени)
-        output_path: Путь для сохранения видео
-        fps: Частота кадров
-        parry_frames: Список кадров с парированием (только звук)
+    Возвращает AudioMixer или None, если звуков нет.
     """
-    print("Сборка видео с новой логикой звуков...")
-    frame_files = sorted(glob.glob(os.path.join(frames_dir, "frame_*.png")))
-    if not frame_files:
-        print("Кадры не найдены!")
-        return
-
-    clip = ImageSequenceClip(frame_files, fps=fps)
-
-    final_audio_clips = []
+    mixer = AudioMixer(duration)
     
     # Добавляем интро аудио
-    if os.path.exists(intro_audio_path):
-        final_audio_clips.append(AudioFileClip(intro_audio_path))
+    intro_sound = load_sound(intro_audio_path, cache=False)
+    if intro_sound is not None:
+        mixer.add(intro_sound, 0)
     
     # Добавляем звуки УДАРОВ (с остановкой времени)
-    if os.path.exists(hit_sound_path) and hit_frames:
-        hit_sound = AudioFileClip(hit_sound_path)
-        
+    hit_sound = load_sound(hit_sound_path)
+    if hit_sound is not None and hit_frames:
         print(f"Добавляем {len(hit_frames)} звуков ударов...")
-        for frame_num in hit_frames:
-            time_sec = frame_num / fps
-            # Громкий звук для ударов с остановкой времени
-            final_audio_clips.append(hit_sound.volumex(1.0).set_start(time_sec))
+        # Громкий звук для ударов с остановкой времени
+        mixer.add_events(hit_sound, hit_frames, fps, gain=1.0)
     
     # Добавляем звуки ПАРИРОВАНИЙ (отдельный звук)
-    parry_sound_path = "assets/sounds/parry.mp3"
-    if os.path.exists(parry_sound_path) and parry_frames:
-        try:
-            parry_sound_effect = AudioFileClip(parry_sound_path)
+    if parry_frames:
+        parry_sound_effect = load_sound("assets/sounds/parry.mp3")
+        if parry_sound_effect is not None:
             print(f"Добавляем {len(parry_frames)} звуков парирований...")
-            
-            for frame_num in parry_frames:
-                time_sec = frame_num / fps
-                # Более тихий и отличающийся звук для парирования
-                final_audio_clips.append(parry_sound_effect.volumex(0.5).set_start(time_sec))
-        except Exception as e:
-            print(f"Не удалось загрузить звук парирования: {e}")
+            # Более тихий и отличающийся звук для парирования
+            mixer.add_events(parry_sound_effect, parry_frames, fps, gain=0.5)
+        elif hit_sound is not None:
             # Если нет отдельного звука парирования, используем звук удара но тише
-            if os.path.exists(hit_sound_path):
-                parry_substitute = AudioFileClip(hit_sound_path)
-                print(f"Используем звук удара для парирований (приглушенный)...")
-                for frame_num in parry_frames:
-                    time_sec = frame_num / fps
-                    final_audio_clips.append(parry_substitute.volumex(0.1).set_start(time_sec))
+            print(f"Используем звук удара для парирований (приглушенный)...")
+            mixer.add_events(hit_sound, parry_frames, fps, gain=0.1)
 
     # Попытка добавить другие звуки
     sound_effects = {
@@ -76,16 +66,82 @@ def compile_video(frames_dir, intro_audio_path, hit_sound_path, hit_frames, outp
         else:
             print(f"Звуковой файл не найден: {sound_path}")
 
+    if not mixer.event_count:
+        return None
+    return mixer
+
+def compile_video(frames_dir, intro_audio_path, hit_sound_path, hit_frames, output_path, fps, parry_frames=None):
+    """
+    Отладочный путь: компилирует видео из PNG-кадров на диске.
+    
+    Args:
+        frames_dir: Папка с кадрами
+        intro_audio_path: Путь к интро аудио
+        hit_sound_path: Путь к звуку удара
+        hit_frames: Список кадров с ударами (с остановкой времени)
+        output_path: Путь для сохранения видео
+        fps: Частота кадров
+        parry_frames: Список кадров с парированием (только звук)
+    """
+    print("Сборка видео с новой логикой звуков...")
+    frame_files = sorted(glob.glob(os.path.join(frames_dir, "frame_*.png")))
+    if not frame_files:
+        print("Кадры не найдены!")
+        return
+
+    clip = ImageSequenceClip(frame_files, fps=fps)
+
     # Компилируем финальное аудио
-    if final_audio_clips:
-        final_audio = CompositeAudioClip(final_audio_clips)
-        if final_audio.duration > clip.duration:
-             final_audio = final_audio.subclip(0, clip.duration)
-        clip = clip.set_audio(final_audio)
+    audio_path = os.path.splitext(output_path)[0] + "_audio.wav"
+    mixer = build_audio_track(intro_audio_path, hit_sound_path, hit_frames, fps, clip.duration, parry_frames)
+    if mixer is not None:
+        clip = clip.set_audio(AudioFileClip(mixer.write_wav(audio_path)))
 
     # Сохраняем видео
     print("Экспортируем финальное видео...")
-    clip.write_videofile(output_path, codec="libx264", audio_codec="aac", threads=4, logger='bar')
+    try:
+        clip.write_videofile(output_path, codec="libx264", audio_codec="aac", threads=4, logger='bar')
+    finally:
+        if os.path.exists(audio_path):
+            os.remove(audio_path)
+    print(f"✅ Видео успешно сохранено в {output_path}")
+    print(f"🔊 Ударов с остановкой времени: {len(hit_frames) if hit_frames else 0}")
+    print(f"🔊 Парирований с звуком: {len(parry_frames) if parry_frames else 0}")
+
+def mux_video(video_path, intro_audio_path, hit_sound_path, hit_frames, output_path, fps, frame_count, parry_frames=None):
+    """
+    Основной путь: добавляет звук к видео, которое уже закодировано FFmpegVideoSink.
+    Видеопоток копируется без перекодирования, перекодируется только звук.
+    """
+    duration = frame_count / fps
+    mixer = build_audio_track(intro_audio_path, hit_sound_path, hit_frames, fps, duration, parry_frames)
+
+    if mixer is None:
+        os.replace(video_path, output_path)
+        print(f"✅ Видео (без звука) сохранено в {output_path}")
+        return
+
+    audio_path = os.path.splitext(output_path)[0] + "_audio.wav"
+    print("Сводим звуковую дорожку...")
+    mixer.write_wav(audio_path)
+
+    print("Объединяем видео и звук...")
+    command = [
+        get_ffmpeg_binary(), "-y", "-loglevel", "error",
+        "-i", video_path, "-i", audio_path,
+        "-map", "0:v:0", "-map", "1:a:0",
+        "-c:v", "copy", "-c:a", "aac", "-b:a", "192k",
+        "-t", f"{duration:.3f}",
+        "-movflags", "+faststart",
+        output_path,
+    ]
+    try:
+        subprocess.run(command, check=True)
+    finally:
+        if os.path.exists(audio_path):
+            os.remove(audio_path)
+    os.remove(video_path)
+
     print(f"✅ Видео успешно сохранено в {output_path}")
     print(f"🔊 Ударов с остановкой времени: {len(hit_frames) if hit_frames else 0}")
-    print(f"🔊 Парирований с звуком: {len(parry_frames) if parry_frames else 0}")
\ No newline at end of file
+    print(f"🔊 Парирований с звуком: {len(parry_frames) if parry_frames else 0}")
@@ -0,0 +1,111 @@
+# video_encoder.py
+import os
+import shutil
+import subprocess
+import pygame
+
+
+def get_ffmpeg_binary():
+    """Находит ffmpeg: переменная окружения, бинарник из imageio-ffmpeg (ставится с moviepy) или системный"""
+    env_binary = os.environ.get("FFMPEG_BINARY")
+    if env_binary:
+        return env_binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        pass
+    return shutil.which("ffmpeg") or "ffmpeg"
+
+
+class FFmpegVideoSink:
+    """
+    Приемник кадров: сырые RGB-байты поверхности Renderer.draw() идут
+    прямо в stdin долгоживущего процесса ffmpeg. Никаких PNG на диске.
+    """
+
+    def __init__(self, output_path, width, height, fps, codec="libx264", preset="veryfast", crf=18):
+        self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_count = 0
+        self.frame_size = width * height * 3
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        command = [
+            get_ffmpeg_binary(), "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-vcodec", "rawvideo",
+            "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            "-an",
+            "-vcodec", codec, "-preset", preset, "-crf", str(crf),
+            "-pix_fmt", "yuv420p",
+            output_path,
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write_frame(self, surface):
+        """Отправляет кадр-поверхность в энкодер"""
+        self.write_bytes(pygame.image.tobytes(surface, "RGB"))
+
+    def write_bytes(self, frame_bytes):
+        """Отправляет уже готовые RGB-байты кадра в энкодер"""
+        if len(frame_bytes) != self.frame_size:
+            raise ValueError(f"Неверный размер кадра: {len(frame_bytes)} байт вместо {self.frame_size}")
+        self.process.stdin.write(frame_bytes)
+        self.frame_count += 1
+
+    def close(self):
+        """Закрывает поток и ждет, пока ffmpeg допишет файл"""
+        if self.process.stdin and not self.process.stdin.closed:
+            self.process.stdin.close()
+        return_code = self.process.wait()
+        if return_code != 0:
+            raise RuntimeError(f"ffmpeg завершился с кодом {return_code}")
+        return self.output_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # При ошибке не ждем корректного завершения файла
+            if self.process.stdin and not self.process.stdin.closed:
+                self.process.stdin.close()
+            self.process.kill()
+            self.process.wait()
+            # Обрезанное видео не оставляем на диске
+            if os.path.exists(self.output_path):
+                os.remove(self.output_path)
+        return False
+
+
+class PNGFrameSink:
+    """Отладочный приемник: сохраняет каждый кадр как PNG (старое поведение)"""
+
+    def __init__(self, frames_dir):
+        self.frames_dir = frames_dir
+        self.frame_count = 0
+        os.makedirs(frames_dir, exist_ok=True)
+
+    def write_frame(self, surface):
+        frame_filename = os.path.join(self.frames_dir, f"frame_{self.frame_count:05d}.png")
+        pygame.image.save(surface, frame_filename)
+        self.frame_count += 1
+
+    def close(self):
+        return self.frames_dir
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+